@@ -0,0 +1,223 @@
+"""
+사용자별 실시간 이벤트 발행/구독 (프로세스 내 pub/sub + Server-Sent Events)
+
+서비스 코드는 `record_change()`(데이터 변경)나 `publish_after_commit()`(알림 등)으로
+이벤트를 세션에 모아 두고, 트랜잭션이 커밋된 뒤에만 구독자에게 전달한다.
+롤백되면 버린다.
+
+구독자는 이벤트 루프 위의 asyncio.Queue 하나로 표현되므로 연결마다 스레드를
+쓰지 않는다. 동기 라우트(스레드풀)에서 발행해도 `call_soon_threadsafe`로
+구독자의 루프에 넘긴다. 느린 구독자의 대기열이 가득 차면 이후 이벤트를 버리고
+"resync" 이벤트를 한 번 보내 클라이언트가 전체를 다시 조회하게 한다.
+
+uvicorn은 종료 시 열린 응답이 끝날 때까지 기다리므로, 종료 신호를 받으면
+모든 스트림을 닫도록 `install_exit_hook()`으로 신호 처리기를 감싼다.
+"""
+import asyncio
+import itertools
+import json
+import os
+import signal
+import threading
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Set
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# 구독자별 대기열 크기
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "256"))
+# 연결 유지용 주석 전송 간격 (프록시/브라우저가 유휴 연결을 끊지 않도록)
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+# 연결이 끊겼을 때 브라우저가 재연결을 시도할 간격 (ms)
+SSE_RETRY_MS = 3000
+
+_event_ids = itertools.count(1)
+
+CHANGE_EVENT_TYPE = "change"
+
+
+class Subscription:
+    """구독자 하나 (이벤트 루프 스레드에서 생성)"""
+
+    def __init__(self, user_id: int, types: Optional[Iterable[str]] = None):
+        self.user_id = user_id
+        self.types = set(types) if types else None
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+        self.overflowed = False
+
+    def accepts(self, payload: Dict[str, Any]) -> bool:
+        return self.types is None or payload["type"] in self.types
+
+    def _close(self) -> None:
+        # 스트림 종료 표시 (대기열이 가득 차 있어도 반드시 전달)
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    def _put(self, payload: Dict[str, Any]) -> None:
+        # 루프 스레드에서만 호출됨
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class EventBroker:
+    """사용자 ID -> 구독자 목록"""
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id: int, types: Optional[Iterable[str]] = None) -> Subscription:
+        subscription = Subscription(user_id, types)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id: int, payload: Dict[str, Any]) -> int:
+        """이벤트 발행 (어느 스레드에서나 호출 가능), 전달 대상 구독자 수 반환"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        delivered = 0
+        for subscription in subscribers:
+            if not subscription.accepts(payload):
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._put, payload)
+                delivered += 1
+            except RuntimeError:
+                # 루프가 이미 닫힘 (종료 중)
+                self.unsubscribe(subscription)
+        return delivered
+
+    def close_all(self) -> None:
+        """열린 스트림을 모두 종료 (서버 종료 시)"""
+        with self._lock:
+            subscribers = [sub for subs in self._subscribers.values() for sub in subs]
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._close)
+            except RuntimeError:
+                pass
+
+    def connection_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+broker = EventBroker()
+
+
+def install_exit_hook() -> None:
+    """
+    종료 신호(SIGINT/SIGTERM)를 받으면 열린 스트림을 먼저 닫도록 신호 처리기를 감쌈
+
+    서버가 신호 처리기를 설치한 뒤(앱 시작 이벤트)에 메인 스레드에서 호출해야 한다.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        previous = signal.getsignal(sig)
+        if not callable(previous) or getattr(previous, "closes_event_streams", False):
+            continue
+
+        def handler(signum, frame, previous=previous):
+            broker.close_all()
+            previous(signum, frame)
+
+        handler.closes_event_streams = True
+        signal.signal(sig, handler)
+
+
+def publish_after_commit(session: Session, user_id: int, event_type: str, data: Dict[str, Any]) -> None:
+    """세션이 커밋되면 발행할 이벤트 등록"""
+    session.info.setdefault("pending_events", []).append(
+        (user_id, {"type": event_type, "data": data})
+    )
+
+
+def record_change(session: Session, user_id: int, entity: str, entity_id: Optional[int], op: str,
+                  data_version: int) -> None:
+    """
+    데이터 변경 이벤트 등록 (커밋 후 발행, 같은 커밋 안의 중복은 하나로 합침)
+
+    Args:
+        entity: 엔티티 이름 (transaction, category, budget ...)
+        entity_id: 엔티티 ID - 일괄 변경이면 None
+        op: create / update / delete / bulk
+        data_version: 변경 로그 버전 (동기화 API의 since로 그대로 사용 가능)
+    """
+    changes = session.info.setdefault("pending_changes", {})
+    key = (user_id, entity, entity_id)
+    previous = changes.get(key)
+    if previous is not None and previous[0] == "create" and op == "update":
+        op = "create"  # 같은 커밋에서 만든 뒤 수정한 것은 생성으로 충분
+    changes[key] = (op, data_version)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    for (user_id, entity, entity_id), (op, data_version) in session.info.pop("pending_changes", {}).items():
+        broker.publish(user_id, {
+            "type": CHANGE_EVENT_TYPE,
+            "data": {"entity": entity, "id": entity_id, "op": op, "data_version": data_version},
+        })
+    for user_id, payload in session.info.pop("pending_events", ()):
+        broker.publish(user_id, payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("pending_changes", None)
+    session.info.pop("pending_events", None)
+
+
+def _format(payload: Dict[str, Any]) -> str:
+    data = json.dumps(payload["data"], ensure_ascii=False, default=str, separators=(",", ":"))
+    return f"id: {next(_event_ids)}\nevent: {payload['type']}\ndata: {data}\n\n"
+
+
+async def _stream(request: Request, user_id: int, types: Optional[Iterable[str]]) -> AsyncIterator[str]:
+    subscription = broker.subscribe(user_id, types)
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        while True:
+            try:
+                payload = await asyncio.wait_for(subscription.queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            if payload is None:
+                break
+            yield _format(payload)
+            if subscription.overflowed and subscription.queue.empty():
+                # 놓친 이벤트가 있으므로 클라이언트에 전체 재조회 요청
+                subscription.overflowed = False
+                yield _format({"type": "resync", "data": {}})
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def event_stream_response(request: Request, user_id: int, types: Optional[Iterable[str]] = None) -> StreamingResponse:
+    """사용자 이벤트를 Server-Sent Events로 전송하는 응답 (types를 주면 해당 유형만)"""
+    return StreamingResponse(
+        _stream(request, user_id, types),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,185 @@
+"""
+비밀번호 해싱 전용 프로세스 풀
+
+bcrypt 해싱/검증은 호출 한 번에 수백 ms의 CPU를 사용하므로, 요청 처리
+스레드풀에서 실행하면 로그인이 몰릴 때 일반 조회 요청까지 밀려난다.
+이 모듈은 해싱 작업을 별도의 프로세스 풀로 보내고, 대기열 길이를 제한하며
+대기/실행 시간 지표를 집계한다.
+"""
+import asyncio
+import multiprocessing
+import os
+import secrets
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+# bcrypt 버전 경고 숨기기 (passlib과 bcrypt 호환성 문제로 인한 경고)
+warnings.filterwarnings("ignore", message=".*bcrypt.*", category=UserWarning)
+
+# 해싱 비용 설정: 값을 바꾸면 다음 로그인 때 기존 해시가 새 비용으로 재해싱됨
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# 풀 설정 (PASSWORD_HASH_WORKERS=0이면 프로세스 풀 없이 스레드에서 실행)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(max(1, min(4, (os.cpu_count() or 2) // 2)))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))  # 실행 중 + 대기 중 최대 작업 수
+PASSWORD_HASH_NICE = int(os.getenv("PASSWORD_HASH_NICE", "10"))  # 워커 프로세스 우선순위 낮춤 (POSIX 전용)
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+
+class HashingPoolBusy(Exception):
+    """해싱 대기열이 가득 찬 경우"""
+
+
+# ---------------------------------------------------------------------------
+# 작업 함수 (자식 프로세스에서 실행되므로 모듈 최상위에 있어야 함)
+# ---------------------------------------------------------------------------
+
+def _init_worker(nice: int) -> None:
+    # CPU가 부족할 때 해싱보다 요청 처리가 먼저 스케줄되도록 우선순위를 낮춤
+    if nice > 0 and hasattr(os, "nice"):
+        try:
+            os.nice(nice)
+        except OSError:
+            pass
+
+
+def _hash_job(password: str) -> Tuple[str, float]:
+    started = time.perf_counter()
+    hashed = pwd_context.hash(password)
+    return hashed, time.perf_counter() - started
+
+
+def _verify_and_update_job(password: str, hashed: str) -> Tuple[Tuple[bool, Optional[str]], float]:
+    started = time.perf_counter()
+    result = pwd_context.verify_and_update(password, hashed)
+    return result, time.perf_counter() - started
+
+
+# ---------------------------------------------------------------------------
+# 풀 관리 및 지표
+# ---------------------------------------------------------------------------
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, float] = {
+    "submitted": 0,
+    "completed": 0,
+    "failed": 0,
+    "rejected": 0,
+    "pending": 0,
+    "max_pending_seen": 0,
+    "queue_wait_seconds_total": 0.0,
+    "run_seconds_total": 0.0,
+}
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # fork는 스레드가 있는 프로세스에서 안전하지 않으므로 spawn 사용
+                _executor = ProcessPoolExecutor(
+                    max_workers=PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(PASSWORD_HASH_NICE,),
+                )
+    return _executor
+
+
+def shutdown() -> None:
+    """프로세스 풀 종료 (애플리케이션 종료 시 호출)"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def get_stats() -> Dict[str, Any]:
+    """해싱 풀 지표 조회"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["workers"] = PASSWORD_HASH_WORKERS
+    stats["max_pending"] = PASSWORD_HASH_MAX_PENDING
+    stats["bcrypt_rounds"] = BCRYPT_ROUNDS
+    return stats
+
+
+async def _submit(job: Callable, *args) -> Any:
+    with _stats_lock:
+        if _stats["pending"] >= PASSWORD_HASH_MAX_PENDING:
+            _stats["rejected"] += 1
+            raise HashingPoolBusy("비밀번호 처리 대기열이 가득 찼습니다")
+        _stats["pending"] += 1
+        _stats["submitted"] += 1
+        _stats["max_pending_seen"] = max(_stats["max_pending_seen"], _stats["pending"])
+
+    started = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        # 워커 수가 0이면 기본 스레드 실행기 사용 (프로세스 생성이 불가능한 환경용)
+        executor = _get_executor() if PASSWORD_HASH_WORKERS > 0 else None
+        result, run_seconds = await loop.run_in_executor(executor, job, *args)
+    except Exception:
+        with _stats_lock:
+            _stats["failed"] += 1
+        raise
+    finally:
+        with _stats_lock:
+            _stats["pending"] -= 1
+
+    elapsed = time.perf_counter() - started
+    with _stats_lock:
+        _stats["completed"] += 1
+        _stats["run_seconds_total"] += run_seconds
+        _stats["queue_wait_seconds_total"] += max(0.0, elapsed - run_seconds)
+    return result
+
+
+async def hash_password_async(password: str) -> str:
+    """비밀번호 해싱 (프로세스 풀)"""
+    return await _submit(_hash_job, password)
+
+
+async def verify_and_update_async(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    비밀번호 검증 및 필요 시 재해싱 (프로세스 풀)
+
+    Returns:
+        (검증 결과, 새 해시 또는 None) - 저장된 해시의 비용이 현재 설정과
+        다르면 새 해시를 함께 반환하므로 호출자가 저장하면 된다.
+    """
+    return await _submit(_verify_and_update_job, password, hashed_password)
+
+
+# 없는 사용자로 로그인할 때 검증할 해시 (처음 필요할 때 현재 비용으로 한 번 만듦)
+_dummy_hash: Optional[str] = None
+
+
+async def verify_dummy_async(password: str) -> None:
+    """
+    없는 사용자 로그인 시 고정된 더미 해시로 검증 (프로세스 풀, 결과는 항상 실패)
+
+    사용자가 없을 때 해싱 없이 바로 실패하면 응답 시간으로 계정 존재 여부가
+    드러나므로, 있는 사용자와 같은 비용의 검증을 수행한다.
+    """
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = await hash_password_async(secrets.token_hex(16))
+    await _submit(_verify_and_update_job, password, _dummy_hash)
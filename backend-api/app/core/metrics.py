@@ -0,0 +1,256 @@
+"""
+요청/SQL 계측 및 Prometheus 지표
+
+- 미들웨어: 라우트(경로 템플릿)별 응답 시간 히스토그램과 상태 코드별 요청 수
+- SQLAlchemy 이벤트: 요청마다 실행된 SQL 문 수, SQL 총 소요 시간, 반환 행 수(METRICS_COUNT_ROWS=1일 때)
+- 느린 쿼리 로그: SLOW_QUERY_MS 이상 걸린 SELECT의 문장과 EXPLAIN QUERY PLAN 기록
+
+지표는 `/metrics`에서 Prometheus 텍스트 형식으로 노출된다.
+"""
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# 느린 쿼리 기준 (ms, 0이면 비활성화)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))
+# ORM SELECT 결과 행 수 집계 여부 (기본 비활성화)
+# SQLite 커서의 rowcount는 SELECT에서 -1이라 결과를 모두 읽어 고정(freeze)해야 셀 수 있다.
+# 결과 전체를 메모리에 한 번 더 올리므로 쿼리 점검할 때만 켠다.
+METRICS_COUNT_ROWS = os.getenv("METRICS_COUNT_ROWS", "0") in ("1", "true", "True")
+
+# 응답 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _RequestStats:
+    """요청 하나 동안 누적되는 SQL 지표"""
+
+    __slots__ = ("sql_count", "sql_seconds", "rows")
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.rows = 0
+
+
+class _RouteMetrics:
+    """라우트 하나의 누적 지표"""
+
+    __slots__ = ("bucket_counts", "count", "latency_sum", "sql_count", "sql_seconds", "rows", "statuses")
+
+    def __init__(self):
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.latency_sum = 0.0
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.rows = 0
+        self.statuses: Dict[int, int] = {}
+
+
+_current_request: ContextVar[Optional[_RequestStats]] = ContextVar("metrics_current_request", default=None)
+_routes: Dict[Tuple[str, str], _RouteMetrics] = {}
+_routes_lock = threading.Lock()
+
+
+def _record(method: str, route: str, status: int, elapsed: float, stats: _RequestStats) -> None:
+    key = (method, route)
+    with _routes_lock:
+        metrics = _routes.get(key)
+        if metrics is None:
+            metrics = _routes[key] = _RouteMetrics()
+        for idx, bound in enumerate(LATENCY_BUCKETS):
+            if elapsed <= bound:
+                metrics.bucket_counts[idx] += 1
+                break
+        metrics.count += 1
+        metrics.latency_sum += elapsed
+        metrics.sql_count += stats.sql_count
+        metrics.sql_seconds += stats.sql_seconds
+        metrics.rows += stats.rows
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+
+class MetricsMiddleware:
+    """
+    라우트별 요청 지표 수집 ASGI 미들웨어
+
+    스트리밍 응답도 본문 전송이 끝날 때까지의 시간을 측정하도록 순수 ASGI로 구현한다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = _RequestStats()
+        token = _current_request.set(stats)
+        status_holder = {"status": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_request.reset(token)
+            # 경로 템플릿으로 집계해야 /api/transactions/1, /2 ...가 하나로 묶임
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "(unmatched)"
+            _record(scope.get("method", ""), route_path, status_holder["status"], elapsed, stats)
+
+
+# ---------------------------------------------------------------------------
+# SQLAlchemy 이벤트
+# ---------------------------------------------------------------------------
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("metrics_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+
+    stats = _current_request.get()
+    if stats is not None:
+        stats.sql_count += 1
+        stats.sql_seconds += elapsed
+
+    if SLOW_QUERY_MS > 0 and elapsed * 1000 >= SLOW_QUERY_MS:
+        _log_slow_query(conn, statement, parameters, executemany, elapsed)
+
+
+def _log_slow_query(conn, statement, parameters, executemany, elapsed) -> None:
+    plan = None
+    head = statement.lstrip()[:6].upper()
+    if not executemany and head in ("SELECT", "WITH "):
+        try:
+            # 이벤트 안에서 다시 이벤트가 발생하지 않도록 DBAPI 커서로 직접 실행
+            plan_cursor = conn.connection.driver_connection.cursor()
+            try:
+                plan_cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                plan = "\n".join(f"  {row[-1]}" for row in plan_cursor.fetchall())
+            finally:
+                plan_cursor.close()
+        except Exception as e:
+            plan = f"  (EXPLAIN 실패: {type(e).__name__}: {e})"
+
+    logger.warning(
+        "느린 쿼리 %.1fms\n%s\nparams=%r%s",
+        elapsed * 1000,
+        statement,
+        parameters,
+        f"\nplan:\n{plan}" if plan else "",
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _count_orm_rows(orm_execute_state):
+    """요청 중 ORM SELECT가 반환한 행 수 집계 (METRICS_COUNT_ROWS=1일 때만, 나눠 읽는 쿼리는 제외)"""
+    if not METRICS_COUNT_ROWS or not orm_execute_state.is_select:
+        return None
+    stats = _current_request.get()
+    if stats is None:
+        return None
+    options = orm_execute_state.execution_options
+    if options.get("yield_per") or options.get("stream_results"):
+        return None
+
+    # 결과를 고정(freeze)해 행 수를 센 뒤 동일한 결과를 다시 만들어 반환
+    frozen = orm_execute_state.invoke_statement().freeze()
+    stats.rows += len(frozen.data)
+    return frozen()
+
+
+# ---------------------------------------------------------------------------
+# Prometheus 텍스트 형식
+# ---------------------------------------------------------------------------
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_number(value: float) -> str:
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def render_prometheus(extra_gauges: Optional[Dict[str, float]] = None) -> str:
+    """수집된 지표를 Prometheus 텍스트 노출 형식(0.0.4)으로 변환"""
+    with _routes_lock:
+        snapshot = {
+            key: (
+                list(m.bucket_counts), m.count, m.latency_sum,
+                m.sql_count, m.sql_seconds, m.rows, dict(m.statuses),
+            )
+            for key, m in _routes.items()
+        }
+
+    lines: List[str] = []
+
+    lines.append("# HELP http_request_duration_seconds 라우트별 응답 시간")
+    lines.append("# TYPE http_request_duration_seconds histogram")
+    for (method, route), (buckets, count, latency_sum, *_rest) in sorted(snapshot.items()):
+        labels = f'method="{_escape(method)}",route="{_escape(route)}"'
+        cumulative = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS, buckets):
+            cumulative += bucket_count
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+        lines.append(f"http_request_duration_seconds_sum{{{labels}}} {_format_number(latency_sum)}")
+        lines.append(f"http_request_duration_seconds_count{{{labels}}} {count}")
+
+    lines.append("# HELP http_requests_total 라우트/상태 코드별 요청 수")
+    lines.append("# TYPE http_requests_total counter")
+    for (method, route), values in sorted(snapshot.items()):
+        for status, status_count in sorted(values[6].items()):
+            lines.append(
+                f'http_requests_total{{method="{_escape(method)}",route="{_escape(route)}",status="{status}"}} {status_count}'
+            )
+
+    per_route_counters = (
+        ("http_request_sql_statements_total", "라우트별 실행된 SQL 문 수", 3),
+        ("http_request_sql_seconds_total", "라우트별 SQL 실행 시간 합계", 4),
+        ("http_request_sql_rows_total", "라우트별 ORM SELECT 반환 행 수 (METRICS_COUNT_ROWS=1일 때만 집계)", 5),
+    )
+    for name, help_text, idx in per_route_counters:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for (method, route), values in sorted(snapshot.items()):
+            lines.append(
+                f'{name}{{method="{_escape(method)}",route="{_escape(route)}"}} {_format_number(values[idx])}'
+            )
+
+    for name, value in sorted((extra_gauges or {}).items()):
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {_format_number(value)}")
+
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    """누적 지표 초기화 (벤치마크용)"""
+    with _routes_lock:
+        _routes.clear()
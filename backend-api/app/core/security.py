@@ -1,39 +1,155 @@
 """
 인증 및 보안 관련 유틸리티
 """
-import warnings
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Set
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.core.hashing import pwd_context
+from app.database import SessionLocal, get_db
 from app.models import User
 
-# bcrypt 버전 경고 숨기기 (passlib과 bcrypt 호환성 문제로 인한 경고)
-warnings.filterwarnings("ignore", message=".*bcrypt.*", category=UserWarning)
-
-# 비밀번호 해싱 설정
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
 
 # JWT 설정
 SECRET_KEY = "your-secret-key-change-in-production"  # 프로덕션에서는 환경변수로 관리
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24 * 60  # 30일
 
+# 인증 캐시 설정 (검증된 토큰 -> 사용자 스냅샷)
+AUTH_CACHE_TTL_SECONDS = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "300"))
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", "1024"))
+
+# 관리자 사용자명 목록 (쉼표로 구분, 비어 있으면 관리자 기능 비활성화)
+ADMIN_USERNAMES = {
+    name.strip() for name in os.getenv("ADMIN_USERNAMES", "").split(",") if name.strip()
+}
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """
+    인증된 사용자 정보 (읽기 전용 스냅샷)
+
+    세션에 붙지 않은 값이므로 ORM 행이 필요하면 id로 직접 조회한다.
+    """
+    id: int
+    username: str
+    email: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+
 # OAuth2 스키마
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
+
+
+class _AuthCache:
+    """
+    검증된 JWT -> CurrentUser 캐시 (크기 제한 LRU + TTL)
+
+    캐시 적중 시 JWT 디코딩과 DB 조회를 모두 생략한다. 항목은 TTL과 토큰 만료
+    시각 중 빠른 쪽에 만료되며, 사용자 정보가 바뀌면(비밀번호 변경 포함)
+    해당 사용자의 모든 항목이 즉시 무효화된다.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[CurrentUser]:
+        if self.max_size <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            expires_at, user_id, user = entry
+            if expires_at <= time.monotonic():
+                self._remove(token, user_id)
+                return None
+            self._entries.move_to_end(token)
+            return user
+
+    def put(self, token: str, user: CurrentUser, token_exp: Optional[float]) -> None:
+        if self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        if token_exp is not None:
+            # 토큰 자체가 만료되면 캐시도 더 이상 유효하지 않음
+            expires_at = min(expires_at, time.monotonic() + (float(token_exp) - time.time()))
+        with self._lock:
+            if token in self._entries:
+                self._remove(token, self._entries[token][1])
+            self._entries[token] = (expires_at, user.id, user)
+            self._tokens_by_user.setdefault(user.id, set()).add(token)
+            while len(self._entries) > self.max_size:
+                old_token, (_, old_user_id, _) = next(iter(self._entries.items()))
+                self._remove(old_token, old_user_id)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for token in self._tokens_by_user.pop(user_id, set()):
+                self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def _remove(self, token: str, user_id: int) -> None:
+        self._entries.pop(token, None)
+        tokens = self._tokens_by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user_id]
+
+
+_auth_cache = _AuthCache(AUTH_CACHE_MAX_SIZE, AUTH_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_auth_cache(mapper, connection, target):
+    """사용자 정보 변경/삭제 시 캐시된 인증 정보 무효화"""
+    _auth_cache.invalidate_user(target.id)
+
+
+def invalidate_user_cache(user_id: int) -> None:
+    """특정 사용자의 인증 캐시 무효화 (ORM 밖에서 사용자 정보를 바꾼 경우)"""
+    _auth_cache.invalidate_user(user_id)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """비밀번호 검증"""
+    """비밀번호 검증 (동기 - 요청 처리 경로에서는 app.core.hashing의 비동기 함수 사용)"""
     return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """비밀번호 해싱"""
+    """비밀번호 해싱 (동기 - 요청 처리 경로에서는 app.core.hashing의 비동기 함수 사용)"""
     return pwd_context.hash(password)
 
 
@@ -49,49 +165,86 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """현재 로그인한 사용자 조회"""
-    import logging
-    logger = logging.getLogger(__name__)
-    
+def _resolve_user(token: str, db: Session) -> CurrentUser:
+    """토큰을 검증하고 사용자를 반환 (캐시 우선, 없으면 JWT 디코딩 + DB 조회)"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="인증 정보를 확인할 수 없습니다",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
-    logger.info(f"=== get_current_user 호출 ===")
-    logger.info(f"토큰 존재 여부: {token is not None}")
-    if token:
-        logger.info(f"토큰 길이: {len(token)}")
-        logger.info(f"토큰 처음 20자: {token[:20]}...")
-    
+
+    cached = _auth_cache.get(token)
+    if cached is not None:
+        return cached
+
+    debug = logger.isEnabledFor(logging.DEBUG)
     try:
-        logger.info(f"JWT 디코딩 시도...")
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        logger.info(f"JWT 디코딩 성공: {payload}")
         # JWT 표준에 따라 sub는 문자열이므로 정수로 변환
         user_id_str = payload.get("sub")
-        logger.info(f"추출된 user_id (문자열): {user_id_str}")
         if user_id_str is None:
-            logger.error("user_id가 None입니다!")
+            logger.warning("토큰에 sub 클레임이 없습니다")
             raise credentials_exception
         user_id: int = int(user_id_str)
-        logger.info(f"변환된 user_id (정수): {user_id}")
+    except HTTPException:
+        raise
     except JWTError as e:
-        logger.error(f"JWT 디코딩 오류: {type(e).__name__}: {str(e)}")
+        if debug:
+            logger.debug("JWT 디코딩 오류: %s: %s", type(e).__name__, e)
         raise credentials_exception
     except Exception as e:
-        logger.error(f"예상치 못한 오류: {type(e).__name__}: {str(e)}")
+        logger.warning("토큰 처리 중 예상치 못한 오류: %s", type(e).__name__)
         raise credentials_exception
-    
-    logger.info(f"DB에서 사용자 조회 시도: user_id={user_id}")
+
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
-        logger.error(f"사용자를 찾을 수 없습니다: user_id={user_id}")
+        if debug:
+            logger.debug("사용자를 찾을 수 없습니다: user_id=%s", user_id)
         raise credentials_exception
-    logger.info(f"사용자 조회 성공: username={user.username}, id={user.id}")
-    return user
+
+    current_user = CurrentUser.from_user(user)
+    _auth_cache.put(token, current_user, payload.get("exp"))
+    if debug:
+        logger.debug("사용자 인증 성공 (캐시 저장): user_id=%s", user.id)
+    return current_user
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> CurrentUser:
+    """현재 로그인한 사용자 조회"""
+    return _resolve_user(token, db)
+
+
+def get_current_user_for_stream(
+    token: Optional[str] = Query(None, description="액세스 토큰 (EventSource는 헤더를 보낼 수 없음)"),
+    header_token: Optional[str] = Depends(optional_oauth2_scheme)
+) -> CurrentUser:
+    """
+    스트리밍(SSE) 연결용 사용자 인증 - Authorization 헤더 또는 token 쿼리 파라미터
+
+    연결이 열려 있는 동안 DB 세션을 붙잡지 않도록 인증 직후 세션을 닫는다.
+    """
+    token = header_token or token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="인증 정보를 확인할 수 없습니다",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    db = SessionLocal()
+    try:
+        return _resolve_user(token, db)
+    finally:
+        db.close()
+
+
+def get_current_admin_user(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+    """현재 로그인한 관리자 조회 (ADMIN_USERNAMES에 등록된 사용자만 허용)"""
+    if current_user.username not in ADMIN_USERNAMES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자 권한이 필요합니다",
+        )
+    return current_user
@@ -7,7 +7,7 @@ from sqlalchemy.orm import sessionmaker
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_DIR = os.path.join(BASE_DIR, "..", "data")
 os.makedirs(DB_DIR, exist_ok=True)
-DATABASE_URL = f"sqlite:///{os.path.join(DB_DIR, 'accountbook.db')}"
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(DB_DIR, 'accountbook.db')}")
 
 engine = create_engine(
     DATABASE_URL,
@@ -30,7 +30,12 @@ def get_db():
 
 
 def init_db():
-    """데이터베이스 초기화 및 테이블 생성"""
-    from app.models import user, category, transaction, budget, recurring_transaction, tag, transaction_template, transaction_attachment
-    
+    """데이터베이스 초기화 및 테이블 생성, 미적용 마이그레이션 적용"""
+    from sqlalchemy import inspect
+    from app.models import user, category, transaction, budget, recurring_transaction, tag, transaction_template, transaction_attachment, classifier, ingested_message, anomaly, budget_alert, change_log, idempotency, pending_file_deletion
+    from app.migrations import runner
+
+    # 테이블이 하나도 없으면 create_all이 최신 스키마를 만들므로 마이그레이션은 번호만 기록
+    fresh = not inspect(engine).has_table("users")
     Base.metadata.create_all(bind=engine)
+    runner.migrate_database(fresh)
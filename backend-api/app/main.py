@@ -1,11 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from dotenv import load_dotenv
-from app.routers import transactions, categories, statistics, auth, budgets, ai, reports, recurring_transactions, tags, backup, transaction_templates, transaction_attachments
 
-# 환경 변수 로드
+# 환경 변수 로드 (모듈 수준 설정값이 .env를 읽을 수 있도록 앱 모듈보다 먼저 로드)
 load_dotenv()
 
+from app.core import events, hashing, metrics
+from app.database import init_db
+from app.migrations import runner
+from app.services import deletion_service
+from app.routers import transactions, categories, statistics, auth, budgets, ai, reports, recurring_transactions, tags, backup, transaction_templates, transaction_attachments, snapshots, ingest, anomalies, event_stream, sync
+
 app = FastAPI(title="가계부 API", version="1.0.0")
 
 # CORS 설정
@@ -17,6 +23,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청/SQL 계측
+app.add_middleware(metrics.MetricsMiddleware)
+
 # 라우터 등록
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(transactions.router, prefix="/api/transactions", tags=["transactions"])
@@ -30,6 +39,48 @@ app.include_router(tags.router, prefix="/api/tags", tags=["tags"])
 app.include_router(backup.router, prefix="/api/backup", tags=["backup"])
 app.include_router(transaction_templates.router, prefix="/api/transaction-templates", tags=["transaction-templates"])
 app.include_router(transaction_attachments.router, prefix="/api/transaction-attachments", tags=["transaction-attachments"])
+app.include_router(snapshots.router, prefix="/api/admin/snapshots", tags=["admin"])
+app.include_router(ingest.router, prefix="/api/ingest", tags=["ingest"])
+app.include_router(anomalies.router, prefix="/api/anomalies", tags=["anomalies"])
+app.include_router(event_stream.router, prefix="/api/events", tags=["events"])
+app.include_router(sync.router, prefix="/api/sync", tags=["sync"])
+
+
+@app.on_event("startup")
+def apply_migrations():
+    """테이블 생성 및 미적용 마이그레이션 적용 (MIGRATE_ON_STARTUP=0이면 건너뜀)"""
+    if runner.MIGRATE_ON_STARTUP:
+        init_db()
+
+
+@app.on_event("startup")
+def install_event_stream_exit_hook():
+    """서버 종료 시 열린 실시간 이벤트 스트림을 먼저 닫도록 설정"""
+    events.install_exit_hook()
+
+
+@app.on_event("startup")
+def resume_file_cleanup():
+    """이전 실행에서 남은 첨부파일 삭제 대기열 정리"""
+    deletion_service.schedule_file_cleanup()
+
+
+@app.on_event("shutdown")
+def shutdown_hashing_pool():
+    """비밀번호 해싱 프로세스 풀 종료"""
+    hashing.shutdown()
+
+
+@app.on_event("shutdown")
+def shutdown_file_cleanup():
+    """첨부파일 정리 스레드 종료"""
+    deletion_service.shutdown()
+
+
+@app.on_event("shutdown")
+def optimize_database():
+    """통계가 오래된 테이블만 다시 분석 (PRAGMA optimize)"""
+    runner.optimize()
 
 
 @app.get("/")
@@ -40,3 +91,18 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    """Prometheus 형식 지표"""
+    pool_stats = hashing.get_stats()
+    gauges = {
+        f"password_hash_{key}": value
+        for key, value in pool_stats.items()
+    }
+    gauges["event_stream_connections"] = events.broker.connection_count()
+    return PlainTextResponse(
+        metrics.render_prometheus(gauges),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,80 @@
+"""
+카테고리 금액 통계/이상 거래 테이블 추가 마이그레이션
+
+테이블 생성 후 기존 거래 내역으로 사용자/카테고리별 통계를 계산한다.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text, create_engine
+from sqlalchemy.orm import Session
+
+# 데이터베이스 파일 경로
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DB_DIR = os.path.join(BASE_DIR, "..", "data")
+os.makedirs(DB_DIR, exist_ok=True)
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(DB_DIR, 'accountbook.db')}")
+
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+
+def upgrade():
+    """카테고리 금액 통계/이상 거래 테이블 생성 및 기존 거래로 통계 계산"""
+    with engine.connect() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS category_amount_stats (
+                user_id INTEGER NOT NULL,
+                category_id INTEGER NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                mean FLOAT NOT NULL DEFAULT 0,
+                m2 FLOAT NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, category_id),
+                FOREIGN KEY (user_id) REFERENCES users(id),
+                FOREIGN KEY (category_id) REFERENCES categories(id)
+            )
+        """))
+
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS transaction_anomalies (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                transaction_id INTEGER NOT NULL UNIQUE,
+                category_id INTEGER NOT NULL,
+                transaction_date DATE NOT NULL,
+                amount FLOAT NOT NULL,
+                z_score FLOAT NOT NULL,
+                mean FLOAT NOT NULL,
+                std FLOAT NOT NULL,
+                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(id),
+                FOREIGN KEY (transaction_id) REFERENCES transactions(id),
+                FOREIGN KEY (category_id) REFERENCES categories(id)
+            )
+        """))
+
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_anomalies_user_date
+            ON transaction_anomalies(user_id, transaction_date)
+        """))
+
+        conn.commit()
+
+    # 기존 거래 내역으로 통계 계산 (과거 거래는 이상 거래로 판정하지 않음)
+    from app.services.anomaly_service import rebuild_all
+
+    with Session(bind=engine) as session:
+        return rebuild_all(session)
+
+
+def downgrade():
+    """카테고리 금액 통계/이상 거래 테이블 삭제"""
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS transaction_anomalies"))
+        conn.execute(text("DROP TABLE IF EXISTS category_amount_stats"))
+        conn.commit()
+
+
+if __name__ == "__main__":
+    results = upgrade()
+    print(f"이상 거래 테이블이 생성되었습니다. (통계를 계산한 사용자 {len(results)}명)")
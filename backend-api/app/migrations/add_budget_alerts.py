@@ -0,0 +1,58 @@
+"""
+예산 임계값 알림 테이블 추가 마이그레이션
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text, create_engine
+
+# 데이터베이스 파일 경로
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DB_DIR = os.path.join(BASE_DIR, "..", "data")
+os.makedirs(DB_DIR, exist_ok=True)
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(DB_DIR, 'accountbook.db')}")
+
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+
+def upgrade():
+    """budget_alerts 테이블 생성"""
+    with engine.connect() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS budget_alerts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                budget_id INTEGER NOT NULL,
+                category_id INTEGER,
+                month TEXT NOT NULL,
+                threshold INTEGER NOT NULL,
+                budget_amount FLOAT NOT NULL,
+                spent_amount FLOAT NOT NULL,
+                percentage FLOAT NOT NULL,
+                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(id),
+                FOREIGN KEY (budget_id) REFERENCES budgets(id),
+                FOREIGN KEY (category_id) REFERENCES categories(id),
+                CONSTRAINT uq_budget_alerts_budget_threshold UNIQUE (budget_id, threshold)
+            )
+        """))
+
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_budget_alerts_user_month
+            ON budget_alerts(user_id, month)
+        """))
+
+        conn.commit()
+
+
+def downgrade():
+    """budget_alerts 테이블 삭제"""
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS budget_alerts"))
+        conn.commit()
+
+
+if __name__ == "__main__":
+    upgrade()
+    print("예산 알림 테이블이 생성되었습니다.")
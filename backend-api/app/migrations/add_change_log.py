@@ -0,0 +1,84 @@
+"""
+동기화용 변경 로그 테이블 추가 마이그레이션
+
+기존 데이터는 'create' 변경으로 한 번 기록해 두어 since=0으로 전체를 받을 수 있게 한다.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text, create_engine
+
+# 데이터베이스 파일 경로
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DB_DIR = os.path.join(BASE_DIR, "..", "data")
+os.makedirs(DB_DIR, exist_ok=True)
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(DB_DIR, 'accountbook.db')}")
+
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+# 엔티티 이름 -> 테이블
+ENTITY_TABLES = {
+    "category": "categories",
+    "tag": "tags",
+    "transaction": "transactions",
+    "budget": "budgets",
+    "recurring_transaction": "recurring_transactions",
+    "transaction_template": "transaction_templates",
+    "transaction_attachment": "transaction_attachments",
+}
+
+
+def upgrade():
+    """change_log 테이블 생성 및 기존 데이터 기록"""
+    with engine.connect() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS change_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                entity TEXT NOT NULL,
+                entity_id INTEGER NOT NULL,
+                op TEXT NOT NULL,
+                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(id)
+            )
+        """))
+
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_change_log_user_version
+            ON change_log(user_id, id)
+        """))
+
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_change_log_entity
+            ON change_log(user_id, entity, entity_id)
+        """))
+
+        tables = {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))}
+        for entity, table in ENTITY_TABLES.items():
+            if table not in tables:
+                continue
+            conn.execute(text(f"""
+                INSERT INTO change_log (user_id, entity, entity_id, op)
+                SELECT t.user_id, :entity, t.id, 'create'
+                FROM {table} t
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM change_log c
+                    WHERE c.user_id = t.user_id AND c.entity = :entity AND c.entity_id = t.id
+                )
+                ORDER BY t.id
+            """), {"entity": entity})
+
+        conn.commit()
+
+
+def downgrade():
+    """change_log 테이블 삭제"""
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS change_log"))
+        conn.commit()
+
+
+if __name__ == "__main__":
+    upgrade()
+    print("동기화 변경 로그 테이블이 생성되었습니다.")
@@ -0,0 +1,73 @@
+"""
+학습형 카테고리 분류기 카운트 테이블 추가 마이그레이션
+
+테이블 생성 후 기존 거래 내역으로 사용자별 모델을 학습한다.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text, create_engine
+from sqlalchemy.orm import Session
+
+# 데이터베이스 파일 경로
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DB_DIR = os.path.join(BASE_DIR, "..", "data")
+os.makedirs(DB_DIR, exist_ok=True)
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(DB_DIR, 'accountbook.db')}")
+
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+
+def upgrade():
+    """분류기 카운트 테이블 생성 및 초기 학습"""
+    with engine.connect() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS classifier_category_stats (
+                user_id INTEGER NOT NULL,
+                category_id INTEGER NOT NULL,
+                doc_count INTEGER NOT NULL DEFAULT 0,
+                feature_total INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, category_id),
+                FOREIGN KEY (user_id) REFERENCES users(id),
+                FOREIGN KEY (category_id) REFERENCES categories(id)
+            )
+        """))
+
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS classifier_feature_counts (
+                user_id INTEGER NOT NULL,
+                feature TEXT NOT NULL,
+                category_id INTEGER NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, feature, category_id),
+                FOREIGN KEY (user_id) REFERENCES users(id),
+                FOREIGN KEY (category_id) REFERENCES categories(id)
+            )
+        """))
+
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_classifier_features_user_category
+            ON classifier_feature_counts(user_id, category_id)
+        """))
+
+        conn.commit()
+
+    # 기존 거래 내역으로 학습
+    from app.services.learned_classifier import rebuild_all
+
+    with Session(bind=engine) as session:
+        return rebuild_all(session)
+
+
+def downgrade():
+    """분류기 카운트 테이블 삭제"""
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS classifier_feature_counts"))
+        conn.execute(text("DROP TABLE IF EXISTS classifier_category_stats"))
+        conn.commit()
+
+
+if __name__ == "__main__":
+    results = upgrade()
+    print(f"분류기 테이블이 생성되었습니다. (학습한 사용자 {len(results)}명)")
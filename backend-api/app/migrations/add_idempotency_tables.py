@@ -0,0 +1,67 @@
+"""
+Idempotency-Key 기록 / 가져오기 파일 해시 테이블 추가 마이그레이션
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text, create_engine
+
+# 데이터베이스 파일 경로
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DB_DIR = os.path.join(BASE_DIR, "..", "data")
+os.makedirs(DB_DIR, exist_ok=True)
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(DB_DIR, 'accountbook.db')}")
+
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+
+def upgrade():
+    """idempotency_keys, imported_files 테이블 생성"""
+    with engine.connect() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS idempotency_keys (
+                user_id INTEGER NOT NULL,
+                key TEXT NOT NULL,
+                request_hash BLOB NOT NULL,
+                status_code INTEGER,
+                response_body TEXT,
+                expires_at DATETIME NOT NULL,
+                PRIMARY KEY (user_id, key),
+                FOREIGN KEY (user_id) REFERENCES users(id)
+            )
+        """))
+
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires
+            ON idempotency_keys(expires_at)
+        """))
+
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS imported_files (
+                user_id INTEGER NOT NULL,
+                target TEXT NOT NULL,
+                content_hash BLOB NOT NULL,
+                file_name TEXT,
+                success INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (user_id, target, content_hash),
+                FOREIGN KEY (user_id) REFERENCES users(id)
+            )
+        """))
+
+        conn.commit()
+
+
+def downgrade():
+    """idempotency_keys, imported_files 테이블 삭제"""
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS imported_files"))
+        conn.execute(text("DROP TABLE IF EXISTS idempotency_keys"))
+        conn.commit()
+
+
+if __name__ == "__main__":
+    upgrade()
+    print("Idempotency-Key / 가져오기 파일 테이블이 생성되었습니다.")
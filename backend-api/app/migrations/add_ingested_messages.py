@@ -0,0 +1,48 @@
+"""
+문자 수집 이력 테이블 추가 마이그레이션
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text, create_engine
+
+# 데이터베이스 파일 경로
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DB_DIR = os.path.join(BASE_DIR, "..", "data")
+os.makedirs(DB_DIR, exist_ok=True)
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(DB_DIR, 'accountbook.db')}")
+
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+
+def upgrade():
+    """ingested_messages 테이블 생성"""
+    with engine.connect() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS ingested_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                dedup_hash TEXT NOT NULL,
+                issuer TEXT NOT NULL,
+                transaction_id INTEGER,
+                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(id),
+                FOREIGN KEY (transaction_id) REFERENCES transactions(id),
+                CONSTRAINT uq_ingested_messages_user_hash UNIQUE (user_id, dedup_hash)
+            )
+        """))
+
+        conn.commit()
+
+
+def downgrade():
+    """ingested_messages 테이블 삭제"""
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS ingested_messages"))
+        conn.commit()
+
+
+if __name__ == "__main__":
+    upgrade()
+    print("문자 수집 이력 테이블이 생성되었습니다.")
@@ -0,0 +1,63 @@
+"""
+금액 컬럼 최소 단위 정수 변환 마이그레이션
+
+transactions / budgets / recurring_transactions / transaction_templates의 amount를
+NUMERIC(10, 2)에서 최소 단위(0.01) 정수 INTEGER로 바꾼다. 새 컬럼에 반올림한 값을
+채운 뒤 기존 컬럼을 지우고 이름을 바꾸므로, amount는 테이블의 마지막 컬럼이 된다.
+이미 INTEGER인 테이블은 건너뛰므로 여러 번 실행해도 된다.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text, create_engine
+
+# 데이터베이스 파일 경로
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DB_DIR = os.path.join(BASE_DIR, "..", "data")
+os.makedirs(DB_DIR, exist_ok=True)
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(DB_DIR, 'accountbook.db')}")
+
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+TABLES = ("transactions", "budgets", "recurring_transactions", "transaction_templates")
+
+
+def _amount_type(conn, table: str):
+    """amount 컬럼 타입 (테이블이 없으면 None)"""
+    for row in conn.execute(text(f"PRAGMA table_info({table})")):
+        if row[1] == "amount":
+            return row[2].upper()
+    return None
+
+
+def _replace_amount(conn, table: str, column_type: str, expression: str):
+    """amount를 새 타입 컬럼으로 교체 (expression은 기존 amount로 새 값을 계산하는 식)"""
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN amount_new {column_type} NOT NULL DEFAULT 0"))
+    conn.execute(text(f"UPDATE {table} SET amount_new = {expression}"))
+    conn.execute(text(f"ALTER TABLE {table} DROP COLUMN amount"))
+    conn.execute(text(f"ALTER TABLE {table} RENAME COLUMN amount_new TO amount"))
+
+
+def upgrade():
+    """금액을 최소 단위 정수로 변환 (0.01 미만은 반올림)"""
+    with engine.begin() as conn:
+        for table in TABLES:
+            column_type = _amount_type(conn, table)
+            if column_type is None or column_type == "INTEGER":
+                continue
+            _replace_amount(conn, table, "INTEGER", "CAST(ROUND(amount * 100) AS INTEGER)")
+
+
+def downgrade():
+    """최소 단위 정수를 NUMERIC(10, 2) 금액으로 복원"""
+    with engine.begin() as conn:
+        for table in TABLES:
+            if _amount_type(conn, table) != "INTEGER":
+                continue
+            _replace_amount(conn, table, "NUMERIC(10, 2)", "amount / 100.0")
+
+
+if __name__ == "__main__":
+    upgrade()
+    print("금액 컬럼이 최소 단위 정수로 변환되었습니다.")
@@ -0,0 +1,54 @@
+"""
+거래 중복 확인용 지문(fingerprint) 컬럼 추가 마이그레이션
+
+기존 거래의 지문을 채운 뒤 (user_id, fingerprint) 인덱스를 만든다.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text, create_engine
+from sqlalchemy.orm import Session
+
+# 데이터베이스 파일 경로
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DB_DIR = os.path.join(BASE_DIR, "..", "data")
+os.makedirs(DB_DIR, exist_ok=True)
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(DB_DIR, 'accountbook.db')}")
+
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+
+def upgrade():
+    """transactions.fingerprint 컬럼 추가, 기존 거래 지문 계산, 인덱스 생성"""
+    from app.services.duplicate_service import backfill
+
+    with engine.connect() as conn:
+        columns = [row[1] for row in conn.execute(text("PRAGMA table_info(transactions)"))]
+        if "fingerprint" not in columns:
+            conn.execute(text("ALTER TABLE transactions ADD COLUMN fingerprint TEXT"))
+            conn.commit()
+
+    with Session(engine) as db:
+        count = backfill(db)
+
+    with engine.connect() as conn:
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_transactions_user_fingerprint
+            ON transactions(user_id, fingerprint)
+        """))
+        conn.commit()
+    return count
+
+
+def downgrade():
+    """인덱스와 컬럼 삭제 (SQLite 3.35 이상)"""
+    with engine.connect() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS idx_transactions_user_fingerprint"))
+        conn.execute(text("ALTER TABLE transactions DROP COLUMN fingerprint"))
+        conn.commit()
+
+
+if __name__ == "__main__":
+    filled = upgrade()
+    print(f"거래 지문 컬럼이 추가되었습니다. (기존 거래 {filled}건 계산)")
@@ -0,0 +1,303 @@
+"""
+버전 관리 마이그레이션 실행기
+
+적용한 마이그레이션 번호를 schema_version 테이블에 기록하고, 아직 적용하지 않은 번호만
+순서대로 실행한다. 서버 시작 시(init_db) 자동으로 실행되며 CLI로도 실행할 수 있다.
+
+    python -m app.migrations.runner              # 미적용 마이그레이션 적용
+    python -m app.migrations.runner status       # 적용 현황
+    python -m app.migrations.runner analyze      # 통계 갱신 (ANALYZE, PRAGMA optimize)
+
+- 새로 만든 데이터베이스는 create_all이 최신 스키마를 만들므로 실행하지 않고 번호만 기록
+- schema_version이 없는 기존 데이터베이스는 1번부터 모두 실행 (기존 스크립트는 모두
+  여러 번 실행해도 되도록 작성되어 있음)
+- 인덱스는 인덱스마다 따로 쓰기 트랜잭션(BEGIN IMMEDIATE) 하나로 만들어, 쓰기 잠금이
+  마이그레이션 전체가 아니라 인덱스 하나를 만드는 동안만 잡히게 한다. SQLite는 인덱스를
+  만드는 동안 다른 쓰기를 막으므로(읽기는 가능) 다른 연결의 쓰기는 그동안 기다린다.
+- 인덱스를 만든 뒤에는 표본 ANALYZE와 PRAGMA optimize로 통계를 갱신해 플래너가 새
+  인덱스를 쓰게 한다.
+
+새 마이그레이션은 MIGRATIONS 끝에 다음 번호로 추가한다. 스키마 변경은 app/migrations/에
+upgrade()가 있는 스크립트를 만들어 script로 지정하고, 인덱스만 바꾸는 경우에는
+create_indexes / drop_indexes로 지정한다.
+"""
+import argparse
+import importlib
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+# 서버 시작 시 마이그레이션 실행 여부
+MIGRATE_ON_STARTUP = os.getenv("MIGRATE_ON_STARTUP", "1") != "0"
+# 인덱스를 만들기 전 다른 연결의 쓰기가 끝나기를 기다리는 시간
+MIGRATION_BUSY_TIMEOUT_MS = int(os.getenv("MIGRATION_BUSY_TIMEOUT_MS", "30000"))
+# ANALYZE가 인덱스마다 읽을 최대 행 수 (0이면 전체)
+ANALYZE_LIMIT = int(os.getenv("ANALYZE_LIMIT", "1000"))
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """만들 인덱스"""
+    name: str
+    table: str
+    columns: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Migration:
+    """번호가 붙은 마이그레이션 (script: app/migrations/<script>.py의 upgrade() 실행)"""
+    version: int
+    name: str
+    script: Optional[str] = None
+    create_indexes: Tuple[IndexSpec, ...] = ()
+    drop_indexes: Tuple[str, ...] = ()
+
+
+# 적용 순서 - 금액을 읽는 지문/통계 계산보다 금액 정수 변환이 먼저 오도록 배치
+MIGRATIONS: List[Migration] = [
+    Migration(1, "add_tags", script="add_tags"),
+    Migration(2, "add_recurring_transactions", script="add_recurring_transactions"),
+    Migration(3, "add_transaction_templates", script="add_transaction_templates"),
+    Migration(4, "add_transaction_attachments", script="add_transaction_attachments"),
+    Migration(5, "add_integer_amounts", script="add_integer_amounts"),
+    Migration(6, "add_classifier_tables", script="add_classifier_tables"),
+    Migration(7, "add_ingested_messages", script="add_ingested_messages"),
+    Migration(8, "add_anomaly_tables", script="add_anomaly_tables"),
+    Migration(9, "add_budget_alerts", script="add_budget_alerts"),
+    Migration(10, "add_change_log", script="add_change_log"),
+    Migration(11, "add_idempotency_tables", script="add_idempotency_tables"),
+    Migration(12, "add_transaction_fingerprint", script="add_transaction_fingerprint"),
+    Migration(13, "add_pending_file_deletions", script="add_pending_file_deletions"),
+    Migration(
+        14, "add_transaction_tags_tag_index",
+        create_indexes=(
+            IndexSpec("idx_transaction_tags_tag_transaction", "transaction_tags", ("tag_id", "transaction_id")),
+        ),
+        drop_indexes=("idx_transaction_tags_tag_id", "idx_transaction_tags_transaction_id"),
+    ),
+    Migration(
+        15, "add_covering_indexes",
+        create_indexes=(
+            IndexSpec(
+                "idx_transactions_user_type_date_cover", "transactions",
+                ("user_id", "type", "transaction_date", "category_id", "amount"),
+            ),
+        ),
+        drop_indexes=("ix_transactions_user_id", "idx_transaction_date"),
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+# ---------------------------------------------------------------------------
+# schema_version
+# ---------------------------------------------------------------------------
+
+def _ensure_version_table() -> None:
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                duration_ms INTEGER NOT NULL DEFAULT 0,
+                applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+
+
+def _record(migration: Migration, duration_ms: int) -> None:
+    # 여러 워커가 동시에 시작해 같은 번호를 적용해도 기록은 하나만 남음
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT OR IGNORE INTO schema_version (version, name, duration_ms) VALUES (:version, :name, :ms)"),
+            {"version": migration.version, "name": migration.name, "ms": duration_ms},
+        )
+
+
+def applied_versions() -> Dict[int, dict]:
+    """적용한 마이그레이션 {번호: {"name", "duration_ms", "applied_at"}}"""
+    _ensure_version_table()
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT version, name, duration_ms, applied_at FROM schema_version"))
+        return {row.version: {"name": row.name, "duration_ms": row.duration_ms, "applied_at": row.applied_at}
+                for row in rows}
+
+
+def pending() -> List[Migration]:
+    """아직 적용하지 않은 마이그레이션 (번호 순)"""
+    applied = applied_versions()
+    return [migration for migration in MIGRATIONS if migration.version not in applied]
+
+
+# ---------------------------------------------------------------------------
+# 실행
+# ---------------------------------------------------------------------------
+
+def build_index(index: IndexSpec) -> bool:
+    """
+    인덱스 하나를 자체 쓰기 트랜잭션으로 생성, 새로 만들었으면 True
+
+    BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡아(다른 쓰기가 끝나길 busy timeout만큼 기다림)
+    만드는 도중에 잠금 충돌로 실패하지 않게 한다.
+    """
+    raw = engine.raw_connection()
+    try:
+        connection = raw.driver_connection
+        isolation_level = connection.isolation_level
+        connection.isolation_level = None  # BEGIN/COMMIT을 직접 실행
+        try:
+            busy_timeout = connection.execute("PRAGMA busy_timeout").fetchone()[0]
+            connection.execute(f"PRAGMA busy_timeout = {MIGRATION_BUSY_TIMEOUT_MS}")
+            exists = connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (index.name,)
+            ).fetchone()
+            if exists:
+                return False
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index.name} ON {index.table}({', '.join(index.columns)})"
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            return True
+        finally:
+            # 풀로 돌아가는 연결의 설정 복원
+            connection.execute(f"PRAGMA busy_timeout = {busy_timeout}")
+            connection.isolation_level = isolation_level
+    finally:
+        raw.close()
+
+
+def _run_script(name: str) -> None:
+    module = importlib.import_module(f"app.migrations.{name}")
+    try:
+        module.upgrade()
+    finally:
+        # 스크립트마다 만드는 엔진의 연결 정리
+        script_engine = getattr(module, "engine", None)
+        if script_engine is not None:
+            script_engine.dispose()
+
+
+def _apply(migration: Migration) -> bool:
+    """마이그레이션 하나 실행, 인덱스를 새로 만들었으면 True"""
+    if migration.script:
+        _run_script(migration.script)
+    built = False
+    for index in migration.create_indexes:
+        started = time.perf_counter()
+        if build_index(index):
+            built = True
+            logger.info("인덱스 생성: %s (%.2fs)", index.name, time.perf_counter() - started)
+    if migration.drop_indexes:
+        with engine.begin() as conn:
+            for name in migration.drop_indexes:
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    return built
+
+
+def analyze(full: bool = False) -> None:
+    """
+    플래너 통계 갱신
+
+    ANALYZE_LIMIT로 인덱스마다 표본만 읽어(analysis_limit) 큰 테이블에서도 빨리 끝나게 하고,
+    이어서 PRAGMA optimize를 실행한다. full이면 표본 제한 없이 전체를 읽는다.
+    """
+    with engine.connect() as conn:
+        conn.exec_driver_sql(f"PRAGMA analysis_limit = {0 if full else ANALYZE_LIMIT}")
+        conn.exec_driver_sql("ANALYZE")
+        conn.exec_driver_sql("PRAGMA optimize")
+        conn.commit()
+
+
+def optimize() -> None:
+    """PRAGMA optimize - 통계가 오래된 테이블만 다시 분석 (종료 시 호출)"""
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA optimize")
+        conn.commit()
+
+
+def upgrade(target: Optional[int] = None) -> List[Tuple[int, str, int]]:
+    """
+    미적용 마이그레이션을 번호 순으로 적용
+
+    Args:
+        target: 이 번호까지만 적용 (없으면 최신까지)
+
+    Returns:
+        적용한 (번호, 이름, 소요 ms) 목록
+    """
+    applied = []
+    indexes_built = False
+    for migration in pending():
+        if target is not None and migration.version > target:
+            break
+        started = time.perf_counter()
+        indexes_built |= _apply(migration)
+        duration_ms = int((time.perf_counter() - started) * 1000)
+        _record(migration, duration_ms)
+        applied.append((migration.version, migration.name, duration_ms))
+        logger.info("마이그레이션 %d 적용: %s (%dms)", migration.version, migration.name, duration_ms)
+    if indexes_built:
+        analyze()
+    elif applied:
+        optimize()
+    return applied
+
+
+def stamp(version: int = LATEST_VERSION) -> None:
+    """실행하지 않고 해당 번호까지 적용한 것으로 기록 (create_all로 만든 새 데이터베이스용)"""
+    for migration in pending():
+        if migration.version <= version:
+            _record(migration, 0)
+
+
+def migrate_database(fresh: bool) -> List[Tuple[int, str, int]]:
+    """init_db에서 호출 - 새 데이터베이스는 번호만 기록하고 기존 데이터베이스는 마이그레이션 적용"""
+    if fresh:
+        stamp()
+        return []
+    return upgrade()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="데이터베이스 마이그레이션")
+    parser.add_argument("command", nargs="?", default="upgrade", choices=("upgrade", "status", "stamp", "analyze"))
+    parser.add_argument("--target", type=int, default=None, help="upgrade/stamp할 마지막 번호")
+    parser.add_argument("--full", action="store_true", help="analyze 시 표본 제한 없이 전체 분석")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        applied = applied_versions()
+        for migration in MIGRATIONS:
+            row = applied.get(migration.version)
+            state = f"적용됨 ({row['applied_at']}, {row['duration_ms']}ms)" if row else "미적용"
+            print(f"{migration.version:4d}  {migration.name:<36} {state}")
+    elif args.command == "stamp":
+        stamp(args.target or LATEST_VERSION)
+        print(f"마이그레이션 {args.target or LATEST_VERSION}번까지 적용한 것으로 기록했습니다.")
+    elif args.command == "analyze":
+        analyze(full=args.full)
+        print("통계를 갱신했습니다.")
+    else:
+        applied = upgrade(args.target)
+        for version, name, duration_ms in applied:
+            print(f"{version:4d}  {name} ({duration_ms}ms)")
+        print(f"마이그레이션 {len(applied)}개를 적용했습니다.")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
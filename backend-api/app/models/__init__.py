@@ -6,5 +6,12 @@ from app.models.recurring_transaction import RecurringTransaction
 from app.models.tag import Tag, transaction_tag_association
 from app.models.transaction_template import TransactionTemplate
 from app.models.transaction_attachment import TransactionAttachment
+from app.models.classifier import ClassifierCategoryStat, ClassifierFeatureCount
+from app.models.ingested_message import IngestedMessage
+from app.models.anomaly import CategoryAmountStat, TransactionAnomaly
+from app.models.budget_alert import BudgetAlert
+from app.models.change_log import ChangeLog
+from app.models.idempotency import IdempotencyKey, ImportedFile
+from app.models.pending_file_deletion import PendingFileDeletion
 
-__all__ = ["User", "Category", "Transaction", "Budget", "RecurringTransaction", "Tag", "transaction_tag_association", "TransactionTemplate", "TransactionAttachment"]
+__all__ = ["User", "Category", "Transaction", "Budget", "RecurringTransaction", "Tag", "transaction_tag_association", "TransactionTemplate", "TransactionAttachment", "ClassifierCategoryStat", "ClassifierFeatureCount", "IngestedMessage", "CategoryAmountStat", "TransactionAnomaly", "BudgetAlert", "ChangeLog", "IdempotencyKey", "ImportedFile", "PendingFileDeletion"]
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class CategoryAmountStat(Base):
+    """사용자/카테고리별 거래 금액 누적 통계 (Welford 방식 평균/분산)"""
+    __tablename__ = "category_amount_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)  # 거래 수
+    mean = Column(Float, nullable=False, default=0.0)  # 평균 금액
+    m2 = Column(Float, nullable=False, default=0.0)  # 평균과의 편차 제곱합 (분산 = m2 / (count - 1))
+
+
+class TransactionAnomaly(Base):
+    """이상 거래 - 등록 시점의 카테고리 통계 대비 금액이 큰 거래"""
+    __tablename__ = "transaction_anomalies"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    transaction_id = Column(Integer, ForeignKey("transactions.id"), nullable=False, unique=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    transaction_date = Column(Date, nullable=False)
+    amount = Column(Float, nullable=False)
+    z_score = Column(Float, nullable=False)  # (금액 - 평균) / 표준편차
+    mean = Column(Float, nullable=False)  # 판정 시점의 카테고리 평균
+    std = Column(Float, nullable=False)  # 판정 시점의 카테고리 표준편차
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("idx_anomalies_user_date", "user_id", "transaction_date"),
+    )
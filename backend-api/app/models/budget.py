@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, Numeric, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
+from app.models.types import Money
 
 
 class Budget(Base):
@@ -10,7 +11,7 @@ class Budget(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
-    amount = Column(Numeric(10, 2), nullable=False)
+    amount = Column(Money, nullable=False)  # 최소 단위 정수로 저장
     month = Column(String, nullable=False, index=True)  # YYYY-MM 형식
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
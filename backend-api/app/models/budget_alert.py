@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class BudgetAlert(Base):
+    """예산 임계값 도달 알림 - 예산별 임계값마다 한 건 (지출이 다시 내려가면 삭제되어 재발송 가능)"""
+    __tablename__ = "budget_alerts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    budget_id = Column(Integer, ForeignKey("budgets.id"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)  # None이면 전체 예산
+    month = Column(String, nullable=False)  # YYYY-MM 형식
+    threshold = Column(Integer, nullable=False)  # 임계값 (예산 대비 %)
+    budget_amount = Column(Float, nullable=False)
+    spent_amount = Column(Float, nullable=False)  # 임계값을 넘은 시점의 지출
+    percentage = Column(Float, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("budget_id", "threshold", name="uq_budget_alerts_budget_threshold"),
+        Index("idx_budget_alerts_user_month", "user_id", "month"),
+    )
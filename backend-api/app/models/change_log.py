@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ChangeLog(Base):
+    """
+    동기화용 변경 로그 - 엔티티마다 마지막 변경 한 건만 유지
+
+    id가 곧 데이터 버전이다. AUTOINCREMENT라 삭제된 번호를 다시 쓰지 않으므로
+    사용자별로도 항상 증가한다. 삭제된 엔티티는 op='delete' 행(툼스톤)으로 남는다.
+    """
+    __tablename__ = "change_log"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    entity = Column(String, nullable=False)  # transaction, category, budget ...
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String, nullable=False)  # create / update / delete
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("idx_change_log_user_version", "user_id", "id"),
+        Index("idx_change_log_entity", "user_id", "entity", "entity_id"),
+        {"sqlite_autoincrement": True},
+    )
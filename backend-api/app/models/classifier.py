@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from app.database import Base
+
+
+class ClassifierCategoryStat(Base):
+    """사용자별 카테고리 분류 모델 - 카테고리별 학습 문서 수/특징 수"""
+    __tablename__ = "classifier_category_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+    doc_count = Column(Integer, nullable=False, default=0)  # 학습에 사용된 거래 수
+    feature_total = Column(Integer, nullable=False, default=0)  # 특징(문자 n-gram) 등장 횟수 합계
+
+
+class ClassifierFeatureCount(Base):
+    """사용자별 카테고리 분류 모델 - (특징, 카테고리)별 등장 횟수 (0인 항목은 저장하지 않음)"""
+    __tablename__ = "classifier_feature_counts"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    feature = Column(String, primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("idx_classifier_features_user_category", "user_id", "category_id"),
+    )
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, Text, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Idempotency-Key 요청 기록 - 같은 키로 다시 오면 저장된 응답을 그대로 반환
+
+    status_code가 NULL이면 처리 중인 요청이다. expires_at이 지나면 정리된다
+    (처리 중인 행은 짧게 잡아 두어 서버가 중간에 죽어도 키가 묶이지 않는다).
+    """
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    key = Column(String, primary_key=True)
+    request_hash = Column(LargeBinary, nullable=False)  # 요청 내용 SHA-256 (같은 키로 다른 요청 방지)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)  # JSON
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("idx_idempotency_keys_expires", "expires_at"),
+    )
+
+
+class ImportedFile(Base):
+    """가져오기한 파일 내용 해시 - 같은 파일을 다시 올리면 행을 처리하지 않고 알림"""
+    __tablename__ = "imported_files"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    target = Column(String, primary_key=True)  # 가져오기 종류 (transactions_csv, transactions_excel)
+    content_hash = Column(LargeBinary, primary_key=True)  # 파일 내용 SHA-256
+    file_name = Column(String, nullable=True)
+    success = Column(Integer, nullable=False, default=0)  # 등록된 행 수
+    failed = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
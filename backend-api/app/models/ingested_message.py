@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class IngestedMessage(Base):
+    """카드 승인/입출금 문자 수집 이력 (중복 수집 방지용)"""
+    __tablename__ = "ingested_messages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    dedup_hash = Column(String, nullable=False)  # (금액, 승인 시각, 가맹점) 해시
+    issuer = Column(String, nullable=False)  # 카드사/은행 이름
+    transaction_id = Column(Integer, ForeignKey("transactions.id"), nullable=True)  # 생성된 거래 ID (거래가 삭제돼도 이력은 유지)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "dedup_hash", name="uq_ingested_messages_user_hash"),
+    )
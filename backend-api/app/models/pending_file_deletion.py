@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class PendingFileDeletion(Base):
+    """
+    삭제 대기 중인 첨부파일 - 거래/첨부파일 행을 지운 트랜잭션 안에서 함께 기록하고,
+    커밋 후 백그라운드에서 디스크의 파일을 지운 뒤 행을 삭제한다
+    (서버가 중간에 종료돼도 다음 시작 때 이어서 정리).
+    """
+    __tablename__ = "pending_file_deletions"
+
+    id = Column(Integer, primary_key=True)
+    file_path = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
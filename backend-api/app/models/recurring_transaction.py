@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, Numeric, ForeignKey, Boolean, Index
+from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
+from app.models.types import Money
 
 
 class RecurringTransaction(Base):
@@ -11,7 +12,7 @@ class RecurringTransaction(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
     type = Column(String, nullable=False)  # 'income' or 'expense'
-    amount = Column(Numeric(10, 2), nullable=False)
+    amount = Column(Money, nullable=False)  # 최소 단위 정수로 저장
     description = Column(String, nullable=True)
     
     # 반복 설정
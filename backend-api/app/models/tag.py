@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Table
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -9,6 +9,8 @@ transaction_tag_association = Table(
     Base.metadata,
     Column('transaction_id', Integer, ForeignKey('transactions.id'), primary_key=True),
     Column('tag_id', Integer, ForeignKey('tags.id'), primary_key=True),
+    # 태그 -> 거래 역방향 조회용 (기본 키는 transaction_id가 앞이라 태그로 찾을 수 없음)
+    Index('idx_transaction_tags_tag_transaction', 'tag_id', 'transaction_id'),
 )
 
 
@@ -1,19 +1,21 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, Numeric, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
+from app.models.types import Money
 
 
 class Transaction(Base):
     __tablename__ = "transactions"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False, index=True)
     type = Column(String, nullable=False)  # 'income' or 'expense'
-    amount = Column(Numeric(10, 2), nullable=False)
+    amount = Column(Money, nullable=False)  # 최소 단위 정수로 저장
     description = Column(String, nullable=True)
     transaction_date = Column(Date, nullable=False, index=True)
+    fingerprint = Column(String, nullable=True)  # 중복 확인용 (거래일, 금액, 정규화한 설명) 해시
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -23,8 +25,10 @@ class Transaction(Base):
     tags = relationship("Tag", secondary="transaction_tags", back_populates="transactions")
     attachments = relationship("TransactionAttachment", back_populates="transaction", cascade="all, delete-orphan")
 
-    # 인덱스
+    # 인덱스 (user_id 단독 인덱스는 아래 복합 인덱스들의 앞부분으로 대신함)
     __table_args__ = (
-        Index("idx_transaction_date", "transaction_date"),
         Index("idx_user_transaction_date", "user_id", "transaction_date"),
+        # 통계/예산/예측 집계용 커버링 인덱스 - 테이블 행을 읽지 않고 집계
+        Index("idx_transactions_user_type_date_cover", "user_id", "type", "transaction_date", "category_id", "amount"),
+        Index("idx_transactions_user_fingerprint", "user_id", "fingerprint"),
     )
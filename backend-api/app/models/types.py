@@ -0,0 +1,41 @@
+from decimal import Decimal, ROUND_HALF_UP
+
+from sqlalchemy import Integer
+from sqlalchemy.types import TypeDecorator
+
+# 금액 최소 단위 (1 = 0.01)
+MINOR_UNITS = 100
+_QUANTUM = Decimal("0.01")
+
+
+def to_minor(value) -> int:
+    """금액(Decimal/float/int/str)을 최소 단위 정수로 변환 (소수 셋째 자리에서 반올림)"""
+    return int((Decimal(str(value)) * MINOR_UNITS).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_minor(value) -> Decimal:
+    """최소 단위 값(정수, AVG 등은 실수)을 금액 Decimal로 변환 (소수 셋째 자리에서 반올림)"""
+    return (Decimal(str(value)) / MINOR_UNITS).quantize(_QUANTUM, rounding=ROUND_HALF_UP)
+
+
+class Money(TypeDecorator):
+    """
+    금액 컬럼 - 데이터베이스에는 최소 단위 정수로 저장하고 ORM에서는 Decimal로 다룸
+
+    SUM/비교는 SQLite 안에서 정수로 계산되고(부동소수점 오차 없음), 결과만 경계에서
+    Decimal로 바뀐다. func.sum(금액 컬럼)/func.avg(...)의 결과 타입도 Money라서 그대로
+    Decimal로 나온다. 금액끼리 곱하는 식처럼 타입이 정수로 바뀌는 경우에는 최소 단위
+    값이 나오므로 MINOR_UNITS로 직접 나눠야 한다.
+    """
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return to_minor(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return from_minor(value)
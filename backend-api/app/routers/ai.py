@@ -1,14 +1,13 @@
 """
 AI 기능 관련 API 엔드포인트
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from app.database import get_db
-from app.core.security import get_current_user
-from app.models import User
+from app.core.security import CurrentUser, get_current_user
 from app.services import ai_service
 
 router = APIRouter()
@@ -23,6 +22,7 @@ class CategoryClassificationResponse(BaseModel):
     category_id: Optional[int] = None
     category_name: Optional[str] = None
     confidence: float = 0.0
+    source: Optional[str] = None  # 'model' (학습 모델) 또는 'keyword' (키워드 규칙)
 
 
 class NaturalLanguageParseRequest(BaseModel):
@@ -38,11 +38,32 @@ class NaturalLanguageParseResponse(BaseModel):
     type: str = "expense"
 
 
+# 일괄 처리 요청당 최대 항목 수
+BATCH_MAX_ITEMS = 1000
+
+
+class BatchCategoryClassificationRequest(BaseModel):
+    descriptions: List[str] = Field(..., max_length=BATCH_MAX_ITEMS)
+    transaction_type: str = "expense"
+
+
+class BatchCategoryClassificationResponse(BaseModel):
+    results: List[CategoryClassificationResponse]
+
+
+class BatchNaturalLanguageParseRequest(BaseModel):
+    texts: List[str] = Field(..., max_length=BATCH_MAX_ITEMS)
+
+
+class BatchNaturalLanguageParseResponse(BaseModel):
+    results: List[NaturalLanguageParseResponse]
+
+
 @router.post("/classify-category", response_model=CategoryClassificationResponse)
 def classify_category(
     request: CategoryClassificationRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """거래 설명을 기반으로 카테고리 자동 분류"""
     if request.transaction_type not in ["income", "expense"]:
@@ -67,11 +88,34 @@ def classify_category(
         )
 
 
+@router.post("/classify-category/batch", response_model=BatchCategoryClassificationResponse)
+def classify_category_batch(
+    request: BatchCategoryClassificationRequest,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """여러 거래 설명을 한 번에 분류 (입력 순서대로 반환)"""
+    if request.transaction_type not in ["income", "expense"]:
+        raise HTTPException(status_code=400, detail="transaction_type은 'income' 또는 'expense'여야 합니다")
+    
+    results = ai_service.classify_categories_batch(
+        db=db,
+        descriptions=request.descriptions,
+        user_id=current_user.id,
+        transaction_type=request.transaction_type
+    )
+    
+    return BatchCategoryClassificationResponse(results=[
+        CategoryClassificationResponse(**result) if result else CategoryClassificationResponse(confidence=0.0)
+        for result in results
+    ])
+
+
 @router.post("/parse-natural-language", response_model=NaturalLanguageParseResponse)
 def parse_natural_language(
     request: NaturalLanguageParseRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """자연어 텍스트에서 거래 정보 추출"""
     result = ai_service.parse_natural_language(
@@ -87,14 +131,35 @@ def parse_natural_language(
     return NaturalLanguageParseResponse(**result)
 
 
+@router.post("/parse-natural-language/batch", response_model=BatchNaturalLanguageParseResponse)
+def parse_natural_language_batch(
+    request: BatchNaturalLanguageParseRequest,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """여러 줄의 자연어 텍스트에서 거래 정보 일괄 추출 (입력 순서대로 반환)"""
+    results = ai_service.parse_natural_language_batch(
+        texts=request.texts,
+        user_id=current_user.id,
+        db=db
+    )
+    
+    for result in results:
+        if result.get("transaction_date"):
+            result["transaction_date"] = result["transaction_date"].isoformat()
+    
+    return BatchNaturalLanguageParseResponse(results=[NaturalLanguageParseResponse(**result) for result in results])
+
+
 @router.get("/spending-patterns")
 def get_spending_patterns(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    months: int = Query(3, ge=1, le=120, description="start_date가 없을 때 분석할 개월 수"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    """지출 패턴 분석"""
+    """지출 패턴 분석 (월별/요일별/카테고리별 분포와 카테고리별 이상치)"""
     start = None
     end = None
     
@@ -114,7 +179,8 @@ def get_spending_patterns(
         db=db,
         user_id=current_user.id,
         start_date=start,
-        end_date=end
+        end_date=end,
+        months=months
     )
     
     return result
@@ -0,0 +1,47 @@
+"""
+이상 거래 조회 API 엔드포인트
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date
+from app.database import get_db
+from app.core.security import CurrentUser, get_current_user
+from app.schemas.anomaly import TransactionAnomaly
+from app.services import anomaly_service
+
+router = APIRouter()
+
+
+@router.get("", response_model=List[TransactionAnomaly])
+def get_anomalies(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    category_id: Optional[int] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """이상 거래 목록 조회 (거래 등록 시점에 카테고리 평균 대비 금액이 큰 거래)"""
+    return anomaly_service.get_anomalies(
+        db,
+        current_user.id,
+        start_date=start_date,
+        end_date=end_date,
+        category_id=category_id,
+        skip=skip,
+        limit=limit
+    )
+
+
+@router.delete("/{anomaly_id}", status_code=204)
+def delete_anomaly(
+    anomaly_id: int,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """이상 거래 확인 처리 (목록에서 제거)"""
+    if not anomaly_service.delete_anomaly(db, anomaly_id, current_user.id):
+        raise HTTPException(status_code=404, detail="이상 거래를 찾을 수 없습니다")
+    return None
@@ -1,14 +1,18 @@
 """
 인증 관련 API 엔드포인트
 """
+from typing import Optional, Tuple
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import User
 from app.schemas.user import UserCreate, UserLogin, Token, User as UserSchema
+from app.core import hashing
 from app.core.security import (
-    verify_password,
-    get_password_hash,
+    CurrentUser,
     create_access_token,
     get_current_user
 )
@@ -16,17 +20,16 @@ from app.core.security import (
 router = APIRouter()
 
 
-@router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    """회원가입"""
-    # 비밀번호 길이 검증 (bcrypt는 72바이트 제한)
-    if len(user_data.password.encode('utf-8')) > 72:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="비밀번호는 72바이트 이하여야 합니다"
-        )
-    
-    # 사용자명 중복 확인
+def _hashing_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _check_registration(db: Session, user_data: UserCreate) -> None:
+    """사용자명/이메일 중복 확인 (스레드풀에서 실행)"""
     existing_user = db.query(User).filter(User.username == user_data.username).first()
     if existing_user:
         raise HTTPException(
@@ -34,7 +37,6 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
             detail="이미 사용 중인 사용자명입니다"
         )
     
-    # 이메일 중복 확인
     if user_data.email:
         existing_email = db.query(User).filter(User.email == user_data.email).first()
         if existing_email:
@@ -43,9 +45,67 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
                 detail="이미 사용 중인 이메일입니다"
             )
     
+    # 해싱을 기다리는 동안 DB 연결을 점유하지 않도록 트랜잭션 종료
+    db.rollback()
+
+
+def _create_user(db: Session, user_data: UserCreate, hashed_password: str) -> User:
+    """사용자 저장 (스레드풀에서 실행)"""
+    new_user = User(
+        username=user_data.username,
+        email=user_data.email,
+        hashed_password=hashed_password
+    )
+    db.add(new_user)
+    try:
+        db.commit()
+    except IntegrityError:
+        # 해싱하는 동안 같은 사용자명/이메일로 먼저 가입한 경우
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="이미 사용 중인 사용자명 또는 이메일입니다"
+        )
+    db.refresh(new_user)
+    return new_user
+
+
+def _load_credentials(db: Session, username: str) -> Tuple[Optional[int], Optional[str]]:
+    """로그인할 사용자의 ID와 저장된 해시 (스레드풀에서 실행)"""
+    user = db.query(User).filter(User.username == username).first()
+    result = (user.id, user.hashed_password) if user else (None, None)
+    
+    # 해싱을 기다리는 동안 DB 연결을 점유하지 않도록 트랜잭션 종료
+    db.rollback()
+    return result
+
+
+def _save_password_hash(db: Session, user_id: int, hashed_password: str) -> None:
+    """재해싱한 비밀번호 저장 (스레드풀에서 실행)"""
+    user = db.get(User, user_id)
+    if user is not None:
+        user.hashed_password = hashed_password
+        db.commit()
+
+
+# 라우트는 해싱만 이벤트 루프에서 기다리고, DB 작업은 스레드풀에서 실행한다.
+@router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
+async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+    """회원가입"""
+    # 비밀번호 길이 검증 (bcrypt는 72바이트 제한)
+    if len(user_data.password.encode('utf-8')) > 72:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="비밀번호는 72바이트 이하여야 합니다"
+        )
+    
+    await run_in_threadpool(_check_registration, db, user_data)
+    
     # 새 사용자 생성
     try:
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await hashing.hash_password_async(user_data.password)
+    except hashing.HashingPoolBusy:
+        raise _hashing_busy_exception()
     except ValueError as e:
         # bcrypt 오류 처리
         raise HTTPException(
@@ -53,24 +113,29 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
             detail=f"비밀번호 해싱 오류: {str(e)}"
         )
     
-    new_user = User(
-        username=user_data.username,
-        email=user_data.email,
-        hashed_password=hashed_password
-    )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    
-    return new_user
+    return await run_in_threadpool(_create_user, db, user_data, hashed_password)
 
 
 @router.post("/login", response_model=Token)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: Session = Depends(get_db)):
     """로그인"""
-    user = db.query(User).filter(User.username == credentials.username).first()
+    user_id, hashed_password = await run_in_threadpool(_load_credentials, db, credentials.username)
+    
+    valid, new_hash = False, None
+    try:
+        if user_id is None:
+            # 없는 사용자도 같은 비용의 검증을 거쳐 응답 시간으로 계정 존재 여부가 드러나지 않게 함
+            await hashing.verify_dummy_async(credentials.password)
+        else:
+            valid, new_hash = await hashing.verify_and_update_async(credentials.password, hashed_password)
+    except hashing.HashingPoolBusy:
+        raise _hashing_busy_exception()
+    
+    # 해싱 비용 설정이 바뀐 경우 새 비용으로 재해싱한 값 저장
+    if valid and new_hash:
+        await run_in_threadpool(_save_password_hash, db, user_id, new_hash)
     
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="사용자명 또는 비밀번호가 올바르지 않습니다",
@@ -78,11 +143,11 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
         )
     
     # JWT 표준에 따라 sub는 문자열이어야 함
-    access_token = create_access_token(data={"sub": str(user.id)})
+    access_token = create_access_token(data={"sub": str(user_id)})
     return {"access_token": access_token, "token_type": "bearer"}
 
 
 @router.get("/me", response_model=UserSchema)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+def get_current_user_info(current_user: CurrentUser = Depends(get_current_user)):
     """현재 로그인한 사용자 정보 조회"""
     return current_user
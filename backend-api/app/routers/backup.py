@@ -5,8 +5,8 @@ from datetime import datetime
 import json
 import io
 from app.database import get_db
-from app.core.security import get_current_user
-from app.models import User, Transaction, Category, Budget, RecurringTransaction, Tag
+from app.core.security import CurrentUser, get_current_user
+from app.models import Transaction, Category, Budget, RecurringTransaction, Tag
 from app.services import transaction_service, category_service, budget_service, recurring_transaction_service, tag_service
 
 router = APIRouter()
@@ -15,7 +15,7 @@ router = APIRouter()
 @router.get("/export")
 def export_data(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """데이터 백업 (JSON 형식)"""
     try:
@@ -113,7 +113,7 @@ def export_data(
 async def import_data(
     file_content: str = Body(..., media_type="application/json"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """데이터 복원 (JSON 형식)"""
     try:
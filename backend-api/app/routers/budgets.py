@@ -1,12 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 from app.database import get_db
-from app.schemas.budget import Budget, BudgetCreate, BudgetUpdate, BudgetStatus
-from app.services import budget_service
-from app.core.security import get_current_user
-from app.models import User
+from app.schemas.budget import Budget, BudgetCreate, BudgetUpdate, BudgetStatus, BudgetMonthStatus, BudgetAlert
+from app.services import budget_service, budget_alert_service
+from app.core import events
+from app.core.security import CurrentUser, get_current_user, get_current_user_for_stream
 
 router = APIRouter()
 
@@ -16,7 +16,7 @@ def get_budgets(
     month: Optional[str] = Query(None, description="예산 월 (YYYY-MM 형식)"),
     category_id: Optional[int] = Query(None, description="카테고리 ID (None이면 전체 예산)"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """예산 목록 조회"""
     return budget_service.get_budgets(
@@ -31,23 +31,66 @@ def get_budgets(
 def create_budget(
     budget: BudgetCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    """예산 생성"""
-    # 월 형식 검증
+    """예산 생성 (월 형식은 BudgetCreate 스키마에서 검증)"""
+    return budget_service.create_budget(db, budget, current_user.id)
+
+
+@router.get("/status", response_model=List[BudgetMonthStatus])
+def get_budget_status_range(
+    start_month: Optional[str] = Query(None, description="시작 월 (YYYY-MM 형식)"),
+    end_month: Optional[str] = Query(None, description="종료 월 (YYYY-MM 형식)"),
+    year: Optional[int] = Query(None, ge=1900, le=9999, description="연도 (지정하면 해당 연도 1~12월)"),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """여러 달의 예산 대비 지출 현황 조회 (예산 추이 화면용)"""
+    if year is not None:
+        start_month, end_month = f"{year:04d}-01", f"{year:04d}-12"
+    if not start_month or not end_month:
+        raise HTTPException(status_code=400, detail="start_month와 end_month 또는 year를 지정하세요.")
+    
     try:
-        datetime.strptime(budget.month, '%Y-%m')
+        start = datetime.strptime(start_month, '%Y-%m')
+        end = datetime.strptime(end_month, '%Y-%m')
     except ValueError:
         raise HTTPException(status_code=400, detail="월 형식이 올바르지 않습니다. YYYY-MM 형식을 사용하세요.")
+    if start > end:
+        raise HTTPException(status_code=400, detail="시작 월이 종료 월보다 늦을 수 없습니다.")
+    if (end.year - start.year) * 12 + end.month - start.month >= 120:
+        raise HTTPException(status_code=400, detail="한 번에 조회할 수 있는 기간은 최대 120개월입니다.")
     
-    return budget_service.create_budget(db, budget, current_user.id)
+    return budget_service.get_budget_status_range(
+        db, current_user.id, start.strftime('%Y-%m'), end.strftime('%Y-%m')
+    )
+
+
+@router.get("/alerts", response_model=List[BudgetAlert])
+def get_budget_alerts(
+    month: Optional[str] = Query(None, description="예산 월 (YYYY-MM 형식)"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """예산 임계값 도달 알림 목록 조회"""
+    return budget_alert_service.get_alerts(db, current_user.id, month=month, limit=limit)
+
+
+@router.get("/alerts/stream")
+async def stream_budget_alerts(
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user_for_stream)
+):
+    """예산 임계값 도달 알림 실시간 수신 (Server-Sent Events, event: budget_alert)"""
+    return events.event_stream_response(request, current_user.id, {budget_alert_service.EVENT_TYPE})
 
 
 @router.get("/{budget_id}", response_model=Budget)
 def get_budget(
     budget_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """예산 상세 조회"""
     budget = budget_service.get_budget(db, budget_id, current_user.id)
@@ -61,15 +104,9 @@ def update_budget(
     budget_id: int,
     budget_update: BudgetUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    """예산 수정"""
-    if budget_update.month:
-        try:
-            datetime.strptime(budget_update.month, '%Y-%m')
-        except ValueError:
-            raise HTTPException(status_code=400, detail="월 형식이 올바르지 않습니다. YYYY-MM 형식을 사용하세요.")
-    
+    """예산 수정 (월 형식은 BudgetUpdate 스키마에서 검증)"""
     budget = budget_service.update_budget(
         db, budget_id, current_user.id, budget_update
     )
@@ -82,7 +119,7 @@ def update_budget(
 def delete_budget(
     budget_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """예산 삭제"""
     success = budget_service.delete_budget(db, budget_id, current_user.id)
@@ -95,7 +132,7 @@ def delete_budget(
 def get_budget_status(
     month: str = Path(..., description="예산 월 (YYYY-MM 형식)"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """예산 대비 지출 현황 조회"""
     # 월 형식 검증
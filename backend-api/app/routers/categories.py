@@ -5,12 +5,11 @@ from typing import List, Optional
 from urllib.parse import quote
 from datetime import datetime
 from app.database import get_db
-from app.schemas.category import Category, CategoryCreate, CategoryUpdate
+from app.schemas.category import Category, CategoryCreate, CategoryUpdate, CategoryMerge, CategoryMergeResult
 from app.services import category_service
 from app.services.excel_service import export_categories_to_excel, import_categories_from_excel
 from app.services.csv_service import export_categories_to_csv, import_categories_from_csv
-from app.core.security import get_current_user
-from app.models import User
+from app.core.security import CurrentUser, get_current_user
 
 router = APIRouter()
 
@@ -19,7 +18,7 @@ router = APIRouter()
 def get_categories(
     type: Optional[str] = Query(None, regex="^(income|expense)$"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """카테고리 목록 조회"""
     return category_service.get_categories(
@@ -33,7 +32,7 @@ def get_categories(
 def create_category(
     category: CategoryCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """카테고리 생성"""
     return category_service.create_category(db, category, current_user.id)
@@ -43,7 +42,7 @@ def create_category(
 def get_category(
     category_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """카테고리 상세 조회"""
     category = category_service.get_category(db, category_id, current_user.id)
@@ -57,7 +56,7 @@ def update_category(
     category_id: int,
     category_update: CategoryUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """카테고리 수정"""
     category = category_service.update_category(
@@ -68,11 +67,28 @@ def update_category(
     return category
 
 
+@router.post("/{category_id}/merge", response_model=CategoryMergeResult)
+def merge_categories(
+    category_id: int,
+    request: CategoryMerge,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """카테고리 병합 - source_category_ids의 거래/예산/반복 거래/템플릿을 이 카테고리로 옮기고 원본 삭제"""
+    try:
+        result = category_service.merge_categories(db, category_id, current_user.id, request.source_category_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="카테고리를 찾을 수 없습니다")
+    return result
+
+
 @router.delete("/{category_id}", status_code=204)
 def delete_category(
     category_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """카테고리 삭제"""
     success = category_service.delete_category(db, category_id, current_user.id)
@@ -85,7 +101,7 @@ def delete_category(
 def export_categories(
     type: Optional[str] = Query(None, regex="^(income|expense)$"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """카테고리를 엑셀 파일로 다운로드"""
     # 카테고리 조회
@@ -118,7 +134,7 @@ def export_categories(
 async def import_categories(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """엑셀 파일에서 카테고리를 일괄 등록"""
     # 파일 확장자 확인
@@ -147,7 +163,7 @@ async def import_categories(
 def delete_all_categories(
     type: Optional[str] = Query(None, regex="^(income|expense)$"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """카테고리 전체 삭제 (타입별 필터 적용 가능)"""
     deleted_count = category_service.delete_all_categories(
@@ -162,7 +178,7 @@ def delete_all_categories(
 def export_categories_csv(
     type: Optional[str] = Query(None, regex="^(income|expense)$"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """카테고리를 CSV 파일로 다운로드"""
     # 카테고리 조회
@@ -195,7 +211,7 @@ def export_categories_csv(
 async def import_categories_csv(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """CSV 파일에서 카테고리를 일괄 등록"""
     # 파일 확장자 확인
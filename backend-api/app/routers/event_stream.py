@@ -0,0 +1,28 @@
+"""
+실시간 이벤트 스트림 API 엔드포인트
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
+from app.core import events
+from app.core.security import CurrentUser, get_current_user_for_stream
+
+router = APIRouter()
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    types: Optional[str] = Query(None, description="받을 이벤트 유형 (쉼표로 구분, 예: change,budget_alert) - 생략하면 전체"),
+    current_user: CurrentUser = Depends(get_current_user_for_stream)
+):
+    """
+    사용자 데이터 변경 실시간 수신 (Server-Sent Events)
+
+    - `event: change` - `{"entity", "id", "op", "data_version"}` (op: create/update/delete/bulk, bulk이면 id는 null)
+      data_version은 `/api/sync/changes`의 since로 그대로 쓸 수 있다
+    - `event: budget_alert` - 예산 임계값 도달 알림
+    - `event: resync` - 이벤트를 놓쳤으니 전체를 다시 조회
+    """
+    event_types = {name.strip() for name in types.split(",") if name.strip()} if types else None
+    return events.event_stream_response(request, current_user.id, event_types)
+
@@ -0,0 +1,43 @@
+"""
+문자(카드 승인/은행 입출금 알림) 일괄 수집 API 엔드포인트
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.core.security import CurrentUser, get_current_user
+from app.schemas.ingest import SmsIngestRequest, SmsIngestResponse
+from app.services import category_service, sms_ingest_service
+
+router = APIRouter()
+
+
+@router.post("/sms", response_model=SmsIngestResponse)
+def ingest_sms(
+    request: SmsIngestRequest,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """카드 승인/입출금 문자를 파싱해 거래 내역으로 일괄 등록 (중복 문자는 건너뜀)"""
+    messages = list(request.messages or [])
+    if request.text:
+        messages.extend(sms_ingest_service.split_messages(request.text))
+    if not messages:
+        raise HTTPException(status_code=400, detail="messages 또는 text 중 하나는 필요합니다")
+
+    default_category = None
+    if request.default_category_id is not None:
+        default_category = category_service.get_category(db, request.default_category_id, current_user.id)
+        if not default_category:
+            raise HTTPException(status_code=404, detail="기본 카테고리를 찾을 수 없습니다")
+
+    try:
+        return sms_ingest_service.ingest_messages(
+            db=db,
+            user_id=current_user.id,
+            messages=messages,
+            reference_date=request.received_date,
+            default_category=default_category,
+            dry_run=request.dry_run
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
@@ -4,8 +4,7 @@ from typing import List, Optional
 from datetime import date
 
 from app.database import get_db
-from app.core.security import get_current_user
-from app.models import User
+from app.core.security import CurrentUser, get_current_user
 from app.schemas.recurring_transaction import (
     RecurringTransaction,
     RecurringTransactionCreate,
@@ -20,7 +19,7 @@ router = APIRouter()
 def get_recurring_transactions(
     is_active: bool = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """반복 거래 목록 조회"""
     return recurring_transaction_service.get_recurring_transactions(
@@ -32,7 +31,7 @@ def get_recurring_transactions(
 def get_recurring_transaction(
     recurring_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """반복 거래 상세 조회"""
     recurring = recurring_transaction_service.get_recurring_transaction(
@@ -50,7 +49,7 @@ def get_recurring_transaction(
 def create_recurring_transaction(
     recurring_data: RecurringTransactionCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """반복 거래 생성"""
     return recurring_transaction_service.create_recurring_transaction(
@@ -63,7 +62,7 @@ def update_recurring_transaction(
     recurring_id: int,
     recurring_data: RecurringTransactionUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """반복 거래 수정"""
     recurring = recurring_transaction_service.update_recurring_transaction(
@@ -81,7 +80,7 @@ def update_recurring_transaction(
 def delete_recurring_transaction(
     recurring_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """반복 거래 삭제"""
     success = recurring_transaction_service.delete_recurring_transaction(
@@ -98,7 +97,7 @@ def delete_recurring_transaction(
 def generate_transactions(
     target_date: Optional[date] = Query(None, description="거래 생성 대상 날짜 (기본값: 오늘)"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """반복 거래에서 실제 거래 생성"""
     transactions = recurring_transaction_service.generate_transactions_from_recurring(
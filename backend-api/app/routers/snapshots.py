@@ -0,0 +1,63 @@
+"""
+데이터베이스 스냅샷 관리 API 엔드포인트 (관리자 전용)
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+from typing import Optional
+from app.core.security import CurrentUser, get_current_admin_user
+from app.services import snapshot_service
+
+router = APIRouter()
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+def create_snapshot(
+    pages_per_step: Optional[int] = Query(None, ge=1, le=100000, description="한 단계에 복사할 페이지 수"),
+    current_user: CurrentUser = Depends(get_current_admin_user)
+):
+    """데이터베이스 스냅샷 생성 (온라인 백업)"""
+    try:
+        return snapshot_service.create_snapshot(pages_per_step=pages_per_step)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"스냅샷 생성 실패: {str(e)}")
+
+
+@router.get("")
+def list_snapshots(current_user: CurrentUser = Depends(get_current_admin_user)):
+    """스냅샷 목록 조회"""
+    return snapshot_service.list_snapshots()
+
+
+@router.get("/{name}/verify")
+def verify_snapshot(name: str, current_user: CurrentUser = Depends(get_current_admin_user)):
+    """스냅샷 체크섬 검증"""
+    try:
+        result = snapshot_service.verify_snapshot(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"name": name, "valid": result["ok"], "error": result["error"]}
+
+
+@router.get("/{name}/download")
+def download_snapshot(name: str, current_user: CurrentUser = Depends(get_current_admin_user)):
+    """스냅샷 파일 다운로드"""
+    try:
+        path = snapshot_service.get_snapshot_path(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not path:
+        raise HTTPException(status_code=404, detail="스냅샷을 찾을 수 없습니다")
+
+    return FileResponse(path, media_type="application/gzip", filename=name)
+
+
+@router.delete("/{name}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_snapshot(name: str, current_user: CurrentUser = Depends(get_current_admin_user)):
+    """스냅샷 삭제"""
+    try:
+        deleted = snapshot_service.delete_snapshot(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not deleted:
+        raise HTTPException(status_code=404, detail="스냅샷을 찾을 수 없습니다")
@@ -2,9 +2,9 @@ from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import date
+from decimal import Decimal
 from app.database import get_db
-from app.core.security import get_current_user
-from app.models import User
+from app.core.security import CurrentUser, get_current_user
 from app.services import statistics_service, tag_service
 from app.schemas.statistics import MonthlyStatistics, CategoryStatistics
 
@@ -16,7 +16,7 @@ def get_monthly_statistics(
     year: Optional[int] = Query(None),
     month: Optional[int] = Query(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """월별 통계 조회"""
     if year is None or month is None:
@@ -33,7 +33,7 @@ def get_category_statistics(
     month: Optional[int] = Query(None),
     type: str = Query("expense", regex="^(income|expense)$"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """카테고리별 통계 조회"""
     if year is None or month is None:
@@ -50,7 +50,7 @@ def get_tag_statistics(
     month: Optional[int] = Query(None),
     type: str = Query("expense", regex="^(income|expense)$"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """태그별 통계 조회"""
     if year is None or month is None:
@@ -89,7 +89,7 @@ def get_tag_statistics(
             )
         ).all()
         
-        total = sum(float(t.amount) for t in transactions)
+        total = sum((t.amount for t in transactions), Decimal('0'))
         count = len(transactions)
         
         if count > 0:  # 거래가 있는 태그만 반환
@@ -108,7 +108,7 @@ def get_tag_statistics(
 def predict_expense(
     months_back: int = Query(6, ge=2, le=12, description="예측에 사용할 과거 개월 수"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """다음 달 지출 예측"""
     from app.services import prediction_service
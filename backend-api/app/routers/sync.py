@@ -0,0 +1,45 @@
+"""
+오프라인 동기화 API 엔드포인트
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.database import get_db
+from app.core.security import CurrentUser, get_current_user
+from app.schemas.sync import SyncChangesResponse, SyncPushRequest, SyncPushResponse
+from app.services import sync_service
+
+router = APIRouter()
+
+
+@router.get("/changes", response_model=SyncChangesResponse)
+def get_changes(
+    since: int = Query(0, ge=0, description="마지막으로 받은 데이터 버전 (처음이면 0)"),
+    limit: int = Query(sync_service.SYNC_PAGE_SIZE, ge=1, le=5000),
+    entities: Optional[str] = Query(None, description="받을 엔티티 (쉼표로 구분, 예: transaction,category) - 생략하면 전체"),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    since 버전 이후의 변경 조회
+
+    has_more가 false가 될 때까지 next_since로 다시 요청한다. 삭제된 항목은
+    op가 delete이고 data가 null이다.
+    """
+    entity_names = [name.strip() for name in entities.split(",") if name.strip()] if entities else None
+    return sync_service.get_changes(db, current_user.id, since, limit, entity_names)
+
+
+@router.post("/push", response_model=SyncPushResponse)
+def push_changes(
+    request: SyncPushRequest,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    오프라인 변경 일괄 반영 (순서대로 적용, 한 번에 커밋)
+
+    수정/삭제에 base_version(또는 base_updated_at)을 주면 그 뒤 서버에서 바뀐 항목은
+    적용하지 않고 status=conflict와 서버 쪽 현재 데이터를 돌려준다.
+    """
+    return sync_service.push_changes(db, current_user.id, request.changes)
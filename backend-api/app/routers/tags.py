@@ -3,9 +3,8 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from app.database import get_db
-from app.core.security import get_current_user
-from app.models import User
-from app.schemas.tag import Tag, TagCreate, TagUpdate
+from app.core.security import CurrentUser, get_current_user
+from app.schemas.tag import Tag, TagCreate, TagUpdate, TagBulkAssign, TagBulkResult, TagMerge, TagMergeResult
 from app.services import tag_service
 
 router = APIRouter()
@@ -15,7 +14,7 @@ router = APIRouter()
 def get_tags(
     with_count: bool = Query(False, description="거래 수 포함 여부"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """태그 목록 조회"""
     if with_count:
@@ -24,11 +23,60 @@ def get_tags(
     return tag_service.get_tags(db, current_user.id)
 
 
+@router.post("/bulk/attach", response_model=TagBulkResult)
+def attach_tags(
+    request: TagBulkAssign,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """여러 거래에 태그 일괄 연결 (최대 10000건, 이미 있는 연결은 건너뜀)"""
+    result = tag_service.attach_tags(db, current_user.id, request.tag_ids, request.transaction_ids)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="태그를 찾을 수 없습니다."
+        )
+    return result
+
+
+@router.post("/bulk/detach", response_model=TagBulkResult)
+def detach_tags(
+    request: TagBulkAssign,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """여러 거래에서 태그 일괄 해제 (최대 10000건)"""
+    result = tag_service.detach_tags(db, current_user.id, request.tag_ids, request.transaction_ids)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="태그를 찾을 수 없습니다."
+        )
+    return result
+
+
+@router.post("/{tag_id}/merge", response_model=TagMergeResult)
+def merge_tags(
+    tag_id: int,
+    request: TagMerge,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """태그 병합 - source_tag_ids의 거래 연결을 이 태그로 옮기고 원본 태그 삭제"""
+    result = tag_service.merge_tags(db, tag_id, current_user.id, request.source_tag_ids)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="태그를 찾을 수 없습니다."
+        )
+    return result
+
+
 @router.get("/{tag_id}", response_model=Tag)
 def get_tag(
     tag_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """태그 상세 조회"""
     tag = tag_service.get_tag(db, tag_id, current_user.id)
@@ -44,7 +92,7 @@ def get_tag(
 def create_tag(
     tag_data: TagCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """태그 생성"""
     try:
@@ -61,7 +109,7 @@ def update_tag(
     tag_id: int,
     tag_data: TagUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """태그 수정"""
     try:
@@ -83,7 +131,7 @@ def update_tag(
 def delete_tag(
     tag_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """태그 삭제"""
     success = tag_service.delete_tag(db, tag_id, current_user.id)
@@ -5,8 +5,7 @@ from typing import List
 import os
 
 from app.database import get_db
-from app.core.security import get_current_user
-from app.models import User
+from app.core.security import CurrentUser, get_current_user
 from app.schemas.transaction_attachment import TransactionAttachment
 from app.services import transaction_attachment_service
 
@@ -17,7 +16,7 @@ router = APIRouter()
 def get_transaction_attachments(
     transaction_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """거래별 첨부파일 목록 조회"""
     return transaction_attachment_service.get_attachments_by_transaction(
@@ -30,7 +29,7 @@ async def upload_attachment(
     transaction_id: int,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """첨부파일 업로드"""
     try:
@@ -60,7 +59,7 @@ async def upload_attachment(
 def download_attachment(
     attachment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """첨부파일 다운로드"""
     attachment = transaction_attachment_service.get_attachment(
@@ -89,7 +88,7 @@ def download_attachment(
 def delete_attachment(
     attachment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """첨부파일 삭제"""
     success = transaction_attachment_service.delete_attachment(
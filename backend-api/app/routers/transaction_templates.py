@@ -3,8 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from app.database import get_db
-from app.core.security import get_current_user
-from app.models import User
+from app.core.security import CurrentUser, get_current_user
 from app.schemas.transaction_template import (
     TransactionTemplate,
     TransactionTemplateCreate,
@@ -18,7 +17,7 @@ router = APIRouter()
 @router.get("", response_model=List[TransactionTemplate])
 def get_templates(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """템플릿 목록 조회"""
     return transaction_template_service.get_templates(db, current_user.id)
@@ -28,7 +27,7 @@ def get_templates(
 def get_template(
     template_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """템플릿 상세 조회"""
     template = transaction_template_service.get_template(db, template_id, current_user.id)
@@ -44,7 +43,7 @@ def get_template(
 def create_template(
     template_data: TransactionTemplateCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """템플릿 생성"""
     return transaction_template_service.create_template(
@@ -57,7 +56,7 @@ def update_template(
     template_id: int,
     template_data: TransactionTemplateUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """템플릿 수정"""
     template = transaction_template_service.update_template(
@@ -75,7 +74,7 @@ def update_template(
 def delete_template(
     template_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """템플릿 삭제"""
     success = transaction_template_service.delete_template(
@@ -1,41 +1,103 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, UploadFile, File
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
 from app.database import get_db
-from app.schemas.transaction import Transaction, TransactionCreate, TransactionUpdate
-from app.services import transaction_service
+from app.schemas.transaction import (
+    Transaction, TransactionCreate, TransactionUpdate,
+    TransactionBulkCreate, TransactionBulkUpdate, TransactionBulkDelete, TransactionBulkResponse,
+)
+from app.services import anomaly_service, idempotency_service, transaction_service
 from app.services.excel_service import export_transactions_to_excel, import_transactions_from_excel
 from app.services.csv_service import export_transactions_to_csv, import_transactions_from_csv
-from app.core.security import get_current_user
-from app.models import User, Category
+from app.core.security import CurrentUser, get_current_user
+from app.models import Category
 
 router = APIRouter()
 
 
+def _anomaly_info(db: Session, transaction_id: int, user_id: int) -> Optional[dict]:
+    """거래가 이상 거래로 판정됐으면 판정 정보 반환"""
+    anomaly = anomaly_service.get_anomaly(db, transaction_id, user_id)
+    if not anomaly:
+        return None
+    return {'id': anomaly.id, 'z_score': anomaly.z_score, 'mean': anomaly.mean, 'std': anomaly.std}
+
+
+IdempotencyKeyHeader = Header(
+    None,
+    alias="Idempotency-Key",
+    max_length=255,
+    description="재시도해도 한 번만 처리되도록 요청마다 고유하게 만든 키"
+)
+
+
+def _import_response(db: Session, user_id: int, target: str, file_name: str, file_content: bytes,
+                     force: bool, message: str, import_rows) -> dict:
+    """파일 가져오기 - 같은 내용의 파일을 이미 가져왔으면(force가 아니면) 행을 처리하지 않음"""
+    content_hash = idempotency_service.file_hash(file_content)
+    if not force:
+        imported = idempotency_service.find_imported_file(db, user_id, target, content_hash)
+        if imported:
+            return {
+                "message": "이미 가져온 파일입니다 (다시 가져오려면 force=true)",
+                "success": 0,
+                "failed": 0,
+                "errors": [],
+                "already_imported": True,
+                "duplicates": 0,
+                "duplicate_rows": [],
+                "imported_at": imported.created_at,
+            }
+
+    result = import_rows()
+    if result["success"] > 0:
+        idempotency_service.record_imported_file(
+            db, user_id, target, content_hash, file_name, result["success"], result["failed"]
+        )
+    return {
+        "message": message,
+        "success": result["success"],
+        "failed": result["failed"],
+        "errors": result["errors"][:10],  # 최대 10개 오류만 반환
+        "already_imported": False,
+        "duplicates": len(result["duplicates"]),
+        "duplicate_rows": result["duplicates"][:100],  # 행 번호와 기존 거래 ID
+    }
+
+
 @router.post("", status_code=201)
 def create_transaction(
     transaction: TransactionCreate,
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    """거래 내역 생성 (태그 정보 포함)"""
-    created = transaction_service.create_transaction(db, transaction, current_user.id)
-    
-    # 태그 정보 포함하여 반환
-    return {
-        'id': created.id,
-        'user_id': created.user_id,
-        'category_id': created.category_id,
-        'type': created.type,
-        'amount': float(created.amount),
-        'description': created.description,
-        'transaction_date': created.transaction_date.isoformat(),
-        'created_at': created.created_at.isoformat(),
-        'updated_at': created.updated_at.isoformat(),
-        'tags': [{'id': tag.id, 'name': tag.name, 'color': tag.color} for tag in created.tags] if created.tags else []
-    }
+    """거래 내역 생성 (태그 정보 포함) - Idempotency-Key가 같은 재시도는 처음 응답을 반환"""
+    def create():
+        created = transaction_service.create_transaction(db, transaction, current_user.id)
+
+        # 태그 정보 포함하여 반환
+        return {
+            'id': created.id,
+            'user_id': created.user_id,
+            'category_id': created.category_id,
+            'type': created.type,
+            'amount': created.amount,
+            'description': created.description,
+            'transaction_date': created.transaction_date.isoformat(),
+            'created_at': created.created_at.isoformat(),
+            'updated_at': created.updated_at.isoformat(),
+            'tags': [{'id': tag.id, 'name': tag.name, 'color': tag.color} for tag in created.tags] if created.tags else [],
+            'anomaly': _anomaly_info(db, created.id, current_user.id)
+        }
+
+    return idempotency_service.run(
+        db, current_user.id, idempotency_key,
+        idempotency_service.request_hash("POST /api/transactions", transaction.model_dump_json()),
+        create, status_code=201
+    )
 
 
 @router.get("")
@@ -49,8 +111,11 @@ def get_transactions(
     search: Optional[str] = Query(None, description="검색어 (설명 또는 카테고리명)"),
     min_amount: Optional[float] = Query(None, ge=0, description="최소 금액"),
     max_amount: Optional[float] = Query(None, ge=0, description="최대 금액"),
+    tags_any: Optional[List[int]] = Query(None, description="태그 ID 중 하나라도 붙은 거래"),
+    tags_all: Optional[List[int]] = Query(None, description="태그 ID가 모두 붙은 거래"),
+    tags_none: Optional[List[int]] = Query(None, description="태그 ID가 하나도 붙지 않은 거래"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """거래 내역 목록 조회 (검색 및 필터링 지원, 태그 정보 포함)"""
     transactions = transaction_service.get_transactions(
@@ -64,7 +129,10 @@ def get_transactions(
         transaction_type=type,
         search=search,
         min_amount=min_amount,
-        max_amount=max_amount
+        max_amount=max_amount,
+        tags_any=tags_any,
+        tags_all=tags_all,
+        tags_none=tags_none
     )
     
     # 태그 정보 포함하여 반환
@@ -75,7 +143,7 @@ def get_transactions(
             'user_id': transaction.user_id,
             'category_id': transaction.category_id,
             'type': transaction.type,
-            'amount': float(transaction.amount),
+            'amount': transaction.amount,
             'description': transaction.description,
             'transaction_date': transaction.transaction_date.isoformat(),
             'created_at': transaction.created_at.isoformat(),
@@ -86,11 +154,46 @@ def get_transactions(
     return result
 
 
+@router.post("/bulk", response_model=TransactionBulkResponse)
+def bulk_create_transactions(
+    request: TransactionBulkCreate,
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """거래 내역 일괄 생성 (최대 1000건, 한 번에 커밋) - 항목별 결과 반환"""
+    return idempotency_service.run(
+        db, current_user.id, idempotency_key,
+        idempotency_service.request_hash("POST /api/transactions/bulk", request.model_dump_json()),
+        lambda: transaction_service.bulk_create_transactions(db, request.items, current_user.id)
+    )
+
+
+@router.patch("/bulk", response_model=TransactionBulkResponse)
+def bulk_update_transactions(
+    request: TransactionBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """거래 내역 일괄 수정 (항목마다 id와 바꿀 필드만 전달) - 항목별 결과 반환"""
+    return transaction_service.bulk_update_transactions(db, request.items, current_user.id)
+
+
+@router.post("/bulk/delete", response_model=TransactionBulkResponse)
+def bulk_delete_transactions(
+    request: TransactionBulkDelete,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """선택한 거래 내역 일괄 삭제 - 항목별 결과 반환"""
+    return transaction_service.bulk_delete_transactions(db, request.ids, current_user.id)
+
+
 @router.get("/{transaction_id}")
 def get_transaction(
     transaction_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """거래 내역 상세 조회 (태그 정보 포함)"""
     transaction = transaction_service.get_transaction(db, transaction_id, current_user.id)
@@ -103,7 +206,7 @@ def get_transaction(
         'user_id': transaction.user_id,
         'category_id': transaction.category_id,
         'type': transaction.type,
-        'amount': float(transaction.amount),
+        'amount': transaction.amount,
         'description': transaction.description,
         'transaction_date': transaction.transaction_date.isoformat(),
         'created_at': transaction.created_at.isoformat(),
@@ -117,7 +220,7 @@ def update_transaction(
     transaction_id: int,
     transaction_update: TransactionUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """거래 내역 수정 (태그 정보 포함)"""
     transaction = transaction_service.update_transaction(
@@ -132,12 +235,13 @@ def update_transaction(
         'user_id': transaction.user_id,
         'category_id': transaction.category_id,
         'type': transaction.type,
-        'amount': float(transaction.amount),
+        'amount': transaction.amount,
         'description': transaction.description,
         'transaction_date': transaction.transaction_date.isoformat(),
         'created_at': transaction.created_at.isoformat(),
         'updated_at': transaction.updated_at.isoformat(),
-        'tags': [{'id': tag.id, 'name': tag.name, 'color': tag.color} for tag in transaction.tags] if transaction.tags else []
+        'tags': [{'id': tag.id, 'name': tag.name, 'color': tag.color} for tag in transaction.tags] if transaction.tags else [],
+        'anomaly': _anomaly_info(db, transaction.id, current_user.id)
     }
 
 
@@ -145,7 +249,7 @@ def update_transaction(
 def delete_transaction(
     transaction_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """거래 내역 삭제"""
     success = transaction_service.delete_transaction(db, transaction_id, current_user.id)
@@ -161,7 +265,7 @@ def export_transactions(
     category_id: Optional[int] = Query(None),
     type: Optional[str] = Query(None, regex="^(income|expense)$"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """거래 내역을 엑셀 파일로 다운로드"""
     # 거래 내역 조회
@@ -208,10 +312,13 @@ def export_transactions(
 @router.post("/import/excel")
 async def import_transactions(
     file: UploadFile = File(...),
+    force: bool = Query(False, description="이미 가져온 파일이어도 다시 가져오기"),
+    duplicates: str = Query("skip", regex="^(skip|flag|allow)$", description="이미 등록된 거래와 같은 행: skip(건너뜀), flag(등록 후 보고), allow(확인 안 함)"),
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    """엑셀 파일에서 거래 내역을 일괄 등록"""
+    """엑셀 파일에서 거래 내역을 일괄 등록 (같은 파일을 다시 올리면 건너뜀)"""
     # 파일 확장자 확인
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="엑셀 파일(.xlsx, .xls)만 업로드 가능합니다")
@@ -219,24 +326,28 @@ async def import_transactions(
     # 파일 읽기
     file_content = await file.read()
     
-    # 카테고리 정보 조회 (카테고리명으로 매핑)
-    categories = db.query(Category).filter(Category.user_id == current_user.id).all()
-    categories_dict = {c.name: c for c in categories}
-    
-    # 엑셀 파일 파싱 및 저장
-    result = import_transactions_from_excel(
-        db=db,
-        file_content=file_content,
-        user_id=current_user.id,
-        categories=categories_dict
+    def import_rows():
+        # 카테고리 정보 조회 (카테고리명으로 매핑)
+        categories = db.query(Category).filter(Category.user_id == current_user.id).all()
+        categories_dict = {c.name: c for c in categories}
+
+        # 엑셀 파일 파싱 및 저장
+        return import_transactions_from_excel(
+            db=db,
+            file_content=file_content,
+            user_id=current_user.id,
+            categories=categories_dict,
+            duplicate_mode=duplicates
+        )
+
+    return idempotency_service.run(
+        db, current_user.id, idempotency_key,
+        idempotency_service.request_hash("POST /api/transactions/import/excel", force, duplicates, file_content),
+        lambda: _import_response(
+            db, current_user.id, "transactions_excel", file.filename, file_content, force,
+            "엑셀 파일 업로드가 완료되었습니다", import_rows
+        )
     )
-    
-    return {
-        "message": "엑셀 파일 업로드가 완료되었습니다",
-        "success": result["success"],
-        "failed": result["failed"],
-        "errors": result["errors"][:10]  # 최대 10개 오류만 반환
-    }
 
 
 @router.delete("", status_code=200)
@@ -246,7 +357,7 @@ def delete_all_transactions(
     category_id: Optional[int] = Query(None),
     type: Optional[str] = Query(None, regex="^(income|expense)$"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """거래 내역 전체 삭제 (필터 조건 적용 가능)"""
     deleted_count = transaction_service.delete_all_transactions(
@@ -267,7 +378,7 @@ def export_transactions_csv(
     category_id: Optional[int] = Query(None),
     type: Optional[str] = Query(None, regex="^(income|expense)$"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """거래 내역을 CSV 파일로 다운로드"""
     # 거래 내역 조회
@@ -314,10 +425,13 @@ def export_transactions_csv(
 @router.post("/import/csv")
 async def import_transactions_csv(
     file: UploadFile = File(...),
+    force: bool = Query(False, description="이미 가져온 파일이어도 다시 가져오기"),
+    duplicates: str = Query("skip", regex="^(skip|flag|allow)$", description="이미 등록된 거래와 같은 행: skip(건너뜀), flag(등록 후 보고), allow(확인 안 함)"),
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    """CSV 파일에서 거래 내역을 일괄 등록"""
+    """CSV 파일에서 거래 내역을 일괄 등록 (같은 파일을 다시 올리면 건너뜀)"""
     # 파일 확장자 확인
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="CSV 파일(.csv)만 업로드 가능합니다")
@@ -325,21 +439,25 @@ async def import_transactions_csv(
     # 파일 읽기
     file_content = await file.read()
     
-    # 카테고리 정보 조회
-    categories = db.query(Category).filter(Category.user_id == current_user.id).all()
-    categories_dict = {c.name: c for c in categories}
-    
-    # CSV 파일 파싱 및 저장
-    result = import_transactions_from_csv(
-        db=db,
-        file_content=file_content,
-        user_id=current_user.id,
-        categories=categories_dict
+    def import_rows():
+        # 카테고리 정보 조회
+        categories = db.query(Category).filter(Category.user_id == current_user.id).all()
+        categories_dict = {c.name: c for c in categories}
+
+        # CSV 파일 파싱 및 저장
+        return import_transactions_from_csv(
+            db=db,
+            file_content=file_content,
+            user_id=current_user.id,
+            categories=categories_dict,
+            duplicate_mode=duplicates
+        )
+
+    return idempotency_service.run(
+        db, current_user.id, idempotency_key,
+        idempotency_service.request_hash("POST /api/transactions/import/csv", force, duplicates, file_content),
+        lambda: _import_response(
+            db, current_user.id, "transactions_csv", file.filename, file_content, force,
+            "CSV 파일 업로드가 완료되었습니다", import_rows
+        )
     )
-    
-    return {
-        "message": "CSV 파일 업로드가 완료되었습니다",
-        "success": result["success"],
-        "failed": result["failed"],
-        "errors": result["errors"][:10]
-    }
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+
+
+class TransactionAnomaly(BaseModel):
+    id: int
+    transaction_id: int
+    category_id: int
+    transaction_date: date
+    amount: float
+    z_score: float  # (금액 - 카테고리 평균) / 표준편차
+    mean: float  # 판정 시점의 카테고리 평균
+    std: float  # 판정 시점의 카테고리 표준편차
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
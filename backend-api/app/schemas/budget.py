@@ -1,7 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
+
+
+# 예산 월 형식 (YYYY-MM) - 라우터와 동기화 올리기가 같은 스키마로 검증
+MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
 
 
 class BudgetBase(BaseModel):
@@ -11,13 +15,13 @@ class BudgetBase(BaseModel):
 
 
 class BudgetCreate(BudgetBase):
-    pass
+    month: str = Field(..., pattern=MONTH_PATTERN)
 
 
 class BudgetUpdate(BaseModel):
     category_id: Optional[int] = None
     amount: Optional[Decimal] = None
-    month: Optional[str] = None
+    month: Optional[str] = Field(None, pattern=MONTH_PATTERN)
 
 
 class Budget(BudgetBase):
@@ -41,3 +45,26 @@ class BudgetStatus(BaseModel):
     category_id: Optional[int] = None
     category_name: Optional[str] = None
     month: str
+
+
+class BudgetMonthStatus(BaseModel):
+    """월별 예산 대비 지출 현황 (여러 달 조회용)"""
+    month: str
+    spent_amount: Decimal  # 월 전체 지출
+    budgets: List[BudgetStatus] = []
+
+
+class BudgetAlert(BaseModel):
+    """예산 임계값 도달 알림"""
+    id: int
+    budget_id: int
+    category_id: Optional[int] = None
+    month: str
+    threshold: int  # 예산 대비 %
+    budget_amount: float
+    spent_amount: float
+    percentage: float
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
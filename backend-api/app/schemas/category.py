@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class CategoryBase(BaseModel):
@@ -29,3 +29,17 @@ class Category(CategoryBase):
 
     class Config:
         from_attributes = True
+
+
+class CategoryMerge(BaseModel):
+    source_category_ids: List[int] = Field(..., min_length=1, max_length=100)  # 대상 카테고리로 합친 뒤 삭제할 카테고리
+
+
+class CategoryMergeResult(BaseModel):
+    category_id: int
+    transactions: int  # 옮긴 거래 수
+    recurring_transactions: int
+    transaction_templates: int
+    budgets_merged: int  # 대상 카테고리의 같은 달 예산에 금액을 더한 예산 수
+    budgets_moved: int  # 대상 카테고리에 그 달 예산이 없어 새로 만든 예산 수
+    deleted_categories: int
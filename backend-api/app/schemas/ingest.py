@@ -0,0 +1,39 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import date
+
+
+class SmsIngestRequest(BaseModel):
+    messages: Optional[List[str]] = Field(None, max_length=20000)  # 문자 목록
+    text: Optional[str] = None  # 여러 문자를 빈 줄로 구분해 붙여 넣은 텍스트
+    received_date: Optional[date] = None  # 연도 추정 기준일 (기본: 오늘)
+    default_category_id: Optional[int] = None  # 분류 실패 시 사용할 카테고리
+    dry_run: bool = False  # True이면 저장하지 않고 파싱 결과만 반환
+
+
+class ParsedSms(BaseModel):
+    index: int
+    issuer: str
+    type: str
+    amount: float
+    transaction_date: date
+    merchant: str
+    category_id: Optional[int] = None
+    category_name: Optional[str] = None
+    status: str  # 'inserted', 'duplicate', 'cancelled', 'parsed'(dry_run)
+    transaction_id: Optional[int] = None
+    anomaly: bool = False  # 카테고리 평균 대비 금액이 커 이상 거래로 기록됨
+
+
+class SmsIngestResponse(BaseModel):
+    received: int
+    parsed: int
+    inserted: int
+    duplicates: int
+    anomalies: int = 0
+    cancelled: int
+    unparsed: int
+    unparsed_samples: List[str] = []
+    elapsed_ms: float
+    messages_per_sec: float
+    items: List[ParsedSms] = []
@@ -1,11 +1,15 @@
-from pydantic import BaseModel
-from typing import Optional
+from decimal import Decimal
+from pydantic import BaseModel, PlainSerializer
+from typing import Annotated, Optional
+
+# 집계 금액 - 계산은 Decimal로 하고 JSON에는 기존 응답처럼 숫자로 내보냄
+Amount = Annotated[Decimal, PlainSerializer(float, return_type=float, when_used="json")]
 
 
 class MonthlyStatistics(BaseModel):
-    income: float
-    expense: float
-    balance: float
+    income: Amount
+    expense: Amount
+    balance: Amount
     income_count: int
     expense_count: int
 
@@ -14,5 +18,5 @@ class CategoryStatistics(BaseModel):
     category_id: int
     category_name: str
     category_color: Optional[str] = None
-    total: float
+    total: Amount
     count: int
@@ -0,0 +1,47 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+
+
+class SyncChange(BaseModel):
+    version: int  # 데이터 버전 (다음 조회의 since로 사용)
+    entity: str
+    id: int
+    op: str  # create / update / delete (delete면 data는 null)
+    data: Optional[Dict[str, Any]] = None
+
+
+class SyncChangesResponse(BaseModel):
+    changes: List[SyncChange]
+    next_since: int
+    has_more: bool
+    reset: bool = False  # True면 로컬 데이터를 비우고 changes부터 다시 적용
+
+
+class SyncPushItem(BaseModel):
+    entity: Literal["transaction", "category", "tag", "budget"]
+    op: Literal["create", "update", "delete"]
+    id: Optional[int] = None  # 수정/삭제 대상
+    client_id: Optional[str] = None  # 클라이언트 임시 ID (결과에 그대로 돌려줌)
+    base_version: Optional[int] = None  # 클라이언트가 마지막으로 본 데이터 버전
+    base_updated_at: Optional[datetime] = None  # base_version이 없을 때 비교할 updated_at
+    data: Dict[str, Any] = {}
+
+
+class SyncPushRequest(BaseModel):
+    changes: List[SyncPushItem] = Field(..., max_length=500)
+
+
+class SyncPushResult(BaseModel):
+    index: int
+    client_id: Optional[str] = None
+    status: str  # applied / conflict / not_found / invalid
+    id: Optional[int] = None
+    version: Optional[int] = None
+    error: Optional[str] = None
+    server: Optional[Dict[str, Any]] = None  # 충돌 시 서버 쪽 현재 데이터
+
+
+class SyncPushResponse(BaseModel):
+    results: List[SyncPushResult]
+    version: int
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 
 
@@ -28,3 +28,28 @@ class Tag(TagBase):
 
 class TagWithCount(Tag):
     transaction_count: int = 0
+
+
+# 일괄 연결/해제 한 번에 처리할 수 있는 최대 거래 수
+TAG_BULK_MAX_TRANSACTIONS = 10000
+
+
+class TagBulkAssign(BaseModel):
+    tag_ids: List[int] = Field(..., min_length=1, max_length=100)
+    transaction_ids: List[int] = Field(..., min_length=1, max_length=TAG_BULK_MAX_TRANSACTIONS)
+
+
+class TagBulkResult(BaseModel):
+    links: int  # 추가/삭제된 (거래, 태그) 연결 수
+    transactions: int  # 태그가 바뀐 거래 수
+
+
+class TagMerge(BaseModel):
+    source_tag_ids: List[int] = Field(..., min_length=1, max_length=100)  # 대상 태그로 합친 뒤 삭제할 태그
+
+
+class TagMergeResult(BaseModel):
+    tag_id: int
+    moved: int  # 대상 태그로 옮긴 연결 수
+    deduplicated: int  # 이미 대상 태그가 있어 지운 연결 수
+    deleted_tags: int
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime, date
 from decimal import Decimal
 from typing import Optional, List
@@ -26,6 +26,39 @@ class TransactionUpdate(BaseModel):
     tag_ids: Optional[List[int]] = None
 
 
+# 일괄 처리 한 번에 받을 최대 건수
+BULK_MAX_ITEMS = 1000
+
+
+class TransactionBulkCreate(BaseModel):
+    items: List[TransactionCreate] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class TransactionBulkUpdateItem(TransactionUpdate):
+    id: int
+
+
+class TransactionBulkUpdate(BaseModel):
+    items: List[TransactionBulkUpdateItem] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class TransactionBulkDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class TransactionBulkResult(BaseModel):
+    index: int  # 요청 내 순서
+    id: Optional[int] = None
+    status: str  # created / updated / deleted / not_found / invalid
+    error: Optional[str] = None
+
+
+class TransactionBulkResponse(BaseModel):
+    results: List[TransactionBulkResult]
+    succeeded: int
+    failed: int
+
+
 class Transaction(TransactionBase):
     id: int
     user_id: int
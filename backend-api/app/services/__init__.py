@@ -10,6 +10,17 @@ from . import tag_service
 from . import transaction_template_service
 from . import transaction_attachment_service
 from . import statistics_service
+from . import snapshot_service
+from . import category_classifier
+from . import learned_classifier
+from . import sms_ingest_service
+from . import anomaly_service
+from . import budget_alert_service
+from . import change_service
+from . import sync_service
+from . import idempotency_service
+from . import duplicate_service
+from . import deletion_service
 
 __all__ = [
     'transaction_service',
@@ -23,4 +34,15 @@ __all__ = [
     'transaction_template_service',
     'transaction_attachment_service',
     'statistics_service',
+    'snapshot_service',
+    'category_classifier',
+    'learned_classifier',
+    'sms_ingest_service',
+    'anomaly_service',
+    'budget_alert_service',
+    'change_service',
+    'sync_service',
+    'idempotency_service',
+    'duplicate_service',
+    'deletion_service',
 ]
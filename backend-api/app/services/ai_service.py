@@ -4,11 +4,67 @@ AI 서비스 - 자동 카테고리 분류 및 자연어 처리
 import os
 import re
 from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
-from decimal import Decimal
+from datetime import date, datetime, timedelta
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import Integer
-from app.models import Category, Transaction
+from sqlalchemy import Integer, String, select, type_coerce
+from app.models import Transaction
+from app.models.types import MINOR_UNITS
+from app.services import category_classifier, learned_classifier
+
+# 날짜/금액 패턴은 모듈 로드 시 한 번만 컴파일
+_RELATIVE_DATE_PATTERNS = [
+    (re.compile(r"오늘"), lambda m, today: today),
+    (re.compile(r"어제"), lambda m, today: today - timedelta(days=1)),
+    (re.compile(r"그저께|그제"), lambda m, today: today - timedelta(days=2)),
+    (re.compile(r"(\d+)일\s*전"), lambda m, today: today - timedelta(days=int(m.group(1)))),
+    (re.compile(r"(\d+)일\s*후"), lambda m, today: today + timedelta(days=int(m.group(1)))),
+]
+
+_ABSOLUTE_DATE_PATTERNS = [
+    re.compile(r"(\d{4})[-/](\d{1,2})[-/](\d{1,2})"),
+    re.compile(r"(\d{1,2})[-/](\d{1,2})"),
+]
+
+_AMOUNT_PATTERNS = [
+    (re.compile(r"(\d+(?:,\d{3})*)\s*원"), lambda m: int(m.group(1).replace(",", ""))),
+    (re.compile(r"(\d+(?:,\d{3})*)\s*만\s*원"), lambda m: int(m.group(1).replace(",", "")) * 10000),
+    (re.compile(r"(\d+(?:,\d{3})*)\s*천\s*원"), lambda m: int(m.group(1).replace(",", "")) * 1000),
+    (re.compile(r"만\s*(\d+)\s*원"), lambda m: int(m.group(1)) * 10000),
+    (re.compile(r"(\d+)\s*만"), lambda m: int(m.group(1)) * 10000),
+    (re.compile(r"(\d+)\s*천"), lambda m: int(m.group(1)) * 1000),
+    (re.compile(r"(\d+(?:\.\d+)?)\s*만"), lambda m: int(float(m.group(1)) * 10000)),
+]
+
+_INCOME_KEYWORDS = ["수입", "급여", "용돈", "보너스", "환급", "환불"]
+
+# 지출 이상치 기준: 카테고리별 수정 Z 점수, 최소 거래 수, 반환 개수
+SPENDING_OUTLIER_Z = float(os.getenv("SPENDING_OUTLIER_Z", "3.5"))
+SPENDING_OUTLIER_MIN_SAMPLES = int(os.getenv("SPENDING_OUTLIER_MIN_SAMPLES", "5"))
+SPENDING_OUTLIER_LIMIT = 10
+
+
+def _classify(
+    db: Session,
+    user_id: int,
+    classifier: "category_classifier.CategoryClassifier",
+    description: str,
+    transaction_type: str
+) -> Optional[Dict[str, Any]]:
+    """학습 모델로 먼저 분류하고, 확신이 없으면 키워드 분류로 대체"""
+    candidates = classifier.categories(transaction_type)
+    if not candidates:
+        return None
+    
+    result = learned_classifier.classify(db, user_id, description, candidates)
+    if result:
+        result["source"] = "model"
+        return result
+    
+    result = classifier.classify(description, transaction_type)
+    if result:
+        result["source"] = "keyword"
+    return result
 
 
 def classify_category_by_description(
@@ -32,61 +88,26 @@ def classify_category_by_description(
     if not description:
         return None
     
-    description_lower = description.lower()
-    
-    # 사용자의 기존 카테고리 목록 가져오기
-    categories = db.query(Category).filter(
-        Category.user_id == user_id,
-        Category.type == transaction_type
-    ).all()
-    
-    if not categories:
-        return None
-    
-    # 키워드 기반 매칭 (간단한 규칙 기반 분류)
-    # 실제로는 OpenAI API나 더 정교한 ML 모델을 사용할 수 있음
-    category_keywords = {
-        "식비": ["식당", "음식", "카페", "커피", "점심", "저녁", "배달", "치킨", "피자", "햄버거", "라면", "김밥"],
-        "교통비": ["지하철", "버스", "택시", "기차", "비행기", "주차", "주유", "휘발유", "주차장", "교통카드"],
-        "쇼핑": ["마트", "편의점", "온라인", "쇼핑", "구매", "아마존", "쿠팡", "옷", "신발", "가전"],
-        "의료비": ["병원", "약국", "의료", "치과", "검진", "약", "진료"],
-        "교육비": ["학원", "교육", "책", "강의", "수강", "학습"],
-        "통신비": ["통신", "전화", "인터넷", "핸드폰", "요금", "통신사"],
-        "공과금": ["전기", "가스", "수도", "관리비", "공과금", "요금"],
-        "기타 지출": []
-    }
-    
-    # 설명에서 키워드 매칭
-    best_match = None
-    best_score = 0
-    
-    for category in categories:
-        category_name = category.name
-        keywords = category_keywords.get(category_name, [])
-        
-        # 키워드 매칭 점수 계산
-        score = 0
-        for keyword in keywords:
-            if keyword in description_lower:
-                score += 1
-        
-        # 카테고리 이름이 설명에 포함되어 있는지 확인
-        if category_name.lower() in description_lower:
-            score += 2
-        
-        if score > best_score:
-            best_score = score
-            best_match = category
-    
-    # 최소 점수 이상일 때만 추천
-    if best_match and best_score > 0:
-        return {
-            "category_id": best_match.id,
-            "category_name": best_match.name,
-            "confidence": min(best_score / 5.0, 1.0)  # 0.0 ~ 1.0
-        }
+    classifier = category_classifier.get_classifier(db, user_id)
+    return _classify(db, user_id, classifier, description, transaction_type)
+
+
+def classify_categories_batch(
+    db: Session,
+    descriptions: List[str],
+    user_id: int,
+    transaction_type: str = "expense"
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    여러 거래 설명을 한 번에 분류 (입력 순서대로 반환, 분류 실패 항목은 None)
     
-    return None
+    카테고리/분류기는 한 번만 조회하므로 항목당 비용은 분류 자체의 비용뿐이다.
+    """
+    classifier = category_classifier.get_classifier(db, user_id)
+    return [
+        _classify(db, user_id, classifier, description, transaction_type) if description else None
+        for description in descriptions
+    ]
 
 
 def parse_natural_language(
@@ -107,6 +128,33 @@ def parse_natural_language(
     Returns:
         추출된 거래 정보
     """
+    classifier = category_classifier.get_classifier(db, user_id)
+    return _parse_text(db, user_id, classifier, text, datetime.now().date())
+
+
+def parse_natural_language_batch(
+    texts: List[str],
+    user_id: int,
+    db: Session
+) -> List[Dict[str, Any]]:
+    """
+    여러 줄의 자연어 텍스트를 한 번에 파싱 (입력 순서대로 반환)
+    
+    분류기와 학습 모델은 한 번만 조회하고, 정규식은 모듈 로드 시 컴파일된 것을 사용한다.
+    """
+    classifier = category_classifier.get_classifier(db, user_id)
+    today = datetime.now().date()
+    return [_parse_text(db, user_id, classifier, text, today) for text in texts]
+
+
+def _parse_text(
+    db: Session,
+    user_id: int,
+    classifier: "category_classifier.CategoryClassifier",
+    text: str,
+    today: date
+) -> Dict[str, Any]:
+    """자연어 텍스트 한 건 파싱"""
     result = {
         "transaction_date": None,
         "amount": None,
@@ -116,35 +164,17 @@ def parse_natural_language(
         "type": "expense"
     }
     
-    # 날짜 추출
-    today = datetime.now().date()
-    
     # 상대적 날짜 패턴
-    date_patterns = [
-        (r"오늘", today),
-        (r"어제", today - timedelta(days=1)),
-        (r"그저께|그제", today - timedelta(days=2)),
-        (r"(\d+)일\s*전", lambda m: today - timedelta(days=int(m.group(1)))),
-        (r"(\d+)일\s*후", lambda m: today + timedelta(days=int(m.group(1)))),
-    ]
-    
-    for pattern, value in date_patterns:
-        match = re.search(pattern, text)
+    for pattern, resolve in _RELATIVE_DATE_PATTERNS:
+        match = pattern.search(text)
         if match:
-            if callable(value):
-                result["transaction_date"] = value(match)
-            else:
-                result["transaction_date"] = value
+            result["transaction_date"] = resolve(match, today)
             break
     
     # 절대 날짜 패턴 (YYYY-MM-DD, YYYY/MM/DD, MM/DD 등)
     if not result["transaction_date"]:
-        date_patterns_abs = [
-            r"(\d{4})[-/](\d{1,2})[-/](\d{1,2})",
-            r"(\d{1,2})[-/](\d{1,2})",
-        ]
-        for pattern in date_patterns_abs:
-            match = re.search(pattern, text)
+        for pattern in _ABSOLUTE_DATE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 try:
                     if len(match.groups()) == 3:
@@ -163,18 +193,8 @@ def parse_natural_language(
         result["transaction_date"] = today
     
     # 금액 추출
-    amount_patterns = [
-        (r"(\d+(?:,\d{3})*)\s*원", lambda m: int(m.group(1).replace(",", ""))),
-        (r"(\d+(?:,\d{3})*)\s*만\s*원", lambda m: int(m.group(1).replace(",", "")) * 10000),
-        (r"(\d+(?:,\d{3})*)\s*천\s*원", lambda m: int(m.group(1).replace(",", "")) * 1000),
-        (r"만\s*(\d+)\s*원", lambda m: int(m.group(1)) * 10000),
-        (r"(\d+)\s*만", lambda m: int(m.group(1)) * 10000),
-        (r"(\d+)\s*천", lambda m: int(m.group(1)) * 1000),
-        (r"(\d+(?:\.\d+)?)\s*만", lambda m: int(float(m.group(1)) * 10000)),
-    ]
-    
-    for pattern, converter in amount_patterns:
-        match = re.search(pattern, text)
+    for pattern, converter in _AMOUNT_PATTERNS:
+        match = pattern.search(text)
         if match:
             try:
                 result["amount"] = converter(match)
@@ -182,24 +202,19 @@ def parse_natural_language(
             except (ValueError, AttributeError):
                 continue
     
-    # 카테고리 추출
-    categories = db.query(Category).filter(Category.user_id == user_id).all()
-    category_match = classify_category_by_description(db, text, user_id, "expense")
+    # 수입/지출 판단 후 해당 유형의 카테고리로 분류 (분류기는 사용자별로 캐시됨)
+    if any(keyword in text for keyword in _INCOME_KEYWORDS):
+        result["type"] = "income"
+    
+    category_match = _classify(db, user_id, classifier, text, "expense")
+    if result["type"] == "income":
+        # 수입 카테고리로 다시 검색 (없으면 지출 분류 결과 유지)
+        category_match = _classify(db, user_id, classifier, text, "income") or category_match
     
     if category_match:
         result["category_id"] = category_match["category_id"]
         result["category_name"] = category_match["category_name"]
     
-    # 수입/지출 판단
-    income_keywords = ["수입", "급여", "용돈", "보너스", "환급", "환불"]
-    if any(keyword in text for keyword in income_keywords):
-        result["type"] = "income"
-        # 수입 카테고리로 다시 검색
-        category_match = classify_category_by_description(db, text, user_id, "income")
-        if category_match:
-            result["category_id"] = category_match["category_id"]
-            result["category_name"] = category_match["category_name"]
-    
     return result
 
 
@@ -207,112 +222,142 @@ def analyze_spending_patterns(
     db: Session,
     user_id: int,
     start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None,
+    months: int = 3
 ) -> Dict[str, Any]:
     """
     지출 패턴 분석
     
+    기간 내 지출을 한 번의 범위 조회로 (날짜, 금액, 카테고리) 배열로 읽은 뒤
+    월별/요일별/카테고리별 분포와 이상치를 NumPy 벡터 연산으로 계산한다.
+    이상치는 카테고리별 중앙값과 MAD(중앙값 절대 편차)로 구한 수정 Z 점수가
+    SPENDING_OUTLIER_Z 이상인 거래다.
+    
     Args:
         db: 데이터베이스 세션
         user_id: 사용자 ID
-        start_date: 시작 날짜
-        end_date: 종료 날짜
+        start_date: 시작 날짜 (기본: 종료일로부터 months개월 전)
+        end_date: 종료 날짜 (기본: 오늘)
+        months: 시작 날짜를 지정하지 않았을 때 분석할 개월 수
     
     Returns:
         패턴 분석 결과
     """
-    from sqlalchemy import func, extract
-    
-    if not start_date:
-        start_date = datetime.now() - timedelta(days=90)  # 최근 3개월
     if not end_date:
         end_date = datetime.now()
-    
-    # 월별 지출 패턴
-    monthly_expenses = db.query(
-        extract('year', Transaction.transaction_date).label('year'),
-        extract('month', Transaction.transaction_date).label('month'),
-        func.sum(Transaction.amount).label('total')
-    ).filter(
-        Transaction.user_id == user_id,
-        Transaction.type == 'expense',
-        Transaction.transaction_date >= start_date.date(),
-        Transaction.transaction_date <= end_date.date()
-    ).group_by(
-        extract('year', Transaction.transaction_date),
-        extract('month', Transaction.transaction_date)
-    ).all()
-    
-    # 요일별 지출 패턴 (SQLite용 - strftime 사용)
-    # SQLite의 strftime('%w', date)는 0=일요일, 6=토요일
-    # 우리는 0=월요일로 변환: CASE 문 사용
-    from sqlalchemy import case, Integer
-    
-    weekday_expenses = db.query(
-        case(
-            (func.cast(func.strftime('%w', Transaction.transaction_date), Integer) == 0, 6),  # 일요일 -> 6
-            else_=(func.cast(func.strftime('%w', Transaction.transaction_date), Integer) - 1)  # 월~토 -> 0~5
-        ).label('weekday'),
-        func.avg(Transaction.amount).label('avg_amount'),
-        func.count(Transaction.id).label('count')
-    ).filter(
-        Transaction.user_id == user_id,
-        Transaction.type == 'expense',
-        Transaction.transaction_date >= start_date.date(),
-        Transaction.transaction_date <= end_date.date()
-    ).group_by(
-        case(
-            (func.cast(func.strftime('%w', Transaction.transaction_date), Integer) == 0, 6),
-            else_=(func.cast(func.strftime('%w', Transaction.transaction_date), Integer) - 1)
+    if not start_date:
+        start_date = end_date - timedelta(days=30 * months)
+    
+    # 날짜는 문자열, 금액은 최소 단위 정수로 그대로 받아 행마다 Python 객체로 변환하는 비용을 줄임
+    rows = db.execute(
+        select(
+            Transaction.id,
+            type_coerce(Transaction.transaction_date, String),
+            type_coerce(Transaction.amount, Integer),
+            Transaction.category_id
+        ).where(
+            Transaction.user_id == user_id,
+            Transaction.type == 'expense',
+            Transaction.transaction_date >= start_date.date(),
+            Transaction.transaction_date <= end_date.date()
         )
     ).all()
     
-    # 이상치 탐지 (평균 대비 2배 이상인 거래)
-    avg_amount = db.query(func.avg(Transaction.amount)).filter(
-        Transaction.user_id == user_id,
-        Transaction.type == 'expense',
-        Transaction.transaction_date >= start_date.date(),
-        Transaction.transaction_date <= end_date.date()
-    ).scalar() or 0
+    result = {
+        "monthly_pattern": [],
+        "weekday_pattern": [],
+        "category_pattern": [],
+        "outliers": [],
+        "average_amount": 0,
+        "threshold": SPENDING_OUTLIER_Z
+    }
+    if not rows:
+        return result
+    
+    ids_col, dates_col, amounts_col, categories_col = zip(*rows)
+    ids = np.asarray(ids_col, dtype=np.int64)
+    dates = np.asarray(dates_col, dtype="datetime64[D]")
+    amounts = np.asarray(amounts_col, dtype=np.float64) / MINOR_UNITS
+    categories = np.asarray(categories_col, dtype=np.int64)
+    
+    # 월별 합계
+    month_keys, month_index = np.unique(dates.astype("datetime64[M]"), return_inverse=True)
+    month_totals = np.bincount(month_index, weights=amounts)
+    month_numbers = month_keys.astype(np.int64)
+    result["monthly_pattern"] = [
+        {"year": int(m // 12 + 1970), "month": int(m % 12 + 1), "total": float(total)}
+        for m, total in zip(month_numbers, month_totals)
+    ]
     
-    threshold = float(avg_amount) * 2 if avg_amount else 0
+    # 요일별 평균/건수 (1970-01-01은 목요일 -> 0=월요일이 되도록 3을 더함)
+    weekdays = (dates.astype(np.int64) + 3) % 7
+    weekday_counts = np.bincount(weekdays, minlength=7)
+    weekday_totals = np.bincount(weekdays, weights=amounts, minlength=7)
+    result["weekday_pattern"] = [
+        {
+            "weekday": weekday,
+            "weekday_name": ["월", "화", "수", "목", "금", "토", "일"][weekday],
+            "avg_amount": float(weekday_totals[weekday] / weekday_counts[weekday]),
+            "count": int(weekday_counts[weekday])
+        }
+        for weekday in range(7)
+        if weekday_counts[weekday]
+    ]
     
-    outliers = db.query(Transaction).filter(
-        Transaction.user_id == user_id,
-        Transaction.type == 'expense',
-        Transaction.transaction_date >= start_date.date(),
-        Transaction.transaction_date <= end_date.date(),
-        Transaction.amount > threshold
-    ).order_by(Transaction.amount.desc()).limit(10).all()
+    # 카테고리별 분포: (카테고리, 금액) 순으로 정렬하면 그룹 경계만으로 중앙값을 구할 수 있음
+    category_keys, category_index = np.unique(categories, return_inverse=True)
+    order = np.lexsort((amounts, category_index))
+    sorted_amounts = amounts[order]
+    counts = np.bincount(category_index)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    medians = (sorted_amounts[starts + (counts - 1) // 2] + sorted_amounts[starts + counts // 2]) / 2
+    totals = np.bincount(category_index, weights=amounts)
+    
+    # MAD: 중앙값과의 절대 편차를 다시 그룹별로 정렬해 중앙값을 구함
+    deviations = np.abs(amounts - medians[category_index])
+    deviation_order = np.lexsort((deviations, category_index))
+    sorted_deviations = deviations[deviation_order]
+    mads = (sorted_deviations[starts + (counts - 1) // 2] + sorted_deviations[starts + counts // 2]) / 2
+    # MAD가 0이면(절반 이상이 같은 금액) 평균 절대 편차로 대체
+    mean_deviations = np.bincount(category_index, weights=deviations) / counts
+    scales = np.where(mads > 0, mads, mean_deviations * 1.253314 * 0.6745)
+    
+    result["category_pattern"] = [
+        {
+            "category_id": int(category_keys[idx]),
+            "total": float(totals[idx]),
+            "count": int(counts[idx]),
+            "average": float(totals[idx] / counts[idx]),
+            "median": float(medians[idx]),
+            "mad": float(mads[idx])
+        }
+        for idx in np.argsort(-totals)
+    ]
     
-    return {
-        "monthly_pattern": [
-            {
-                "year": int(row.year),
-                "month": int(row.month),
-                "total": float(row.total) if row.total else 0
-            }
-            for row in monthly_expenses
-        ],
-        "weekday_pattern": [
-            {
-                "weekday": int(row.weekday),
-                "weekday_name": ["월", "화", "수", "목", "금", "토", "일"][int(row.weekday)],
-                "avg_amount": float(row.avg_amount) if row.avg_amount else 0,
-                "count": int(row.count)
-            }
-            for row in weekday_expenses
-        ],
-        "outliers": [
-            {
-                "id": t.id,
-                "date": t.transaction_date.isoformat(),
-                "amount": float(t.amount),
-                "description": t.description,
-                "category_id": t.category_id
-            }
-            for t in outliers
-        ],
-        "average_amount": float(avg_amount) if avg_amount else 0,
-        "threshold": threshold
-    }
+    # 이상치: 지출이 많은 쪽만 (수정 Z 점수 = 0.6745 * (x - 중앙값) / MAD)
+    row_scales = scales[category_index]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(row_scales > 0, 0.6745 * (amounts - medians[category_index]) / row_scales, 0.0)
+    eligible = counts[category_index] >= SPENDING_OUTLIER_MIN_SAMPLES
+    outlier_rows = np.flatnonzero(eligible & (scores >= SPENDING_OUTLIER_Z))
+    outlier_rows = outlier_rows[np.argsort(-amounts[outlier_rows], kind="stable")][:SPENDING_OUTLIER_LIMIT]
+    
+    descriptions = {}
+    if len(outlier_rows):
+        descriptions = dict(db.query(Transaction.id, Transaction.description).filter(
+            Transaction.id.in_(ids[outlier_rows].tolist())
+        ).all())
+    result["outliers"] = [
+        {
+            "id": int(ids[row]),
+            "date": str(dates[row]),
+            "amount": float(amounts[row]),
+            "description": descriptions.get(int(ids[row])),
+            "category_id": int(categories[row]),
+            "category_median": float(medians[category_index[row]]),
+            "score": round(float(scores[row]), 2)
+        }
+        for row in outlier_rows
+    ]
+    result["average_amount"] = float(amounts.mean())
+    return result
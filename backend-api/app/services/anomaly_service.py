@@ -0,0 +1,342 @@
+"""
+실시간 이상 거래 감지
+
+사용자/카테고리별로 거래 수, 평균, 편차 제곱합(M2)을 Welford 방식으로 누적해
+두고, 새 거래가 들어오면 그 시점의 통계로 Z 점수를 계산한다. 통계 한 행만
+읽고 쓰므로 거래 수와 관계없이 O(1)이다.
+
+- 거래 생성/수정/삭제: 매퍼 이벤트에서 통계를 증감하고 이상 여부를 판정
+- Core로 일괄 삽입한 거래: `observe_bulk()`로 같은 규칙을 적용
+- Core로 일괄 수정/삭제한 거래: `forget_bulk()`로 통계에서 빼고 이상 거래 기록 삭제
+- `rebuild()`는 CLI에서 통계를 처음부터 다시 계산할 때만 사용
+
+Z 점수가 ANOMALY_Z_THRESHOLD 이상(평균보다 큰 쪽만)이고 카테고리 거래가
+ANOMALY_MIN_SAMPLES건 이상일 때 이상 거래로 기록한다.
+"""
+import math
+import os
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Integer, delete, event, func, inspect, select, type_coerce, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models import Transaction, CategoryAmountStat, TransactionAnomaly
+from app.models.types import MINOR_UNITS
+
+ANOMALY_Z_THRESHOLD = float(os.getenv("ANOMALY_Z_THRESHOLD", "3.0"))
+ANOMALY_MIN_SAMPLES = int(os.getenv("ANOMALY_MIN_SAMPLES", "10"))
+# 금액이 모두 같아 표준편차가 0에 가까울 때 쓰는 최소 표준편차 (평균 대비 비율)
+MIN_STD_RATIO = 0.05
+
+Stat = Tuple[int, float, float]  # (count, mean, m2)
+
+_EMPTY: Stat = (0, 0.0, 0.0)
+
+
+def add_value(stat: Stat, amount: float) -> Stat:
+    """통계에 금액 하나 추가"""
+    count, mean, m2 = stat
+    count += 1
+    delta = amount - mean
+    mean += delta / count
+    return count, mean, m2 + delta * (amount - mean)
+
+
+def remove_value(stat: Stat, amount: float) -> Stat:
+    """통계에서 금액 하나 제거 (add_value의 역연산)"""
+    count, mean, m2 = stat
+    if count <= 1:
+        return _EMPTY
+    new_mean = (count * mean - amount) / (count - 1)
+    m2 -= (amount - mean) * (amount - new_mean)
+    return count - 1, new_mean, max(m2, 0.0)
+
+
+def combine(stats: Iterable[Stat]) -> Stat:
+    """여러 통계를 하나로 합침 (병렬 Welford 결합 - 원래 금액 없이 정확히 계산)"""
+    count, mean, m2 = _EMPTY
+    for other_count, other_mean, other_m2 in stats:
+        total = count + other_count
+        if total == 0:
+            continue
+        delta = other_mean - mean
+        mean += delta * other_count / total
+        m2 += other_m2 + delta * delta * count * other_count / total
+        count = total
+    return count, mean, m2
+
+
+def score(stat: Stat, amount: float) -> Optional[Dict[str, float]]:
+    """
+    현재 통계 기준으로 금액의 이상 여부 판정
+
+    Returns:
+        이상 거래이면 {"z_score", "mean", "std"}, 아니면 None
+    """
+    count, mean, m2 = stat
+    if count < ANOMALY_MIN_SAMPLES:
+        return None
+    std = max(math.sqrt(m2 / (count - 1)), abs(mean) * MIN_STD_RATIO)
+    if std <= 0:
+        return None
+    z_score = (amount - mean) / std
+    if z_score < ANOMALY_Z_THRESHOLD:
+        return None
+    return {"z_score": round(z_score, 4), "mean": mean, "std": std}
+
+
+# ---------------------------------------------------------------------------
+# 저장
+# ---------------------------------------------------------------------------
+
+_stats = CategoryAmountStat.__table__
+_anomalies = TransactionAnomaly.__table__
+
+
+def _load_stats(connection, user_id: int, category_ids: Iterable[int]) -> Dict[int, Stat]:
+    rows = connection.execute(
+        select(_stats.c.category_id, _stats.c.count, _stats.c.mean, _stats.c.m2).where(
+            _stats.c.user_id == user_id, _stats.c.category_id.in_(list(category_ids))
+        )
+    )
+    return {category_id: (count, mean, m2) for category_id, count, mean, m2 in rows}
+
+
+def _save_stats(connection, user_id: int, stats: Dict[int, Stat]) -> None:
+    empty = [category_id for category_id, stat in stats.items() if stat[0] <= 0]
+    if empty:
+        connection.execute(delete(_stats).where(_stats.c.user_id == user_id, _stats.c.category_id.in_(empty)))
+    rows = [
+        {"user_id": user_id, "category_id": category_id, "count": count, "mean": mean, "m2": m2}
+        for category_id, (count, mean, m2) in stats.items()
+        if count > 0
+    ]
+    if rows:
+        stmt = sqlite_insert(_stats)
+        connection.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[_stats.c.user_id, _stats.c.category_id],
+                set_={"count": stmt.excluded.count, "mean": stmt.excluded.mean, "m2": stmt.excluded.m2},
+            ),
+            rows,
+        )
+
+
+def _anomaly_row(user_id: int, transaction_id: int, category_id: int, transaction_date: date,
+                 amount: float, result: Dict[str, float]) -> Dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "transaction_id": transaction_id,
+        "category_id": category_id,
+        "transaction_date": transaction_date,
+        "amount": amount,
+        **result,
+    }
+
+
+def _observe(connection, user_id: int, category_id: int, transaction_id: int,
+             transaction_date: date, amount: float) -> None:
+    """거래 하나를 판정한 뒤 통계에 추가"""
+    stat = _load_stats(connection, user_id, [category_id]).get(category_id, _EMPTY)
+    result = score(stat, amount)
+    if result is not None:
+        connection.execute(_anomalies.insert().values(
+            **_anomaly_row(user_id, transaction_id, category_id, transaction_date, amount, result)
+        ))
+    _save_stats(connection, user_id, {category_id: add_value(stat, amount)})
+
+
+def _forget(connection, user_id: int, category_id: int, transaction_id: int, amount: float) -> None:
+    """거래 하나를 통계에서 빼고 이상 거래 기록 삭제"""
+    stat = _load_stats(connection, user_id, [category_id]).get(category_id, _EMPTY)
+    _save_stats(connection, user_id, {category_id: remove_value(stat, amount)})
+    connection.execute(delete(_anomalies).where(_anomalies.c.transaction_id == transaction_id))
+
+
+@event.listens_for(Transaction, "after_insert")
+def _on_transaction_insert(mapper, connection, target):
+    _observe(connection, target.user_id, target.category_id, target.id,
+             target.transaction_date, float(target.amount))
+
+
+@event.listens_for(Transaction, "after_update")
+def _on_transaction_update(mapper, connection, target):
+    state = inspect(target)
+    amount_history = state.attrs.amount.history
+    category_history = state.attrs.category_id.history
+    date_history = state.attrs.transaction_date.history
+    if not (amount_history.has_changes() or category_history.has_changes() or date_history.has_changes()):
+        return
+
+    old_amount = amount_history.deleted[0] if amount_history.deleted else target.amount
+    old_category_id = category_history.deleted[0] if category_history.deleted else target.category_id
+    # 수정된 거래는 자기 자신을 뺀 통계로 다시 판정
+    _forget(connection, target.user_id, old_category_id, target.id, float(old_amount))
+    _observe(connection, target.user_id, target.category_id, target.id,
+             target.transaction_date, float(target.amount))
+
+
+@event.listens_for(Transaction, "after_delete")
+def _on_transaction_delete(mapper, connection, target):
+    _forget(connection, target.user_id, target.category_id, target.id, float(target.amount))
+
+
+# ---------------------------------------------------------------------------
+# 일괄 처리 / 조회
+# ---------------------------------------------------------------------------
+
+def observe_bulk(db: Session, user_id: int, rows: List[Dict[str, Any]]) -> Dict[int, Dict[str, float]]:
+    """
+    Core로 일괄 삽입한 거래에 이상 거래 판정 적용 (커밋은 호출한 쪽에서)
+
+    Args:
+        rows: {"id", "category_id", "amount", "transaction_date"} 목록 - 삽입 순서대로
+
+    Returns:
+        거래 ID -> {"z_score", "mean", "std"} (이상 거래만)
+    """
+    if not rows:
+        return {}
+    connection = db.connection()
+    stats = _load_stats(connection, user_id, {row["category_id"] for row in rows})
+
+    flagged: Dict[int, Dict[str, float]] = {}
+    anomaly_rows = []
+    for row in rows:
+        amount = float(row["amount"])
+        stat = stats.get(row["category_id"], _EMPTY)
+        result = score(stat, amount)
+        if result is not None:
+            flagged[row["id"]] = result
+            anomaly_rows.append(_anomaly_row(
+                user_id, row["id"], row["category_id"], row["transaction_date"], amount, result
+            ))
+        stats[row["category_id"]] = add_value(stat, amount)
+
+    if anomaly_rows:
+        connection.execute(_anomalies.insert(), anomaly_rows)
+    _save_stats(connection, user_id, stats)
+    return flagged
+
+
+def forget_bulk(db: Session, user_id: int, rows: List[Dict[str, Any]]) -> None:
+    """
+    Core로 일괄 수정/삭제한 거래를 통계에서 빼고 이상 거래 기록 삭제 (커밋은 호출한 쪽에서)
+
+    Args:
+        rows: 변경 전 {"id", "category_id", "amount"} 목록
+    """
+    if not rows:
+        return
+    connection = db.connection()
+    stats = _load_stats(connection, user_id, {row["category_id"] for row in rows})
+    for row in rows:
+        stats[row["category_id"]] = remove_value(stats.get(row["category_id"], _EMPTY), float(row["amount"]))
+    _save_stats(connection, user_id, stats)
+    connection.execute(delete(_anomalies).where(_anomalies.c.transaction_id.in_([row["id"] for row in rows])))
+
+
+def merge_categories(db: Session, user_id: int, category_id: int, source_category_ids: Iterable[int]) -> None:
+    """
+    카테고리 병합 시 원본 카테고리 통계를 대상 카테고리에 합치고 이상 거래 기록 이동 (커밋은 호출한 쪽에서)
+    """
+    source_category_ids = list(source_category_ids)
+    connection = db.connection()
+    stats = _load_stats(connection, user_id, [category_id, *source_category_ids])
+    merged = {source_id: _EMPTY for source_id in source_category_ids}
+    merged[category_id] = combine(stats.values())
+    _save_stats(connection, user_id, merged)
+    connection.execute(
+        update(_anomalies)
+        .where(_anomalies.c.user_id == user_id, _anomalies.c.category_id.in_(source_category_ids))
+        .values(category_id=category_id)
+    )
+
+
+def get_anomaly(db: Session, transaction_id: int, user_id: int) -> Optional[TransactionAnomaly]:
+    """거래의 이상 거래 기록 조회"""
+    return db.query(TransactionAnomaly).filter(
+        TransactionAnomaly.transaction_id == transaction_id,
+        TransactionAnomaly.user_id == user_id
+    ).first()
+
+
+def get_anomalies(
+    db: Session,
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> List[TransactionAnomaly]:
+    """이상 거래 목록 조회 (최근 거래일 순)"""
+    query = db.query(TransactionAnomaly).filter(TransactionAnomaly.user_id == user_id)
+    if start_date:
+        query = query.filter(TransactionAnomaly.transaction_date >= start_date)
+    if end_date:
+        query = query.filter(TransactionAnomaly.transaction_date <= end_date)
+    if category_id:
+        query = query.filter(TransactionAnomaly.category_id == category_id)
+    return query.order_by(
+        TransactionAnomaly.transaction_date.desc(), TransactionAnomaly.id.desc()
+    ).offset(skip).limit(limit).all()
+
+
+def delete_anomaly(db: Session, anomaly_id: int, user_id: int) -> bool:
+    """이상 거래 기록 삭제 (확인 처리) - 통계는 그대로 유지"""
+    anomaly = db.query(TransactionAnomaly).filter(
+        TransactionAnomaly.id == anomaly_id,
+        TransactionAnomaly.user_id == user_id
+    ).first()
+    if not anomaly:
+        return False
+    db.delete(anomaly)
+    db.commit()
+    return True
+
+
+def rebuild(db: Session, user_id: int) -> Dict[str, int]:
+    """사용자의 거래 내역 전체로 카테고리 통계를 다시 계산하고, 삭제된 거래의 이상 기록 정리"""
+    # 최소 단위 정수 그대로 집계 - 제곱합은 정수 범위를 넘을 수 있어 total()(실수)로 더함
+    amount = type_coerce(Transaction.amount, Integer)
+    rows = db.query(
+        Transaction.category_id,
+        func.count(),
+        func.sum(amount),
+        func.total(amount * amount),
+    ).filter(Transaction.user_id == user_id).group_by(Transaction.category_id).all()
+
+    db.query(CategoryAmountStat).filter(CategoryAmountStat.user_id == user_id).delete(synchronize_session=False)
+    if rows:
+        db.execute(_stats.insert(), [
+            {"user_id": user_id, "category_id": category_id, "count": count,
+             "mean": total / count / MINOR_UNITS,
+             "m2": max((squares - total * total / count) / MINOR_UNITS ** 2, 0.0)}
+            for category_id, count, total, squares in rows
+        ])
+    removed = db.query(TransactionAnomaly).filter(
+        TransactionAnomaly.user_id == user_id,
+        ~TransactionAnomaly.transaction_id.in_(select(Transaction.id).where(Transaction.user_id == user_id))
+    ).delete(synchronize_session=False)
+    db.commit()
+    return {"categories": len(rows), "removed_anomalies": removed}
+
+
+def rebuild_all(db: Session) -> Dict[int, Dict[str, int]]:
+    """거래 내역이 있는 모든 사용자의 통계 재계산"""
+    user_ids = [row[0] for row in db.query(Transaction.user_id).distinct()]
+    return {user_id: rebuild(db, user_id) for user_id in user_ids}
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        for uid, result in rebuild_all(session).items():
+            print(f"사용자 {uid}: 카테고리 {result['categories']}개 통계 계산")
+    finally:
+        session.close()
@@ -0,0 +1,205 @@
+"""
+예산 임계값 알림
+
+거래나 예산이 바뀌면 매퍼 이벤트에서 영향받는 (사용자, 월)만 표시해 두고,
+플러시가 끝난 직후 그 달의 예산만 다시 평가한다. 예산 대비 지출이
+임계값(BUDGET_ALERT_THRESHOLDS, 기본 80%/100%)을 처음 넘으면 budget_alerts에
+기록하고 커밋 후 사용자 이벤트 스트림으로 보낸다. 지출이 다시 임계값 아래로
+내려가면 알림을 지워 다음에 넘을 때 다시 알린다.
+
+Core로 일괄 삽입/삭제해 이벤트를 거치지 않은 경우에는 `evaluate()`를 직접 호출한다.
+"""
+import calendar
+import os
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core import events
+from app.models import Budget, BudgetAlert, Transaction
+
+# 알림 임계값 (예산 대비 %, 쉼표로 구분)
+BUDGET_ALERT_THRESHOLDS = sorted({
+    int(value) for value in os.getenv("BUDGET_ALERT_THRESHOLDS", "80,100").split(",") if value.strip()
+})
+
+EVENT_TYPE = "budget_alert"
+
+_budgets = Budget.__table__
+_alerts = BudgetAlert.__table__
+_transactions = Transaction.__table__
+
+
+def _month_of(value: Optional[date]) -> Optional[str]:
+    return value.strftime('%Y-%m') if value else None
+
+
+def _mark(session: Optional[Session], user_id: int, *months: Optional[str]) -> None:
+    if session is None:
+        return
+    dirty = session.info.setdefault("budget_alert_dirty", {})
+    dirty.setdefault(user_id, set()).update(month for month in months if month)
+
+
+def alert_to_dict(alert: Any) -> Dict[str, Any]:
+    """알림 행(ORM 객체 또는 Row)을 응답/이벤트용 딕셔너리로 변환"""
+    return {
+        "id": alert.id,
+        "budget_id": alert.budget_id,
+        "category_id": alert.category_id,
+        "month": alert.month,
+        "threshold": alert.threshold,
+        "budget_amount": alert.budget_amount,
+        "spent_amount": alert.spent_amount,
+        "percentage": alert.percentage,
+        "created_at": alert.created_at,
+    }
+
+
+def _evaluate(connection, session: Optional[Session], user_id: int, months: Iterable[str]) -> List[Dict[str, Any]]:
+    months = sorted(set(months))
+    if not months or not BUDGET_ALERT_THRESHOLDS:
+        return []
+
+    budget_rows = connection.execute(
+        select(_budgets.c.id, _budgets.c.category_id, _budgets.c.amount, _budgets.c.month).where(
+            _budgets.c.user_id == user_id, _budgets.c.month.in_(months)
+        )
+    ).all()
+    if not budget_rows:
+        return []
+
+    # 예산이 있는 달의 (월, 카테고리)별 지출 - 거래일 범위로 인덱스 사용
+    budget_months = sorted({row.month for row in budget_rows})
+    start_year, start_month = map(int, budget_months[0].split('-'))
+    end_year, end_month = map(int, budget_months[-1].split('-'))
+    month_key = func.strftime('%Y-%m', _transactions.c.transaction_date)
+    spent: Dict[Tuple[str, Optional[int]], float] = {}
+    for month, category_id, total in connection.execute(
+        select(month_key, _transactions.c.category_id, func.sum(_transactions.c.amount)).where(
+            _transactions.c.user_id == user_id,
+            _transactions.c.type == 'expense',
+            _transactions.c.transaction_date >= date(start_year, start_month, 1),
+            _transactions.c.transaction_date <= date(end_year, end_month, calendar.monthrange(end_year, end_month)[1]),
+            month_key.in_(budget_months),
+        ).group_by(month_key, _transactions.c.category_id)
+    ):
+        spent[(month, category_id)] = float(total or 0)
+        spent[(month, None)] = spent.get((month, None), 0.0) + float(total or 0)
+
+    existing: Set[Tuple[int, int]] = {
+        (budget_id, threshold)
+        for budget_id, threshold in connection.execute(
+            select(_alerts.c.budget_id, _alerts.c.threshold).where(
+                _alerts.c.budget_id.in_([row.id for row in budget_rows])
+            )
+        )
+    }
+
+    created = []
+    for row in budget_rows:
+        budget_amount = float(row.amount)
+        spent_amount = spent.get((row.month, row.category_id), 0.0)
+        percentage = (spent_amount / budget_amount * 100) if budget_amount > 0 else 0.0
+        for threshold in BUDGET_ALERT_THRESHOLDS:
+            reached = budget_amount > 0 and percentage >= threshold
+            if reached and (row.id, threshold) not in existing:
+                alert = connection.execute(
+                    _alerts.insert().values(
+                        user_id=user_id,
+                        budget_id=row.id,
+                        category_id=row.category_id,
+                        month=row.month,
+                        threshold=threshold,
+                        budget_amount=budget_amount,
+                        spent_amount=spent_amount,
+                        percentage=round(percentage, 2),
+                    ).returning(*_alerts.c)
+                ).one()
+                created.append(alert_to_dict(alert))
+            elif not reached and (row.id, threshold) in existing:
+                connection.execute(delete(_alerts).where(
+                    _alerts.c.budget_id == row.id, _alerts.c.threshold == threshold
+                ))
+
+    if session is not None:
+        for alert in created:
+            events.publish_after_commit(session, user_id, EVENT_TYPE, alert)
+    return created
+
+
+def evaluate(db: Session, user_id: int, months: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """
+    사용자 예산 알림 재평가 (커밋은 호출한 쪽에서)
+
+    Args:
+        months: 평가할 달 (YYYY-MM) - None이면 예산이 있는 모든 달
+
+    Returns:
+        새로 생긴 알림 목록
+    """
+    if months is None:
+        months = [row[0] for row in db.query(Budget.month).filter(Budget.user_id == user_id).distinct()]
+    return _evaluate(db.connection(), db, user_id, months)
+
+
+@event.listens_for(Transaction, "after_insert")
+@event.listens_for(Transaction, "after_delete")
+def _on_transaction_change(mapper, connection, target):
+    if target.type == 'expense':
+        _mark(Session.object_session(target), target.user_id, _month_of(target.transaction_date))
+
+
+@event.listens_for(Transaction, "after_update")
+def _on_transaction_update(mapper, connection, target):
+    state = inspect(target)
+    histories = [state.attrs[name].history for name in ("amount", "category_id", "transaction_date", "type")]
+    if not any(history.has_changes() for history in histories):
+        return
+    date_history, type_history = histories[2], histories[3]
+    old_date = date_history.deleted[0] if date_history.deleted else target.transaction_date
+    old_type = type_history.deleted[0] if type_history.deleted else target.type
+    if 'expense' in (old_type, target.type):
+        _mark(Session.object_session(target), target.user_id, _month_of(old_date), _month_of(target.transaction_date))
+
+
+@event.listens_for(Budget, "after_insert")
+@event.listens_for(Budget, "after_update")
+def _on_budget_change(mapper, connection, target):
+    month_history = inspect(target).attrs.month.history
+    _mark(Session.object_session(target), target.user_id, target.month, *(month_history.deleted or ()))
+
+
+@event.listens_for(Budget, "after_delete")
+def _on_budget_delete(mapper, connection, target):
+    connection.execute(delete(_alerts).where(_alerts.c.budget_id == target.id))
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _after_flush_postexec(session, flush_context):
+    dirty = session.info.pop("budget_alert_dirty", None)
+    if not dirty:
+        return
+    connection = session.connection()
+    for user_id, months in dirty.items():
+        _evaluate(connection, session, user_id, months)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("budget_alert_dirty", None)
+
+
+def get_alerts(
+    db: Session,
+    user_id: int,
+    month: Optional[str] = None,
+    limit: int = 100
+) -> List[BudgetAlert]:
+    """예산 알림 목록 조회 (최근 순)"""
+    query = db.query(BudgetAlert).filter(BudgetAlert.user_id == user_id)
+    if month:
+        query = query.filter(BudgetAlert.month == month)
+    return query.order_by(BudgetAlert.created_at.desc(), BudgetAlert.id.desc()).limit(limit).all()
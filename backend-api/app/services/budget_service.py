@@ -1,8 +1,9 @@
+import calendar
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, extract
-from typing import List, Optional
+from sqlalchemy import and_, func
+from typing import Dict, List, Optional, Tuple
+from datetime import date
 from decimal import Decimal
-from datetime import datetime
 from app.models import Budget, Transaction, Category
 from app.schemas.budget import BudgetCreate, BudgetUpdate
 
@@ -73,64 +74,125 @@ def delete_budget(db: Session, budget_id: int, user_id: int) -> bool:
     return True
 
 
-def get_budget_status(
-    db: Session,
-    user_id: int,
-    month: str
-) -> List[dict]:
-    """예산 대비 지출 현황 조회"""
-    # 해당 월의 예산 조회
-    budgets = get_budgets(db, user_id, month=month)
-    
-    # 해당 월의 지출 내역 조회
-    year, month_num = map(int, month.split('-'))
-    
-    expenses = db.query(
-        Transaction.category_id,
+def _month_bounds(start_month: str, end_month: str) -> Tuple[date, date]:
+    """YYYY-MM 범위를 (첫날, 마지막 날)로 변환"""
+    start_year, start_num = map(int, start_month.split('-'))
+    end_year, end_num = map(int, end_month.split('-'))
+    last_day = calendar.monthrange(end_year, end_num)[1]
+    return date(start_year, start_num, 1), date(end_year, end_num, last_day)
+
+
+def _expense_rollup(db: Session, user_id: int, start_month: str, end_month: str):
+    """
+    기간 내 (월, 카테고리)별 지출 합계 서브쿼리
+
+    거래일 범위 조건으로 (user_id, transaction_date) 인덱스를 사용하고,
+    월 키는 집계할 때만 계산한다.
+    """
+    start, end = _month_bounds(start_month, end_month)
+    month_key = func.strftime('%Y-%m', Transaction.transaction_date)
+    return db.query(
+        month_key.label('month'),
+        Transaction.category_id.label('category_id'),
         func.sum(Transaction.amount).label('total')
     ).filter(
-        and_(
-            Transaction.user_id == user_id,
-            Transaction.type == 'expense',
-            extract('year', Transaction.transaction_date) == year,
-            extract('month', Transaction.transaction_date) == month_num
-        )
-    ).group_by(Transaction.category_id).all()
-    
-    expenses_dict = {exp.category_id: float(exp.total) for exp in expenses}
-    
-    # 전체 지출 합계
-    total_expenses = sum(expenses_dict.values())
-    
-    # 예산별 현황 계산
+        Transaction.user_id == user_id,
+        Transaction.type == 'expense',
+        Transaction.transaction_date >= start,
+        Transaction.transaction_date <= end
+    ).group_by(month_key, Transaction.category_id).subquery()
+
+
+def _status_lines(db: Session, user_id: int, start_month: str, end_month: str) -> List[dict]:
+    """
+    기간 내 모든 예산의 지출 현황을 한 번의 쿼리로 계산
+
+    예산에 카테고리 이름, (월, 카테고리) 지출 합계, 월 전체 지출 합계를 조인한다.
+    """
+    rollup = _expense_rollup(db, user_id, start_month, end_month)
+    month_totals = db.query(
+        rollup.c.month,
+        func.sum(rollup.c.total).label('total')
+    ).group_by(rollup.c.month).subquery()
+
+    rows = db.query(
+        Budget.id,
+        Budget.amount,
+        Budget.month,
+        Budget.category_id,
+        Category.name,
+        func.coalesce(rollup.c.total, 0),
+        func.coalesce(month_totals.c.total, 0)
+    ).outerjoin(
+        Category, Category.id == Budget.category_id
+    ).outerjoin(
+        rollup, and_(rollup.c.month == Budget.month, rollup.c.category_id == Budget.category_id)
+    ).outerjoin(
+        month_totals, month_totals.c.month == Budget.month
+    ).filter(
+        Budget.user_id == user_id,
+        Budget.month >= start_month,
+        Budget.month <= end_month
+    ).order_by(Budget.month.desc(), Budget.category_id).all()
+
     status_list = []
-    
-    for budget in budgets:
-        if budget.category_id:
-            # 카테고리별 예산
-            spent = expenses_dict.get(budget.category_id, 0.0)
-            category = db.query(Category).filter(Category.id == budget.category_id).first()
-            category_name = category.name if category else None
-        else:
-            # 전체 예산
-            spent = total_expenses
-            category_name = None
-        
-        budget_amount = float(budget.amount)
-        remaining = budget_amount - spent
-        percentage = (spent / budget_amount * 100) if budget_amount > 0 else 0
-        is_over = spent > budget_amount
-        
+    for budget_id, amount, month, category_id, category_name, category_spent, month_spent in rows:
+        # 카테고리별 예산은 해당 카테고리 지출, 전체 예산은 월 전체 지출
+        spent = category_spent if category_id else month_spent
         status_list.append({
-            'budget_id': budget.id,
-            'budget_amount': budget_amount,
+            'budget_id': budget_id,
+            'budget_amount': amount,
             'spent_amount': spent,
-            'remaining_amount': remaining,
-            'percentage': percentage,
-            'is_over_budget': is_over,
-            'category_id': budget.category_id,
+            'remaining_amount': amount - spent,
+            'percentage': float(spent / amount * 100) if amount > 0 else 0,
+            'is_over_budget': spent > amount,
+            'category_id': category_id,
             'category_name': category_name,
-            'month': budget.month
+            'month': month
         })
-    
     return status_list
+
+
+def get_budget_status(
+    db: Session,
+    user_id: int,
+    month: str
+) -> List[dict]:
+    """예산 대비 지출 현황 조회"""
+    return _status_lines(db, user_id, month, month)
+
+
+def get_budget_status_range(
+    db: Session,
+    user_id: int,
+    start_month: str,
+    end_month: str
+) -> List[dict]:
+    """
+    여러 달의 예산 대비 지출 현황 조회 (예산 추이 화면용)
+
+    Returns:
+        월별 {"month", "spent_amount"(월 전체 지출), "budgets"(예산별 현황)} - 오래된 달부터
+    """
+    rollup = _expense_rollup(db, user_id, start_month, end_month)
+    month_spent = {
+        month: total
+        for month, total in db.query(rollup.c.month, func.sum(rollup.c.total)).group_by(rollup.c.month)
+    }
+
+    lines_by_month: Dict[str, List[dict]] = {}
+    for line in _status_lines(db, user_id, start_month, end_month):
+        lines_by_month.setdefault(line['month'], []).append(line)
+
+    result = []
+    year, month_num = map(int, start_month.split('-'))
+    month = start_month
+    while month <= end_month:
+        result.append({
+            'month': month,
+            'spent_amount': month_spent.get(month, Decimal('0')),
+            'budgets': lines_by_month.get(month, [])
+        })
+        year, month_num = (year + 1, 1) if month_num == 12 else (year, month_num + 1)
+        month = f"{year:04d}-{month_num:02d}"
+    return result
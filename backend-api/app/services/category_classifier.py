@@ -0,0 +1,250 @@
+"""
+사용자별 카테고리 분류기
+
+사용자의 카테고리 이름과 카테고리별 키워드를 하나의 Aho-Corasick 다중
+패턴 오토마톤으로 컴파일해, 거래 설명을 한 번만 훑어서 모든 일치 항목을
+찾는다. 컴파일된 분류기는 사용자별로 캐시하며 카테고리가 추가/수정/삭제되면
+무효화된다.
+
+점수 규칙은 기존 규칙 기반 분류와 같다.
+- 설명에 포함된 키워드 하나당 +1 (같은 키워드가 여러 번 나와도 한 번만)
+- 카테고리 이름이 설명에 포함되면 +2
+- 동점이면 먼저 생성된 카테고리 우선
+"""
+import os
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models import Category
+
+# 캐시할 최대 사용자 수
+CATEGORY_CLASSIFIER_CACHE_SIZE = int(os.getenv("CATEGORY_CLASSIFIER_CACHE_SIZE", "256"))
+
+# 카테고리 이름별 기본 키워드 (학습 모델이 확신하지 못할 때 사용)
+CATEGORY_KEYWORDS: Dict[str, List[str]] = {
+    "식비": ["식당", "음식", "카페", "커피", "점심", "저녁", "배달", "치킨", "피자", "햄버거", "라면", "김밥"],
+    "교통비": ["지하철", "버스", "택시", "기차", "비행기", "주차", "주유", "휘발유", "주차장", "교통카드"],
+    "쇼핑": ["마트", "편의점", "온라인", "쇼핑", "구매", "아마존", "쿠팡", "옷", "신발", "가전"],
+    "의료비": ["병원", "약국", "의료", "치과", "검진", "약", "진료"],
+    "교육비": ["학원", "교육", "책", "강의", "수강", "학습"],
+    "통신비": ["통신", "전화", "인터넷", "핸드폰", "요금", "통신사"],
+    "공과금": ["전기", "가스", "수도", "관리비", "공과금", "요금"],
+    "기타 지출": [],
+}
+
+KEYWORD_WEIGHT = 1
+NAME_WEIGHT = 2
+
+
+class AhoCorasick:
+    """
+    다중 문자열 검색 오토마톤
+
+    패턴마다 임의의 값(payload)을 붙여 두고, 텍스트를 한 번 훑으면서
+    등장한 패턴의 값을 돌려준다.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Any]] = [[]]
+        self._built = False
+
+    def add(self, pattern: str, payload: Any) -> None:
+        if not pattern:
+            return
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = nxt
+        self._output[node].append(payload)
+        self._built = False
+
+    def build(self) -> "AhoCorasick":
+        """실패 링크 계산 (너비 우선)"""
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                # 실패 링크가 가리키는 노드의 출력도 이 노드에서 끝나는 패턴이므로 합침
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+        self._built = True
+        return self
+
+    def iter_matches(self, text: str) -> Iterator[Any]:
+        """텍스트에 등장한 패턴의 payload를 등장 순서대로 반환 (중복 포함)"""
+        if not self._built:
+            self.build()
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if output[node]:
+                yield from output[node]
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+
+class CategoryClassifier:
+    """한 사용자의 카테고리 분류기 (거래 유형별 오토마톤)"""
+
+    def __init__(self, categories: List[Tuple[int, str, str]]):
+        """
+        Args:
+            categories: (id, name, type) 목록 - 생성 순서대로
+        """
+        self._categories: Dict[str, List[Tuple[int, str]]] = {}
+        self._automata: Dict[str, AhoCorasick] = {}
+
+        for category_id, name, category_type in categories:
+            entries = self._categories.setdefault(category_type, [])
+            automaton = self._automata.setdefault(category_type, AhoCorasick())
+            index = len(entries)
+            entries.append((category_id, name))
+
+            # payload: (카테고리 순번, 패턴 식별자, 가중치) - 식별자로 같은 키워드의 중복 가산 방지
+            for keyword in CATEGORY_KEYWORDS.get(name, []):
+                automaton.add(keyword.lower(), (index, keyword, KEYWORD_WEIGHT))
+            automaton.add(name.lower(), (index, None, NAME_WEIGHT))
+
+        for automaton in self._automata.values():
+            automaton.build()
+
+    def has_categories(self, transaction_type: str) -> bool:
+        return bool(self._categories.get(transaction_type))
+
+    def categories(self, transaction_type: str) -> List[Tuple[int, str]]:
+        """거래 유형의 카테고리 [(id, name)] (생성 순서)"""
+        return self._categories.get(transaction_type, [])
+
+    def scores(self, description: str, transaction_type: str) -> Dict[int, int]:
+        """카테고리 순번 -> 점수"""
+        automaton = self._automata.get(transaction_type)
+        if automaton is None or not description:
+            return {}
+
+        seen: Set[Tuple[int, Optional[str]]] = set()
+        scores: Dict[int, int] = {}
+        for index, key, weight in automaton.iter_matches(description.lower()):
+            if (index, key) in seen:
+                continue
+            seen.add((index, key))
+            scores[index] = scores.get(index, 0) + weight
+        return scores
+
+    def classify(self, description: str, transaction_type: str = "expense") -> Optional[Dict[str, Any]]:
+        """
+        거래 설명으로 카테고리 추천
+
+        Returns:
+            {"category_id", "category_name", "confidence"} 또는 None
+        """
+        scores = self.scores(description, transaction_type)
+        if not scores:
+            return None
+
+        # 최고 점수, 동점이면 앞선 카테고리
+        best_index = min(scores, key=lambda idx: (-scores[idx], idx))
+        best_score = scores[best_index]
+        if best_score <= 0:
+            return None
+
+        category_id, category_name = self._categories[transaction_type][best_index]
+        return {
+            "category_id": category_id,
+            "category_name": category_name,
+            "confidence": min(best_score / 5.0, 1.0),  # 0.0 ~ 1.0
+        }
+
+
+# ---------------------------------------------------------------------------
+# 사용자별 캐시
+# ---------------------------------------------------------------------------
+
+_cache: "OrderedDict[int, CategoryClassifier]" = OrderedDict()
+_cache_lock = threading.Lock()
+# 무효화 세대: 분류기를 만드는 동안 무효화가 일어나면 만든 결과를 캐시하지 않음
+_generations: Dict[int, int] = {}
+
+
+def get_classifier(db: Session, user_id: int) -> CategoryClassifier:
+    """사용자 분류기 조회 (캐시에 없으면 카테고리를 읽어 컴파일)"""
+    with _cache_lock:
+        classifier = _cache.get(user_id)
+        if classifier is not None:
+            _cache.move_to_end(user_id)
+            return classifier
+        generation = _generations.get(user_id, 0)
+
+    rows = db.query(Category.id, Category.name, Category.type).filter(
+        Category.user_id == user_id
+    ).order_by(Category.id).all()
+    classifier = CategoryClassifier([(row.id, row.name, row.type) for row in rows])
+
+    with _cache_lock:
+        if _generations.get(user_id, 0) == generation:
+            _cache[user_id] = classifier
+            _cache.move_to_end(user_id)
+            while len(_cache) > CATEGORY_CLASSIFIER_CACHE_SIZE:
+                _cache.popitem(last=False)
+    return classifier
+
+
+def invalidate(user_id: int) -> None:
+    """사용자 분류기 캐시 무효화"""
+    with _cache_lock:
+        _cache.pop(user_id, None)
+        _generations[user_id] = _generations.get(user_id, 0) + 1
+
+
+def clear() -> None:
+    """전체 캐시 비우기"""
+    with _cache_lock:
+        for user_id in list(_cache):
+            _generations[user_id] = _generations.get(user_id, 0) + 1
+        _cache.clear()
+
+
+@event.listens_for(Category, "after_insert")
+@event.listens_for(Category, "after_update")
+@event.listens_for(Category, "after_delete")
+def _on_category_change(mapper, connection, target):
+    """카테고리 변경 시 분류기 무효화 (커밋 후에도 한 번 더 무효화)"""
+    invalidate(target.user_id)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("category_classifier_dirty", set()).add(target.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    # 플러시와 커밋 사이에 다른 요청이 옛 카테고리로 분류기를 만들었을 수 있음
+    for user_id in session.info.pop("category_classifier_dirty", ()):
+        invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    for user_id in session.info.pop("category_classifier_dirty", ()):
+        invalidate(user_id)
@@ -1,8 +1,11 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import List, Optional
-from app.models import Category
+from sqlalchemy import Integer, and_, delete, func, literal, select, update
+from typing import Iterable, List, Optional
+from app.models import Category, Transaction, Budget, BudgetAlert, RecurringTransaction, TransactionTemplate
 from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.services import (
+    anomaly_service, budget_alert_service, category_classifier, change_service, deletion_service, learned_classifier,
+)
 
 
 def get_category(db: Session, category_id: int, user_id: int) -> Optional[Category]:
@@ -63,6 +66,8 @@ def delete_category(db: Session, category_id: int, user_id: int) -> bool:
     if not db_category:
         return False
     
+    # 거래는 메모리에 올리지 않고 청크 단위로 먼저 삭제 (남은 예산만 ORM cascade로 삭제)
+    deletion_service.delete_transactions(db, user_id, Transaction.category_id == category_id)
     db.delete(db_category)
     db.commit()
     return True
@@ -79,7 +84,107 @@ def delete_all_categories(
     if category_type:
         query = query.filter(Category.type == category_type)
     
-    count = query.count()
-    query.delete(synchronize_session=False)
+    category_ids = [row[0] for row in query.with_entities(Category.id)]
+    return deletion_service.delete_categories(db, user_id, category_ids)
+
+
+def merge_categories(db: Session, category_id: int, user_id: int, source_category_ids: Iterable[int]) -> Optional[dict]:
+    """
+    카테고리 병합 - 원본 카테고리의 거래/반복 거래/템플릿/예산을 대상 카테고리로 옮기고 원본 삭제
+
+    행 수와 관계없이 테이블마다 집합 단위 UPDATE/INSERT ... SELECT/DELETE 몇 번으로 처리하고
+    한 트랜잭션으로 커밋한다. 같은 달 예산이 양쪽에 있으면 금액을 합친다.
+    분류 모델 카운트와 금액 통계는 다시 계산하지 않고 원본 값을 대상에 합친다.
+
+    Returns:
+        병합 결과, 대상/원본 카테고리 중 하나라도 없으면 None
+
+    Raises:
+        ValueError: 수입/지출 유형이 다른 카테고리를 병합하려는 경우
+    """
+    source_ids = set(source_category_ids) - {category_id}
+    categories = {
+        category.id: category
+        for category in db.query(Category).filter(
+            Category.user_id == user_id, Category.id.in_(source_ids | {category_id})
+        )
+    }
+    if len(categories) != len(source_ids) + 1:
+        return None
+    if any(category.type != categories[category_id].type for category in categories.values()):
+        raise ValueError("수입/지출 유형이 같은 카테고리만 병합할 수 있습니다")
+
+    result = {'category_id': category_id, 'deleted_categories': len(source_ids)}
+    connection = db.connection()
+
+    # 카테고리를 참조하는 행 이동
+    for key, entity, table in (
+        ('transactions', 'transaction', Transaction.__table__),
+        ('recurring_transactions', 'recurring_transaction', RecurringTransaction.__table__),
+        ('transaction_templates', 'transaction_template', TransactionTemplate.__table__),
+    ):
+        moved = connection.execute(
+            update(table)
+            .where(table.c.user_id == user_id, table.c.category_id.in_(source_ids))
+            .values(category_id=category_id)
+            .returning(table.c.id)
+        ).scalars().all()
+        change_service.record_bulk(db, user_id, entity, moved, 'update')
+        result[key] = len(moved)
+
+    # 예산: 대상 카테고리에 같은 달 예산이 있으면 금액을 더하고, 없으면 합계로 새로 만든 뒤 원본 예산 삭제
+    budgets = Budget.__table__
+    sources = budgets.alias('sources')
+    source_budget = and_(sources.c.user_id == user_id, sources.c.category_id.in_(source_ids))
+    target_months = select(budgets.c.month).where(budgets.c.user_id == user_id, budgets.c.category_id == category_id)
+    merged = connection.execute(
+        update(budgets)
+        .where(
+            budgets.c.user_id == user_id,
+            budgets.c.category_id == category_id,
+            budgets.c.month.in_(select(sources.c.month).where(source_budget)),
+        )
+        .values(amount=budgets.c.amount + select(func.sum(sources.c.amount)).where(
+            source_budget, sources.c.month == budgets.c.month
+        ).scalar_subquery())
+        .returning(budgets.c.id)
+    ).scalars().all()
+    created = connection.execute(
+        budgets.insert().from_select(
+            ['user_id', 'category_id', 'amount', 'month'],
+            select(
+                literal(user_id, Integer), literal(category_id, Integer), func.sum(sources.c.amount), sources.c.month
+            ).where(source_budget, sources.c.month.not_in(target_months)).group_by(sources.c.month),
+        ).returning(budgets.c.id)
+    ).scalars().all()
+    removed = connection.execute(
+        delete(budgets)
+        .where(budgets.c.user_id == user_id, budgets.c.category_id.in_(source_ids))
+        .returning(budgets.c.id)
+    ).scalars().all()
+    if removed:
+        alerts = BudgetAlert.__table__
+        connection.execute(delete(alerts).where(alerts.c.budget_id.in_(removed)))
+    change_service.record_bulk(db, user_id, 'budget', merged, 'update')
+    change_service.record_bulk(db, user_id, 'budget', created, 'create')
+    change_service.record_bulk(db, user_id, 'budget', removed, 'delete')
+    result['budgets_merged'] = len(merged)
+    result['budgets_moved'] = len(created)
+
+    # 누적 통계 합치기
+    learned_classifier.merge_categories(db, user_id, category_id, source_ids)
+    anomaly_service.merge_categories(db, user_id, category_id, source_ids)
+
+    categories_table = Category.__table__
+    connection.execute(delete(categories_table).where(
+        categories_table.c.user_id == user_id, categories_table.c.id.in_(source_ids)
+    ))
+    change_service.record_bulk(db, user_id, 'category', source_ids, 'delete')
+
+    # 대상 카테고리 예산이 있는 달의 알림 재평가
+    budget_alert_service.evaluate(db, user_id, [row[0] for row in connection.execute(target_months)])
     db.commit()
-    return count
+    # Core로 처리해 매퍼 이벤트가 없으므로 캐시를 직접 무효화
+    category_classifier.invalidate(user_id)
+    learned_classifier.invalidate(user_id)
+    return result
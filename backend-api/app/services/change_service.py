@@ -0,0 +1,93 @@
+"""
+데이터 변경 기록
+
+사용자 소유 엔티티의 생성/수정/삭제를 매퍼 이벤트로 감지해 같은 트랜잭션 안에서
+변경 로그(change_log)에 남기고, 커밋 후 `{"entity", "id", "op", "data_version"}`
+형태의 변경 이벤트로 발행한다.
+
+- 실시간 클라이언트: 이벤트 스트림(`/api/events/stream`)을 받아 바뀐 것만 다시 조회
+- 오프라인 클라이언트: 마지막으로 받은 data_version 이후의 변경을 `/api/sync/changes`로 조회
+
+변경 로그는 엔티티마다 마지막 변경 한 건만 남기므로(이전 행은 삭제) 크기가
+엔티티 수에 비례한다. 삭제는 op='delete' 행(툼스톤)으로 남는다.
+
+Core로 일괄 처리해 매퍼 이벤트를 거치지 않는 경로는 `record_bulk()`를 호출한다.
+"""
+from typing import Iterable, List
+
+from sqlalchemy import delete, event, insert
+from sqlalchemy.orm import Session
+
+from app.core import events
+from app.models import (
+    Transaction, Category, Budget, RecurringTransaction, Tag,
+    TransactionTemplate, TransactionAttachment, ChangeLog,
+)
+
+# 모델 -> 엔티티 이름
+ENTITIES = {
+    Transaction: "transaction",
+    Category: "category",
+    Budget: "budget",
+    RecurringTransaction: "recurring_transaction",
+    Tag: "tag",
+    TransactionTemplate: "transaction_template",
+    TransactionAttachment: "transaction_attachment",
+}
+
+# IN 절 하나에 넣을 ID 수 (SQLite 바인드 변수 제한)
+_CHUNK_SIZE = 500
+
+_log = ChangeLog.__table__
+
+
+def _write_log(connection, user_id: int, entity: str, entity_ids: List[int], op: str) -> int:
+    """변경 로그 기록 후 이전 행 정리, 새 데이터 버전(마지막 로그 ID) 반환"""
+    version = 0
+    for start in range(0, len(entity_ids), _CHUNK_SIZE):
+        chunk = entity_ids[start:start + _CHUNK_SIZE]
+        new_ids = connection.execute(
+            insert(_log).returning(_log.c.id, sort_by_parameter_order=True),
+            [{"user_id": user_id, "entity": entity, "entity_id": entity_id, "op": op} for entity_id in chunk],
+        ).scalars().all()
+        connection.execute(delete(_log).where(
+            _log.c.user_id == user_id,
+            _log.c.entity == entity,
+            _log.c.entity_id.in_(chunk),
+            _log.c.id < new_ids[0],
+        ))
+        version = new_ids[-1]
+    return version
+
+
+def record_bulk(db: Session, user_id: int, entity: str, entity_ids: Iterable[int], op: str) -> None:
+    """
+    Core로 일괄 처리한 변경 기록 (커밋은 호출한 쪽에서)
+
+    변경 로그에는 엔티티별로 남기고, 실시간 스트림에는 op="bulk" 이벤트 하나만 보내
+    클라이언트가 해당 엔티티 목록 전체를 다시 조회하게 한다.
+
+    Args:
+        entity_ids: 변경된 엔티티 ID
+        op: create / update / delete
+    """
+    entity_ids = list(entity_ids)
+    if not entity_ids:
+        return
+    version = _write_log(db.connection(), user_id, entity, entity_ids, op)
+    events.record_change(db, user_id, entity, None, "bulk", version)
+
+
+def _listener(entity: str, op: str):
+    def listener(mapper, connection, target):
+        version = _write_log(connection, target.user_id, entity, [target.id], op)
+        session = Session.object_session(target)
+        if session is not None:
+            events.record_change(session, target.user_id, entity, target.id, op, version)
+    return listener
+
+
+for _model, _entity in ENTITIES.items():
+    event.listen(_model, "after_insert", _listener(_entity, "create"))
+    event.listen(_model, "after_update", _listener(_entity, "update"))
+    event.listen(_model, "after_delete", _listener(_entity, "delete"))
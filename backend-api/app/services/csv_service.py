@@ -8,6 +8,7 @@ from decimal import Decimal
 import csv
 from sqlalchemy.orm import Session
 from app.models import Transaction, Category
+from app.services import duplicate_service, transaction_service
 
 
 def export_transactions_to_csv(
@@ -69,7 +70,8 @@ def import_transactions_from_csv(
     db: Session,
     file_content: bytes,
     user_id: int,
-    categories: Dict[str, Category]  # category_name -> Category
+    categories: Dict[str, Category],  # category_name -> Category
+    duplicate_mode: str = "skip"
 ) -> Dict[str, Any]:
     """
     CSV 파일에서 거래 내역을 읽어서 데이터베이스에 저장
@@ -79,9 +81,10 @@ def import_transactions_from_csv(
         file_content: CSV 파일 바이트
         user_id: 사용자 ID
         categories: 카테고리 딕셔너리 (category_name -> Category)
+        duplicate_mode: 이미 등록된 거래와 같은 행 처리 (skip: 건너뜀, flag: 등록 후 보고, allow: 확인 안 함)
     
     Returns:
-        Dict: {"success": int, "failed": int, "errors": List[str]}
+        Dict: {"success": int, "failed": int, "errors": List[str], "duplicates": List[dict]}
     """
     # BOM 제거 및 UTF-8 디코딩
     if file_content.startswith(b'\xef\xbb\xbf'):
@@ -97,7 +100,7 @@ def import_transactions_from_csv(
     
     reader = csv.reader(StringIO(text))
     
-    success_count = 0
+    parsed_rows = []
     failed_count = 0
     errors = []
     
@@ -146,17 +149,13 @@ def import_transactions_from_csv(
             
             description = row[4].strip() if len(row) > 4 and row[4] else None
             
-            # 거래 내역 생성
-            transaction = Transaction(
-                user_id=user_id,
-                category_id=category.id,
-                type=transaction_type,
-                amount=Decimal(str(amount)),
-                description=description,
-                transaction_date=transaction_date
-            )
-            db.add(transaction)
-            success_count += 1
+            parsed_rows.append((row_idx, {
+                "category_id": category.id,
+                "type": transaction_type,
+                "amount": Decimal(str(amount)),
+                "description": description,
+                "transaction_date": transaction_date,
+            }))
             
         except Exception as e:
             failed_count += 1
@@ -164,6 +163,10 @@ def import_transactions_from_csv(
             errors.append(error_msg)
             continue
     
+    # 이미 등록된 거래와 같은 행 확인 (묶음 단위 조회) 후 INSERT 한 번으로 추가
+    result = duplicate_service.new_rows(db, user_id, parsed_rows, duplicate_mode)
+    success_count = len(transaction_service.insert_transactions(db, user_id, result["rows"]))
+    
     # 변경사항 저장
     if success_count > 0:
         db.commit()
@@ -171,7 +174,8 @@ def import_transactions_from_csv(
     return {
         "success": success_count,
         "failed": failed_count,
-        "errors": errors
+        "errors": errors,
+        "duplicates": result["duplicates"]
     }
 
 
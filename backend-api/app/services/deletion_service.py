@@ -0,0 +1,224 @@
+"""
+대량 삭제
+
+거래를 DELETE_CHUNK_SIZE개씩 나눠, 청크마다 짧은 쓰기 트랜잭션 하나로 태그 연결
+(transaction_tags), 첨부파일, 이상 거래 기록, 거래를 함께 지우고 바로 커밋한다.
+분류 모델 카운트와 금액 통계도 같은 트랜잭션에서 지운 거래만큼 뺀다.
+SQLite는 쓰기 잠금이 데이터베이스 전체에 걸리므로 한 번에 지우면 그동안 다른 사용자의
+쓰기가 모두 기다리지만, 청크 사이에는 잠금이 풀려 다른 요청이 끼어들 수 있다.
+거래를 메모리에 올리지 않으므로 카테고리 삭제도 하위 거래를 이 방식으로 먼저 지운다.
+
+첨부파일의 디스크 파일은 행을 지우는 트랜잭션에서 pending_file_deletions에 기록만 하고,
+커밋 후 백그라운드 스레드가 지운다. ORM으로 첨부파일을 지우는 경로(단건/일괄 거래 삭제,
+첨부파일 삭제)도 매퍼 이벤트로 같은 대기열을 쓴다.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Budget, BudgetAlert, Category, PendingFileDeletion, Transaction, TransactionAttachment,
+    transaction_tag_association,
+)
+from app.services import anomaly_service, budget_alert_service, category_classifier, change_service, learned_classifier
+
+logger = logging.getLogger(__name__)
+
+# 한 번의 쓰기 트랜잭션에서 지울 거래 수
+DELETE_CHUNK_SIZE = int(os.getenv("DELETE_CHUNK_SIZE", "500"))
+# 파일 정리 시 한 번에 처리할 대기열 행 수
+FILE_CLEANUP_BATCH_SIZE = 200
+
+_transactions = Transaction.__table__
+_transaction_tags = transaction_tag_association
+_attachments = TransactionAttachment.__table__
+_budgets = Budget.__table__
+_alerts = BudgetAlert.__table__
+_categories = Category.__table__
+_pending = PendingFileDeletion.__table__
+
+
+# ---------------------------------------------------------------------------
+# 거래 / 카테고리 삭제
+# ---------------------------------------------------------------------------
+
+def _delete_chunk(db: Session, transaction_ids: List[int]) -> List[int]:
+    """거래 한 청크와 딸린 행 삭제, 삭제된 첨부파일 ID 반환"""
+    connection = db.connection()
+    queued = connection.execute(insert(_pending).from_select(
+        ["file_path"],
+        select(_attachments.c.file_path).where(_attachments.c.transaction_id.in_(transaction_ids)),
+    )).rowcount
+    if queued:
+        db.info["file_cleanup"] = True
+    attachment_ids = connection.execute(
+        delete(_attachments).where(_attachments.c.transaction_id.in_(transaction_ids)).returning(_attachments.c.id)
+    ).scalars().all()
+    connection.execute(delete(_transaction_tags).where(_transaction_tags.c.transaction_id.in_(transaction_ids)))
+    connection.execute(delete(_transactions).where(_transactions.c.id.in_(transaction_ids)))
+    return attachment_ids
+
+
+def delete_transactions(db: Session, user_id: int, *conditions) -> int:
+    """
+    조건에 맞는 사용자 거래를 청크 단위로 삭제 (청크마다 커밋)
+
+    매퍼 이벤트를 거치지 않으므로 변경 로그, 분류 모델 카운트, 금액 통계는 청크마다
+    지운 거래만큼 반영하고, 예산 알림은 모두 지운 뒤 삭제된 지출의 달만 다시 평가한다.
+
+    Args:
+        conditions: Transaction 컬럼 조건 (user_id 조건은 자동으로 붙음)
+
+    Returns:
+        삭제된 거래 수
+    """
+    deleted = 0
+    months = set()
+    last_id = 0
+    while True:
+        # ID 순으로 이어서 읽어 이미 지운 구간을 다시 훑지 않음
+        rows = db.execute(
+            select(
+                _transactions.c.id, _transactions.c.type, _transactions.c.transaction_date,
+                _transactions.c.category_id, _transactions.c.description, _transactions.c.amount,
+            )
+            .where(_transactions.c.user_id == user_id, _transactions.c.id > last_id, *conditions)
+            .order_by(_transactions.c.id)
+            .limit(DELETE_CHUNK_SIZE)
+        ).all()
+        if not rows:
+            break
+        transaction_ids = [row.id for row in rows]
+        last_id = transaction_ids[-1]
+        months.update(row.transaction_date.strftime('%Y-%m') for row in rows if row.type == 'expense')
+
+        # 매퍼 after_delete 이벤트의 역연산을 청크 단위로 적용
+        learned_classifier.apply_bulk(db, user_id, [(row.category_id, row.description) for row in rows], -1)
+        anomaly_service.forget_bulk(db, user_id, [row._asdict() for row in rows])
+        attachment_ids = _delete_chunk(db, transaction_ids)
+        change_service.record_bulk(db, user_id, "transaction", transaction_ids, "delete")
+        change_service.record_bulk(db, user_id, "transaction_attachment", attachment_ids, "delete")
+        db.commit()
+        deleted += len(transaction_ids)
+
+    if deleted:
+        budget_alert_service.evaluate(db, user_id, months)
+        db.commit()
+    return deleted
+
+
+def delete_categories(db: Session, user_id: int, category_ids: Iterable[int]) -> int:
+    """
+    카테고리와 딸린 거래/예산 삭제
+
+    거래는 delete_transactions()로 청크 단위로 먼저 지우고, 예산과 카테고리는
+    마지막 트랜잭션 하나에서 지운다.
+
+    Returns:
+        삭제된 카테고리 수
+    """
+    category_ids = list(category_ids)
+    if not category_ids:
+        return 0
+    delete_transactions(db, user_id, _transactions.c.category_id.in_(category_ids))
+
+    connection = db.connection()
+    budget_ids = connection.execute(
+        delete(_budgets).where(_budgets.c.user_id == user_id, _budgets.c.category_id.in_(category_ids))
+        .returning(_budgets.c.id)
+    ).scalars().all()
+    if budget_ids:
+        connection.execute(delete(_alerts).where(_alerts.c.budget_id.in_(budget_ids)))
+    deleted = connection.execute(
+        delete(_categories).where(_categories.c.user_id == user_id, _categories.c.id.in_(category_ids))
+    ).rowcount
+    change_service.record_bulk(db, user_id, "budget", budget_ids, "delete")
+    change_service.record_bulk(db, user_id, "category", category_ids, "delete")
+    db.commit()
+    # 일괄 삭제는 매퍼 이벤트가 발생하지 않으므로 분류기 캐시를 직접 무효화
+    category_classifier.invalidate(user_id)
+    return deleted
+
+
+# ---------------------------------------------------------------------------
+# 첨부파일 정리
+# ---------------------------------------------------------------------------
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+@event.listens_for(TransactionAttachment, "after_delete")
+def _on_attachment_delete(mapper, connection, target):
+    connection.execute(insert(_pending).values(file_path=target.file_path))
+    session = Session.object_session(target)
+    if session is not None:
+        session.info["file_cleanup"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    if session.info.pop("file_cleanup", False):
+        schedule_file_cleanup()
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("file_cleanup", None)
+
+
+def drain_pending_files(db: Session) -> int:
+    """대기 중인 첨부파일을 디스크에서 지우고 대기열에서 삭제, 처리한 수 반환"""
+    processed = 0
+    while True:
+        rows = db.execute(
+            select(_pending.c.id, _pending.c.file_path).order_by(_pending.c.id).limit(FILE_CLEANUP_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return processed
+        for row in rows:
+            try:
+                os.remove(row.file_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # 지울 수 없는 파일 때문에 대기열이 막히지 않도록 기록만 남기고 넘어감
+                logger.warning("첨부파일 삭제 실패: %s (%s)", row.file_path, e)
+        db.execute(delete(_pending).where(_pending.c.id.in_([row.id for row in rows])))
+        db.commit()
+        processed += len(rows)
+
+
+def _run_file_cleanup() -> None:
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        drain_pending_files(db)
+    except Exception:
+        logger.exception("첨부파일 정리 중 오류")
+    finally:
+        db.close()
+
+
+def schedule_file_cleanup() -> None:
+    """대기 중인 첨부파일 삭제를 백그라운드 스레드에 맡김"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-cleanup")
+        _executor.submit(_run_file_cleanup)
+
+
+def shutdown(wait: bool = True) -> None:
+    """정리 스레드 종료"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
@@ -0,0 +1,130 @@
+"""
+중복 거래 확인
+
+거래마다 (거래일, 금액, 정규화한 설명)의 지문(fingerprint)을 저장하고
+(user_id, fingerprint) 인덱스로 찾는다. 설명은 유니코드 정규화(NFKC) 후 소문자로
+바꾸고 공백/기호를 지워 은행 명세서마다 다른 표기 차이를 흡수한다.
+
+가져오기는 묶음(DUPLICATE_BATCH_SIZE)마다 지문 IN 조회 한 번으로 기존 거래 수를
+세므로, 행마다 조회하지 않는다. 같은 날 같은 금액의 거래가 실제로 여러 건일 수 있어
+개수 단위로 비교한다 - 기존에 2건 있고 파일에 3건 있으면 1건만 새 거래로 본다.
+"""
+import hashlib
+import re
+import unicodedata
+from collections import Counter
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, event, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Transaction
+
+# 가져오기 중복 처리 방식
+DUPLICATE_MODES = ("skip", "flag", "allow")
+
+# 지문 조회 한 번에 넣을 행 수
+DUPLICATE_BATCH_SIZE = 1000
+
+_SEPARATORS = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_description(description: Optional[str]) -> str:
+    """설명 정규화 (NFKC, 소문자, 공백/기호 제거)"""
+    if not description:
+        return ""
+    return _SEPARATORS.sub("", unicodedata.normalize("NFKC", description).lower())
+
+
+def fingerprint(transaction_date: date, amount: Any, description: Optional[str]) -> str:
+    """거래 지문 - 거래일, 금액(소수 둘째 자리), 정규화한 설명의 해시 (16자)"""
+    amount = Decimal(str(amount)).quantize(Decimal("0.01"))
+    key = f"{transaction_date.isoformat()}|{amount}|{normalize_description(description)}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+
+@event.listens_for(Transaction, "before_insert")
+@event.listens_for(Transaction, "before_update")
+def _set_fingerprint(mapper, connection, target):
+    target.fingerprint = fingerprint(target.transaction_date, target.amount, target.description)
+
+
+def _existing_counts(db: Session, user_id: int, fingerprints: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+    """지문별 (기존 거래 수, 가장 작은 거래 ID)"""
+    fingerprints = list(fingerprints)
+    if not fingerprints:
+        return {}
+    rows = db.query(Transaction.fingerprint, func.count(), func.min(Transaction.id)).filter(
+        Transaction.user_id == user_id,
+        Transaction.fingerprint.in_(fingerprints)
+    ).group_by(Transaction.fingerprint)
+    return {value: (count, first_id) for value, count, first_id in rows}
+
+
+def new_rows(
+    db: Session,
+    user_id: int,
+    rows: List[Tuple[int, Dict[str, Any]]],
+    mode: str = "skip"
+) -> Dict[str, Any]:
+    """
+    가져오기 행 중 추가할 거래 값 고르기 (추가는 호출한 쪽에서)
+
+    Args:
+        rows: (파일 행 번호, 거래 값 {"transaction_date", "amount", "description", ...}) 목록
+        mode: skip - 중복 건너뜀 / flag - 모두 추가하고 중복 행 보고 / allow - 확인하지 않음
+
+    Returns:
+        {"rows": [추가할 거래 값], "duplicates": [{"row", "existing_transaction_id"}]}
+    """
+    if mode == "allow":
+        return {"rows": [values for _, values in rows], "duplicates": []}
+
+    existing: Dict[str, Tuple[int, int]] = {}
+    seen: Counter = Counter()
+    added = []
+    duplicates = []
+    for start in range(0, len(rows), DUPLICATE_BATCH_SIZE):
+        batch = [
+            (row_number, values, fingerprint(values["transaction_date"], values["amount"], values["description"]))
+            for row_number, values in rows[start:start + DUPLICATE_BATCH_SIZE]
+        ]
+        unknown = {value for _, _, value in batch if value not in existing}
+        found = _existing_counts(db, user_id, unknown)
+        for value in unknown:
+            existing[value] = found.get(value, (0, None))
+
+        for row_number, values, value in batch:
+            seen[value] += 1
+            count, first_id = existing[value]
+            if seen[value] <= count:
+                duplicates.append({"row": row_number, "existing_transaction_id": first_id})
+                if mode == "skip":
+                    continue
+            added.append(values)
+    return {"rows": added, "duplicates": duplicates}
+
+
+def backfill(db: Session) -> int:
+    """지문이 없는 거래에 지문 채우기 (마이그레이션용), 채운 행 수 반환"""
+    table = Transaction.__table__
+    updated = 0
+    while True:
+        rows = db.execute(
+            select(table.c.id, table.c.transaction_date, table.c.amount, table.c.description)
+            .where(table.c.fingerprint.is_(None))
+            .limit(DUPLICATE_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return updated
+        db.execute(
+            update(table).where(table.c.id == bindparam("row_id")).values(fingerprint=bindparam("value")),
+            [
+                {"row_id": row.id, "value": fingerprint(row.transaction_date, row.amount, row.description)}
+                for row in rows
+            ],
+        )
+        db.commit()
+        updated += len(rows)
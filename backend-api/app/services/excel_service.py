@@ -11,6 +11,7 @@ from openpyxl.styles import Font, Alignment, PatternFill
 from openpyxl.utils import get_column_letter
 from sqlalchemy.orm import Session
 from app.models import Transaction, Category
+from app.services import duplicate_service, transaction_service
 
 
 def export_transactions_to_excel(
@@ -109,7 +110,8 @@ def import_transactions_from_excel(
     db: Session,
     file_content: bytes,
     user_id: int,
-    categories: Dict[str, Category]  # category_name -> Category
+    categories: Dict[str, Category],  # category_name -> Category
+    duplicate_mode: str = "skip"
 ) -> Dict[str, Any]:
     """
     엑셀 파일에서 거래 내역을 읽어서 데이터베이스에 저장
@@ -119,16 +121,17 @@ def import_transactions_from_excel(
         file_content: 엑셀 파일 바이트
         user_id: 사용자 ID
         categories: 카테고리 딕셔너리 (category_name -> Category)
+        duplicate_mode: 이미 등록된 거래와 같은 행 처리 (skip: 건너뜀, flag: 등록 후 보고, allow: 확인 안 함)
     
     Returns:
-        Dict: {"success": int, "failed": int, "errors": List[str]}
+        Dict: {"success": int, "failed": int, "errors": List[str], "duplicates": List[dict]}
     """
     from openpyxl import load_workbook
     
     wb = load_workbook(BytesIO(file_content), data_only=True)
     ws = wb.active
     
-    success_count = 0
+    parsed_rows = []
     failed_count = 0
     errors = []
     
@@ -181,17 +184,13 @@ def import_transactions_from_excel(
             
             description = str(row[4]).strip() if row[4] else None
             
-            # 거래 내역 생성
-            transaction = Transaction(
-                user_id=user_id,
-                category_id=category.id,
-                type=transaction_type,
-                amount=Decimal(str(amount)),
-                description=description,
-                transaction_date=transaction_date
-            )
-            db.add(transaction)
-            success_count += 1
+            parsed_rows.append((row_idx, {
+                "category_id": category.id,
+                "type": transaction_type,
+                "amount": Decimal(str(amount)),
+                "description": description,
+                "transaction_date": transaction_date,
+            }))
             
         except Exception as e:
             failed_count += 1
@@ -199,6 +198,10 @@ def import_transactions_from_excel(
             errors.append(error_msg)
             continue
     
+    # 이미 등록된 거래와 같은 행 확인 (묶음 단위 조회) 후 INSERT 한 번으로 추가
+    result = duplicate_service.new_rows(db, user_id, parsed_rows, duplicate_mode)
+    success_count = len(transaction_service.insert_transactions(db, user_id, result["rows"]))
+    
     # 변경사항 저장
     if success_count > 0:
         db.commit()
@@ -206,7 +209,8 @@ def import_transactions_from_excel(
     return {
         "success": success_count,
         "failed": failed_count,
-        "errors": errors
+        "errors": errors,
+        "duplicates": result["duplicates"]
     }
 
 
@@ -0,0 +1,163 @@
+"""
+요청 재시도 중복 방지
+
+- Idempotency-Key: 클라이언트가 요청마다 고유 키를 헤더로 보내면 처음 처리한 응답을
+  (사용자, 키)로 저장해 두고, 같은 키로 다시 오면 처리하지 않고 저장된 응답을 돌려준다.
+  같은 키로 내용이 다른 요청은 422, 아직 처리 중이면 409.
+  키는 IDEMPOTENCY_TTL_HOURS 뒤에 정리된다.
+- 가져오기 파일: 파일 내용의 SHA-256을 기록해 두고, 같은 파일을 다시 올리면 행을
+  하나도 처리하지 않고 기본 키 조회 한 번으로 알려 준다.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models import IdempotencyKey, ImportedFile
+
+# 완료된 키 보관 시간
+IDEMPOTENCY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_TTL_HOURS", "24"))
+# 처리 중 표시 유지 시간 (서버가 처리 도중 종료되면 이 시간 뒤 같은 키로 다시 처리 가능)
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "600"))
+
+# 저장된 응답을 돌려줄 때 붙이는 헤더
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+_keys = IdempotencyKey.__table__
+
+
+def request_hash(*parts: Any) -> bytes:
+    """요청 내용 해시 (경로, 본문 등)"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.digest()
+
+
+def _begin(db: Session, user_id: int, key: str, fingerprint: bytes) -> Optional[Tuple[int, str]]:
+    """키 선점 - 처음 온 요청이면 None, 이미 처리된 요청이면 (상태 코드, 응답 본문)"""
+    now = datetime.utcnow()
+    db.execute(delete(_keys).where(_keys.c.expires_at < now))
+    inserted = db.execute(
+        sqlite_insert(_keys).values(
+            user_id=user_id,
+            key=key,
+            request_hash=fingerprint,
+            expires_at=now + timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS),
+        ).on_conflict_do_nothing()
+    ).rowcount
+    if inserted:
+        db.commit()
+        return None
+
+    row = db.execute(
+        select(_keys.c.request_hash, _keys.c.status_code, _keys.c.response_body).where(
+            _keys.c.user_id == user_id, _keys.c.key == key
+        )
+    ).one()
+    db.commit()
+    if row.request_hash != fingerprint:
+        raise HTTPException(status_code=422, detail="다른 요청에 이미 사용된 Idempotency-Key입니다")
+    if row.status_code is None:
+        raise HTTPException(status_code=409, detail="같은 Idempotency-Key의 요청을 처리 중입니다")
+    return row.status_code, row.response_body
+
+
+def _release(db: Session, user_id: int, key: str) -> None:
+    db.rollback()
+    db.execute(delete(_keys).where(_keys.c.user_id == user_id, _keys.c.key == key))
+    db.commit()
+
+
+def _complete(db: Session, user_id: int, key: str, status_code: int, body: Any) -> None:
+    db.execute(
+        update(_keys).where(_keys.c.user_id == user_id, _keys.c.key == key).values(
+            status_code=status_code,
+            response_body=json.dumps(body, ensure_ascii=False, separators=(",", ":")),
+            expires_at=datetime.utcnow() + timedelta(hours=IDEMPOTENCY_TTL_HOURS),
+        )
+    )
+    db.commit()
+
+
+def run(
+    db: Session,
+    user_id: int,
+    key: Optional[str],
+    fingerprint: bytes,
+    handler: Callable[[], Any],
+    status_code: int = 200
+) -> Any:
+    """
+    Idempotency-Key가 있으면 한 번만 처리하고 응답을 저장
+
+    Args:
+        key: Idempotency-Key 헤더 값 (없으면 handler 결과를 그대로 반환)
+        fingerprint: request_hash()로 만든 요청 해시
+        handler: 실제 처리 (응답 본문 반환) - 예외가 나면 키를 풀어 다시 시도할 수 있게 함
+        status_code: 성공 응답 상태 코드
+    """
+    if not key:
+        return handler()
+
+    stored = _begin(db, user_id, key, fingerprint)
+    if stored is not None:
+        stored_status, stored_body = stored
+        return JSONResponse(
+            status_code=stored_status,
+            content=json.loads(stored_body),
+            headers={REPLAYED_HEADER: "true"},
+        )
+
+    try:
+        body = jsonable_encoder(handler())
+    except Exception:
+        _release(db, user_id, key)
+        raise
+    _complete(db, user_id, key, status_code, body)
+    return JSONResponse(status_code=status_code, content=body)
+
+
+def file_hash(content: bytes) -> bytes:
+    """가져오기 파일 내용 해시"""
+    return hashlib.sha256(content).digest()
+
+
+def find_imported_file(db: Session, user_id: int, target: str, content_hash: bytes) -> Optional[ImportedFile]:
+    """같은 내용의 파일을 이미 가져왔는지 조회"""
+    return db.get(ImportedFile, (user_id, target, content_hash))
+
+
+def record_imported_file(
+    db: Session,
+    user_id: int,
+    target: str,
+    content_hash: bytes,
+    file_name: Optional[str],
+    success: int,
+    failed: int
+) -> None:
+    """가져오기 완료 기록 (다시 가져온 경우 결과 갱신)"""
+    stmt = sqlite_insert(ImportedFile.__table__).values(
+        user_id=user_id,
+        target=target,
+        content_hash=content_hash,
+        file_name=file_name,
+        success=success,
+        failed=failed,
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["user_id", "target", "content_hash"],
+        set_={"file_name": stmt.excluded.file_name, "success": stmt.excluded.success,
+              "failed": stmt.excluded.failed, "created_at": stmt.excluded.created_at},
+    ))
+    db.commit()
@@ -0,0 +1,421 @@
+"""
+사용자별 학습형 카테고리 분류기 (다항 나이브 베이즈, 문자 n-gram)
+
+사용자가 직접 분류한 거래 내역(설명 -> 카테고리)으로 학습한다. 학습 결과는
+희소 카운트 테이블 두 개에 저장된다.
+
+- classifier_category_stats: 카테고리별 학습 문서 수와 특징 등장 횟수 합계
+- classifier_feature_counts: (특징, 카테고리)별 등장 횟수 (0이 아닌 항목만)
+
+거래가 생성/수정/삭제되면 매퍼 이벤트에서 증감을 모아 두었다가 플러시가
+끝날 때 카테고리마다 한 번씩 기록하므로 전체를 다시 학습할 필요가 없다. Core로
+일괄 처리하는 경로는 `apply_bulk()`로 같은 증감을 한 번에 반영하고, `rebuild()`는
+CLI에서 전체를 다시 학습할 때만 쓴다.
+
+메모리에는 사용자별로 특징 -> {카테고리: 횟수} 형태의 모델을 캐시하며,
+예측은 설명에 포함된 특징 수에 비례하는 시간만 든다.
+"""
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Integer, delete, event, func, inspect, literal, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models import Transaction, ClassifierCategoryStat, ClassifierFeatureCount
+
+# 예측을 채택할 최소 신뢰도 (미만이면 키워드 분류로 대체)
+CLASSIFIER_MIN_CONFIDENCE = float(os.getenv("CLASSIFIER_MIN_CONFIDENCE", "0.6"))
+# 모델을 사용하기 위한 최소 학습 거래 수 (해당 유형 카테고리 기준)
+CLASSIFIER_MIN_DOCUMENTS = int(os.getenv("CLASSIFIER_MIN_DOCUMENTS", "10"))
+# 메모리 캐시 설정
+CLASSIFIER_CACHE_SIZE = int(os.getenv("CLASSIFIER_CACHE_SIZE", "128"))
+CLASSIFIER_CACHE_TTL_SECONDS = int(os.getenv("CLASSIFIER_CACHE_TTL_SECONDS", "600"))
+
+NGRAM_SIZES = (2, 3)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_DIGITS_RE = re.compile(r"\d")
+
+
+def extract_features(description: Optional[str]) -> Counter:
+    """설명을 문자 n-gram 빈도로 변환 (소문자화, 공백 정규화, 숫자는 0으로 통일)"""
+    if not description:
+        return Counter()
+    text = _WHITESPACE_RE.sub(" ", description.lower()).strip()
+    if not text:
+        return Counter()
+    padded = f" {_DIGITS_RE.sub('0', text)} "
+
+    features = Counter()
+    for size in NGRAM_SIZES:
+        for idx in range(len(padded) - size + 1):
+            gram = padded[idx:idx + size]
+            if gram.strip():
+                features[gram] += 1
+    return features
+
+
+class NaiveBayesModel:
+    """한 사용자의 나이브 베이즈 모델 (라플라스 평활, alpha=1)"""
+
+    def __init__(self):
+        self.doc_counts: Dict[int, int] = {}
+        self.feature_totals: Dict[int, int] = {}
+        self.features: Dict[str, Dict[int, int]] = {}
+        self.loaded_at = time.monotonic()
+
+    def predict(self, features: Counter, candidates: Iterable[int]) -> Optional[Tuple[int, float, int]]:
+        """
+        후보 카테고리 중 가장 가능성 높은 카테고리 예측
+
+        Returns:
+            (카테고리 ID, 사후 확률, 후보들의 학습 문서 수 합계) 또는 None
+        """
+        candidates = list(candidates)
+        if not candidates or not features:
+            return None
+        if not any(feature in self.features for feature in features):
+            return None
+
+        documents = sum(self.doc_counts.get(c, 0) for c in candidates)
+        if documents == 0:
+            return None
+
+        vocabulary = max(1, len(self.features))
+        n_features = sum(features.values())
+        # alpha=1이면 본 적 없는 특징의 항 log(0 + 1)은 0이므로 등장한 특징만 더하면 됨
+        scores = {
+            c: math.log((self.doc_counts.get(c, 0) + 1) / (documents + len(candidates)))
+            - n_features * math.log(self.feature_totals.get(c, 0) + vocabulary)
+            for c in candidates
+        }
+        for feature, count in features.items():
+            row = self.features.get(feature)
+            if not row:
+                continue
+            for category_id, feature_count in row.items():
+                if category_id in scores:
+                    scores[category_id] += count * math.log(feature_count + 1)
+
+        best = max(scores, key=scores.get)
+        top = scores[best]
+        normalizer = sum(math.exp(score - top) for score in scores.values())
+        return best, 1.0 / normalizer, documents
+
+
+# ---------------------------------------------------------------------------
+# 저장 (희소 카운트 테이블)
+# ---------------------------------------------------------------------------
+
+def _write_delta(connection, user_id: int, category_id: int, features: Dict[str, int], documents: int) -> None:
+    """한 카테고리의 학습 문서 수/특징 횟수 증감 기록 (음수면 감소)"""
+    stats = ClassifierCategoryStat.__table__
+    counts = ClassifierFeatureCount.__table__
+    features = {feature: count for feature, count in features.items() if count}
+    if not features and not documents:
+        return
+
+    stmt = sqlite_insert(stats).values(
+        user_id=user_id,
+        category_id=category_id,
+        doc_count=documents,
+        feature_total=sum(features.values()),
+    )
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=[stats.c.user_id, stats.c.category_id],
+        set_={
+            "doc_count": stats.c.doc_count + stmt.excluded.doc_count,
+            "feature_total": stats.c.feature_total + stmt.excluded.feature_total,
+        },
+    ))
+
+    if features:
+        stmt = sqlite_insert(counts)
+        connection.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[counts.c.user_id, counts.c.feature, counts.c.category_id],
+                set_={"count": counts.c.count + stmt.excluded.count},
+            ),
+            [
+                {"user_id": user_id, "feature": feature, "category_id": category_id, "count": count}
+                for feature, count in features.items()
+            ],
+        )
+
+    if documents < 0 or any(count < 0 for count in features.values()):
+        # 0 이하가 된 항목은 저장하지 않음
+        connection.execute(delete(counts).where(
+            counts.c.user_id == user_id, counts.c.category_id == category_id, counts.c.count <= 0
+        ))
+        connection.execute(delete(stats).where(
+            stats.c.user_id == user_id, stats.c.category_id == category_id, stats.c.doc_count <= 0
+        ))
+
+
+def _record(session: Session, user_id: int, category_id: Optional[int], description: Optional[str], sign: int) -> None:
+    """증감을 세션에 모아 둠 (플러시가 끝나면 카테고리마다 한 번씩 기록)"""
+    features = extract_features(description)
+    if not features or category_id is None:
+        return
+    pending = session.info.setdefault("learned_classifier_pending", {})
+    documents, total = pending.get((user_id, category_id), (0, Counter()))
+    total.update({feature: count * sign for feature, count in features.items()})
+    pending[(user_id, category_id)] = (documents + sign, total)
+
+
+@event.listens_for(Transaction, "after_insert")
+def _on_transaction_insert(mapper, connection, target):
+    _record(Session.object_session(target), target.user_id, target.category_id, target.description, 1)
+
+
+@event.listens_for(Transaction, "after_update")
+def _on_transaction_update(mapper, connection, target):
+    state = inspect(target)
+    description_history = state.attrs.description.history
+    category_history = state.attrs.category_id.history
+    if not description_history.has_changes() and not category_history.has_changes():
+        return
+
+    old_description = description_history.deleted[0] if description_history.deleted else target.description
+    old_category_id = category_history.deleted[0] if category_history.deleted else target.category_id
+    session = Session.object_session(target)
+    _record(session, target.user_id, old_category_id, old_description, -1)
+    _record(session, target.user_id, target.category_id, target.description, 1)
+
+
+@event.listens_for(Transaction, "after_delete")
+def _on_transaction_delete(mapper, connection, target):
+    _record(Session.object_session(target), target.user_id, target.category_id, target.description, -1)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _after_flush_postexec(session, flush_context):
+    pending = session.info.pop("learned_classifier_pending", None)
+    if not pending:
+        return
+    connection = session.connection()
+    for (user_id, category_id), (documents, features) in pending.items():
+        _write_delta(connection, user_id, category_id, features, documents)
+    session.info.setdefault("learned_classifier_users", set()).update(user_id for user_id, _ in pending)
+
+
+def apply_bulk(db: Session, user_id: int, rows: Iterable[Tuple[Optional[int], Optional[str]]], sign: int) -> None:
+    """
+    Core로 일괄 처리한 거래의 카운트 증감 (매퍼 이벤트와 같은 결과, 커밋은 호출한 쪽에서)
+
+    카테고리마다 특징 횟수를 합쳐 한 번씩 기록한다.
+
+    Args:
+        rows: (카테고리 ID, 설명) 목록
+        sign: 1이면 학습 문서 추가, -1이면 제거
+    """
+    grouped: Dict[int, Tuple[int, Counter]] = {}
+    for category_id, description in rows:
+        features = extract_features(description)
+        if not features or category_id is None:
+            continue
+        documents, total = grouped.get(category_id, (0, Counter()))
+        total.update(features)
+        grouped[category_id] = (documents + 1, total)
+    if not grouped:
+        return
+
+    connection = db.connection()
+    for category_id, (documents, features) in grouped.items():
+        _write_delta(
+            connection, user_id, category_id,
+            {feature: count * sign for feature, count in features.items()}, documents * sign,
+        )
+    db.info.setdefault("learned_classifier_users", set()).add(user_id)
+
+
+# ---------------------------------------------------------------------------
+# 메모리 캐시
+# ---------------------------------------------------------------------------
+
+_models: "OrderedDict[int, NaiveBayesModel]" = OrderedDict()
+_models_lock = threading.Lock()
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    # 플러시 뒤(커밋 전)에 로드된 모델은 이미 변경이 반영돼 있어 증감을 다시 더하면
+    # 두 번 세게 되므로, 변경된 사용자의 모델은 버리고 다음 조회 때 테이블에서 읽음
+    with _models_lock:
+        for user_id in session.info.pop("learned_classifier_users", ()):
+            _models.pop(user_id, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("learned_classifier_pending", None)
+    session.info.pop("learned_classifier_users", None)
+
+
+def _load_model(db: Session, user_id: int) -> NaiveBayesModel:
+    model = NaiveBayesModel()
+    for category_id, doc_count, feature_total in db.query(
+        ClassifierCategoryStat.category_id,
+        ClassifierCategoryStat.doc_count,
+        ClassifierCategoryStat.feature_total,
+    ).filter(ClassifierCategoryStat.user_id == user_id):
+        model.doc_counts[category_id] = doc_count
+        model.feature_totals[category_id] = feature_total
+
+    features = model.features
+    for feature, category_id, count in db.query(
+        ClassifierFeatureCount.feature,
+        ClassifierFeatureCount.category_id,
+        ClassifierFeatureCount.count,
+    ).filter(ClassifierFeatureCount.user_id == user_id):
+        row = features.get(feature)
+        if row is None:
+            row = features[feature] = {}
+        row[category_id] = count
+    return model
+
+
+def get_model(db: Session, user_id: int) -> NaiveBayesModel:
+    """사용자 모델 조회 (캐시에 없거나 오래되면 테이블에서 로드)"""
+    with _models_lock:
+        model = _models.get(user_id)
+        if model is not None and time.monotonic() - model.loaded_at < CLASSIFIER_CACHE_TTL_SECONDS:
+            _models.move_to_end(user_id)
+            return model
+
+    model = _load_model(db, user_id)
+    with _models_lock:
+        _models[user_id] = model
+        _models.move_to_end(user_id)
+        while len(_models) > CLASSIFIER_CACHE_SIZE:
+            _models.popitem(last=False)
+    return model
+
+
+def invalidate(user_id: int) -> None:
+    """사용자 모델 캐시 무효화"""
+    with _models_lock:
+        _models.pop(user_id, None)
+
+
+def classify(
+    db: Session,
+    user_id: int,
+    description: str,
+    candidates: List[Tuple[int, str]],
+    min_confidence: Optional[float] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    학습된 모델로 카테고리 예측
+
+    Args:
+        candidates: 후보 카테고리 [(id, name)] - 보통 같은 거래 유형의 카테고리
+        min_confidence: 채택할 최소 신뢰도 (기본값 CLASSIFIER_MIN_CONFIDENCE)
+
+    Returns:
+        {"category_id", "category_name", "confidence"} - 학습 데이터가 부족하거나
+        신뢰도가 낮으면 None
+    """
+    if not description or not candidates:
+        return None
+    model = get_model(db, user_id)
+    prediction = model.predict(extract_features(description), (category_id for category_id, _ in candidates))
+    if prediction is None:
+        return None
+
+    category_id, confidence, documents = prediction
+    threshold = CLASSIFIER_MIN_CONFIDENCE if min_confidence is None else min_confidence
+    if documents < CLASSIFIER_MIN_DOCUMENTS or confidence < threshold:
+        return None
+
+    names = dict(candidates)
+    return {
+        "category_id": category_id,
+        "category_name": names[category_id],
+        "confidence": round(confidence, 4),
+    }
+
+
+def merge_categories(db: Session, user_id: int, category_id: int, source_category_ids: Iterable[int]) -> None:
+    """
+    카테고리 병합 시 원본 카테고리의 카운트를 대상 카테고리에 더하고 원본 행 삭제
+
+    테이블마다 INSERT ... SELECT ... ON CONFLICT 한 번과 DELETE 한 번으로 처리한다.
+    커밋은 호출한 쪽에서 하고, 커밋 후 invalidate()로 메모리 모델을 버려야 한다.
+    """
+    source_category_ids = list(source_category_ids)
+    for table, key, columns in (
+        (ClassifierCategoryStat.__table__, ["user_id", "category_id"], ["doc_count", "feature_total"]),
+        (ClassifierFeatureCount.__table__, ["user_id", "feature", "category_id"], ["count"]),
+    ):
+        group_columns = [table.c[name] for name in key if name != "category_id"]
+        sums = select(
+            *group_columns,
+            literal(category_id, Integer).label("category_id"),
+            *(func.sum(table.c[name]).label(name) for name in columns),
+        ).where(
+            table.c.user_id == user_id, table.c.category_id.in_(source_category_ids)
+        ).group_by(*group_columns)
+        stmt = sqlite_insert(table).from_select([column.name for column in group_columns] + ["category_id", *columns], sums)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=key,
+            set_={name: table.c[name] + stmt.excluded[name] for name in columns},
+        ))
+        db.execute(delete(table).where(table.c.user_id == user_id, table.c.category_id.in_(source_category_ids)))
+
+
+def rebuild(db: Session, user_id: int) -> Dict[str, int]:
+    """사용자의 거래 내역 전체로 카운트 테이블을 다시 만듦"""
+    stats: Dict[int, List[int]] = {}
+    counts: Counter = Counter()
+    for category_id, description in db.query(Transaction.category_id, Transaction.description).filter(
+        Transaction.user_id == user_id,
+        Transaction.description.isnot(None),
+    ).yield_per(2000):
+        features = extract_features(description)
+        if not features:
+            continue
+        entry = stats.setdefault(category_id, [0, 0])
+        entry[0] += 1
+        entry[1] += sum(features.values())
+        for feature, count in features.items():
+            counts[(feature, category_id)] += count
+
+    db.query(ClassifierFeatureCount).filter(ClassifierFeatureCount.user_id == user_id).delete(synchronize_session=False)
+    db.query(ClassifierCategoryStat).filter(ClassifierCategoryStat.user_id == user_id).delete(synchronize_session=False)
+    if stats:
+        db.execute(ClassifierCategoryStat.__table__.insert(), [
+            {"user_id": user_id, "category_id": category_id, "doc_count": doc_count, "feature_total": feature_total}
+            for category_id, (doc_count, feature_total) in stats.items()
+        ])
+    if counts:
+        db.execute(ClassifierFeatureCount.__table__.insert(), [
+            {"user_id": user_id, "feature": feature, "category_id": category_id, "count": count}
+            for (feature, category_id), count in counts.items()
+        ])
+    db.commit()
+    invalidate(user_id)
+    return {"documents": sum(entry[0] for entry in stats.values()), "features": len(counts)}
+
+
+def rebuild_all(db: Session) -> Dict[int, Dict[str, int]]:
+    """거래 내역이 있는 모든 사용자의 모델 재학습"""
+    user_ids = [row[0] for row in db.query(Transaction.user_id).distinct()]
+    return {user_id: rebuild(db, user_id) for user_id in user_ids}
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        for uid, result in rebuild_all(session).items():
+            print(f"사용자 {uid}: 거래 {result['documents']}건, 특징 {result['features']}개 학습")
+    finally:
+        session.close()
@@ -3,12 +3,17 @@
 """
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 from sqlalchemy.orm import Session
 from sqlalchemy import func, extract
 from app.models import Transaction, Category
 
 
+def _predicted_amount(value: Decimal) -> Decimal:
+    """예측 금액 - 음수는 0으로, 소수 셋째 자리에서 반올림"""
+    return max(value, Decimal('0')).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
 def predict_next_month_expense(
     db: Session,
     user_id: int,
@@ -51,7 +56,7 @@ def predict_next_month_expense(
         avg_expense = db.query(func.avg(Transaction.amount)).filter(
             Transaction.user_id == user_id,
             Transaction.type == 'expense'
-        ).scalar() or 0
+        ).scalar() or Decimal('0')
         
         # 월별 평균 거래 건수 추정
         count = db.query(func.count(Transaction.id)).filter(
@@ -59,10 +64,10 @@ def predict_next_month_expense(
             Transaction.type == 'expense'
         ).scalar() or 0
         
-        estimated_monthly = float(avg_expense) * max(count / max(months_back, 1), 1)
+        estimated_monthly = avg_expense * max(Decimal(count) / max(months_back, 1), 1)
         
         return {
-            'predicted_total': estimated_monthly,
+            'predicted_total': _predicted_amount(estimated_monthly),
             'predicted_by_category': [],
             'method': 'average',
             'confidence': 0.3
@@ -72,10 +77,10 @@ def predict_next_month_expense(
     # y = ax + b 형태로 예측
     n = len(monthly_expenses)
     x_values = list(range(n))
-    y_values = [float(row.total) if row.total else 0 for row in monthly_expenses]
+    y_values = [row.total or Decimal('0') for row in monthly_expenses]
     
-    # 평균 계산
-    x_mean = sum(x_values) / n
+    # 평균 계산 (금액은 Decimal 그대로)
+    x_mean = Decimal(sum(x_values)) / n
     y_mean = sum(y_values) / n
     
     # 기울기와 절편 계산
@@ -92,29 +97,37 @@ def predict_next_month_expense(
         
         # 다음 달 예측 (x = n)
         predicted = slope * n + intercept
-        confidence = min(0.9, max(0.3, 1.0 - abs(slope) / max(y_mean, 1) * 10))
+        confidence = min(0.9, max(0.3, 1.0 - float(abs(slope) / max(y_mean, 1)) * 10))
     
     # 카테고리별 예측
     category_predictions = []
     
-    category_expenses = db.query(
-        Category.id,
-        Category.name,
-        Category.color,
+    # 거래를 먼저 (카테고리, 연, 월)별로 집계한 뒤 카테고리 정보를 붙임 (월 순서 유지)
+    category_totals = db.query(
+        Transaction.category_id.label('category_id'),
         extract('year', Transaction.transaction_date).label('year'),
         extract('month', Transaction.transaction_date).label('month'),
         func.sum(Transaction.amount).label('total')
-    ).join(
-        Transaction, Category.id == Transaction.category_id
     ).filter(
         Transaction.user_id == user_id,
         Transaction.type == 'expense',
         Transaction.transaction_date >= start_date,
         Transaction.transaction_date <= end_date
     ).group_by(
-        Category.id, Category.name, Category.color,
+        Transaction.category_id,
         extract('year', Transaction.transaction_date),
         extract('month', Transaction.transaction_date)
+    ).subquery()
+
+    category_expenses = db.query(
+        Category.id,
+        Category.name,
+        Category.color,
+        category_totals.c.total
+    ).join(
+        category_totals, Category.id == category_totals.c.category_id
+    ).order_by(
+        category_totals.c.category_id, category_totals.c.year, category_totals.c.month
     ).all()
     
     # 카테고리별로 그룹화
@@ -127,7 +140,7 @@ def predict_next_month_expense(
                 'color': row.color,
                 'amounts': []
             }
-        category_monthly[cat_id]['amounts'].append(float(row.total) if row.total else 0)
+        category_monthly[cat_id]['amounts'].append(row.total or Decimal('0'))
     
     # 각 카테고리별 예측
     for cat_id, data in category_monthly.items():
@@ -136,7 +149,7 @@ def predict_next_month_expense(
             # 선형 회귀
             x_cat = list(range(len(amounts)))
             y_cat = amounts
-            x_mean_cat = sum(x_cat) / len(x_cat)
+            x_mean_cat = Decimal(sum(x_cat)) / len(x_cat)
             y_mean_cat = sum(y_cat) / len(y_cat)
             
             num_cat = sum((x_cat[i] - x_mean_cat) * (y_cat[i] - y_mean_cat) for i in range(len(x_cat)))
@@ -149,17 +162,17 @@ def predict_next_month_expense(
             else:
                 predicted_cat = y_mean_cat
         else:
-            predicted_cat = sum(amounts) / len(amounts) if amounts else 0
+            predicted_cat = sum(amounts) / len(amounts) if amounts else Decimal('0')
         
         category_predictions.append({
             'category_id': cat_id,
             'category_name': data['name'],
             'color': data['color'],
-            'predicted_amount': max(0, predicted_cat)
+            'predicted_amount': _predicted_amount(predicted_cat)
         })
     
     return {
-        'predicted_total': max(0, predicted),
+        'predicted_total': _predicted_amount(predicted),
         'predicted_by_category': category_predictions,
         'method': 'linear_regression',
         'confidence': confidence,
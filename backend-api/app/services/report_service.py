@@ -5,8 +5,9 @@ from typing import Dict, Any, List
 from datetime import datetime, date
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from sqlalchemy import func
 from app.models import Transaction, Category
+from app.services.statistics_service import TRANSACTION_TYPES, month_range
 
 
 def generate_monthly_report(
@@ -28,47 +29,55 @@ def generate_monthly_report(
         리포트 데이터
     """
     # 월별 수입/지출 합계
+    start, end = month_range(year, month)
     monthly_stats = db.query(
         Transaction.type,
         func.sum(Transaction.amount).label('total'),
-        func.count(Transaction.id).label('count')
+        func.count().label('count')
     ).filter(
         Transaction.user_id == user_id,
-        extract('year', Transaction.transaction_date) == year,
-        extract('month', Transaction.transaction_date) == month
+        Transaction.type.in_(TRANSACTION_TYPES),
+        Transaction.transaction_date >= start,
+        Transaction.transaction_date <= end
     ).group_by(Transaction.type).all()
     
-    income = 0
-    expense = 0
+    income = Decimal('0')
+    expense = Decimal('0')
     income_count = 0
     expense_count = 0
     
     for stat in monthly_stats:
         if stat.type == 'income':
-            income = float(stat.total) if stat.total else 0
+            income = stat.total or Decimal('0')
             income_count = stat.count
         elif stat.type == 'expense':
-            expense = float(stat.total) if stat.total else 0
+            expense = stat.total or Decimal('0')
             expense_count = stat.count
     
     balance = income - expense
     
-    # 카테고리별 상세 내역
+    # 카테고리별 상세 내역 - 거래를 먼저 (카테고리, 타입)별로 집계한 뒤 카테고리 정보를 붙임
+    totals = db.query(
+        Transaction.category_id.label('category_id'),
+        Transaction.type.label('type'),
+        func.sum(Transaction.amount).label('total'),
+        func.count().label('count')
+    ).filter(
+        Transaction.user_id == user_id,
+        Transaction.type.in_(TRANSACTION_TYPES),
+        Transaction.transaction_date >= start,
+        Transaction.transaction_date <= end
+    ).group_by(Transaction.category_id, Transaction.type).subquery()
+
     category_details = db.query(
         Category.id,
         Category.name,
         Category.color,
-        Transaction.type,
-        func.sum(Transaction.amount).label('total'),
-        func.count(Transaction.id).label('count')
+        totals.c.type,
+        totals.c.total,
+        totals.c.count
     ).join(
-        Transaction, Category.id == Transaction.category_id
-    ).filter(
-        Transaction.user_id == user_id,
-        extract('year', Transaction.transaction_date) == year,
-        extract('month', Transaction.transaction_date) == month
-    ).group_by(
-        Category.id, Category.name, Category.color, Transaction.type
+        totals, Category.id == totals.c.category_id
     ).all()
     
     category_breakdown = []
@@ -78,15 +87,15 @@ def generate_monthly_report(
             'category_name': detail.name,
             'color': detail.color,
             'type': detail.type,
-            'total': float(detail.total) if detail.total else 0,
+            'total': detail.total or Decimal('0'),
             'count': detail.count
         })
     
     # 거래 내역 목록
     transactions = db.query(Transaction).filter(
         Transaction.user_id == user_id,
-        extract('year', Transaction.transaction_date) == year,
-        extract('month', Transaction.transaction_date) == month
+        Transaction.transaction_date >= start,
+        Transaction.transaction_date <= end
     ).order_by(Transaction.transaction_date.desc()).all()
     
     transaction_list = []
@@ -104,7 +113,7 @@ def generate_monthly_report(
             'id': t.id,
             'date': t.transaction_date.isoformat(),
             'type': t.type,
-            'amount': float(t.amount),
+            'amount': t.amount,
             'description': t.description,
             'category_id': t.category_id,
             'category_name': category.name if category else '알 수 없음'
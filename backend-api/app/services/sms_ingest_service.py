@@ -0,0 +1,340 @@
+"""
+카드 승인/은행 입출금 문자 일괄 수집 서비스
+
+카드사/은행별 문자 형식을 모듈 로드 시 정규식으로 컴파일해 두고, 붙여 넣은
+문자 묶음을 한 번에 파싱한다. (금액, 승인 시각, 가맹점) 해시로 이미 수집한
+문자를 걸러낸 뒤, 가맹점명을 일괄 분류하고 거래 내역을 한 번의 INSERT로
+저장한다.
+
+자동 분류된 거래는 분류 모델 학습에 쓰지 않도록 매퍼 이벤트를 거치지 않는
+Core INSERT를 사용한다.
+"""
+import hashlib
+import re
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import Category, IngestedMessage, Transaction
+from app.services import ai_service, anomaly_service, budget_alert_service, change_service, duplicate_service
+
+# 한 번에 IN 절로 조회할 해시 수
+DEDUP_LOOKUP_CHUNK = 500
+# 응답에 포함할 파싱 실패 문자 예시 수
+UNPARSED_SAMPLE_LIMIT = 10
+
+_AMOUNT = r"(?P<amount>\d{1,3}(?:,\d{3})+|\d+)"
+_DATETIME = r"(?P<month>\d{1,2})/(?P<day>\d{1,2})\s*(?P<hour>\d{1,2}):(?P<minute>\d{2})"
+
+# 카드 승인 문자 공통 본문: "승인 홍*동 12,500원 일시불 10/15 12:34 스타벅스 누적 123,456원"
+_CARD_BODY = (
+    r"\s*(?P<kind>승인취소|취소|승인)\s*(?:\S*\*\S*\s*)?"
+    + _AMOUNT
+    + r"원\s*(?:\(?(?:일시불|\d+개월)\)?)?\s*"
+    + _DATETIME
+    + r"\s+(?P<merchant>.+?)(?:\s+(?:누적|잔여한도|잔액)\s*-?[\d,]+원?.*)?$"
+)
+
+# (이름, 정규식) - 위에서부터 순서대로 시도
+_ISSUER_PATTERNS = [
+    ("신한카드", re.compile(r"신한카드\s*\(\d{4}\)" + _CARD_BODY)),
+    ("KB국민카드", re.compile(r"KB국민(?:카드|체크)\s*\d{4}" + _CARD_BODY)),
+    ("삼성카드", re.compile(r"삼성(?:카드)?\s*\d{4}" + _CARD_BODY)),
+    ("현대카드", re.compile(r"현대카드(?:\s*[A-Z]+)?" + _CARD_BODY)),
+    ("롯데카드", re.compile(r"롯데(?:카드)?\s*\d{4}" + _CARD_BODY)),
+    ("우리카드", re.compile(r"우리(?:카드)?\s*\(\d{4}\)" + _CARD_BODY)),
+    ("하나카드", re.compile(r"하나(?:카드)?\s*\(\d{4}\)" + _CARD_BODY)),
+    ("BC카드", re.compile(r"BC(?:카드)?\s*\(\d{4}\)" + _CARD_BODY)),
+    ("NH농협카드", re.compile(r"NH(?:농협)?카드\s*\d{4}" + _CARD_BODY)),
+    # [KB]10/15 12:34 123456**789 스타벅스 체크카드출금 12,500 잔액 1,000,000
+    ("KB국민은행", re.compile(
+        r"\[KB\]\s*" + _DATETIME + r"\s+\S+\s+(?P<merchant>.+?)\s+"
+        r"(?P<kind>입금|출금|전자금융출금|체크카드출금|FBS출금)\s+" + _AMOUNT + r"원?(?:\s+잔액.*)?$"
+    )),
+    # 신한 10/15 12:34 110-***-123456 입금 50,000 잔액 1,000,000 홍길동
+    ("신한은행", re.compile(
+        r"신한\s*" + _DATETIME + r"\s+\S+\s+(?P<kind>입금|출금)\s+" + _AMOUNT
+        + r"원?\s+잔액\s*[\d,]+원?\s+(?P<merchant>.+)$"
+    )),
+]
+
+_HEADER_RE = re.compile(r"^\s*\[(?:Web발신|국외발신|국제발신)\]\s*")
+_WHITESPACE_RE = re.compile(r"\s+")
+_MESSAGE_SPLIT_RE = re.compile(r"\n\s*\n|\n(?=\s*\[Web발신\])")
+
+_CANCEL_KINDS = {"취소", "승인취소"}
+_INCOME_KINDS = {"입금"}
+
+FALLBACK_CATEGORY_NAMES = {"expense": "기타 지출", "income": "기타 수입"}
+
+
+@dataclass
+class ParsedMessage:
+    """파싱된 문자 한 건"""
+    issuer: str
+    type: str  # 'income', 'expense', 'cancelled'
+    amount: Decimal
+    approved_at: datetime
+    merchant: str
+
+    @cached_property
+    def dedup_hash(self) -> str:
+        merchant = _WHITESPACE_RE.sub("", self.merchant).lower()
+        key = f"{self.amount}|{self.approved_at:%Y-%m-%dT%H:%M}|{merchant}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def split_messages(text: str) -> List[str]:
+    """빈 줄 또는 [Web발신] 머리말을 기준으로 여러 문자를 나눔"""
+    return [chunk for chunk in _MESSAGE_SPLIT_RE.split(text or "") if chunk.strip()]
+
+
+def parse_message(message: str, reference_date: Optional[date] = None) -> Optional[ParsedMessage]:
+    """
+    문자 한 건 파싱
+
+    Args:
+        message: 문자 원문 (여러 줄 가능)
+        reference_date: 연도 추정 기준일 - 문자의 월/일이 기준일보다 뒤면 전년도로 봄
+
+    Returns:
+        파싱 결과 또는 None (알 수 없는 형식)
+    """
+    text = _WHITESPACE_RE.sub(" ", _HEADER_RE.sub("", message)).strip()
+    if not text:
+        return None
+
+    for issuer, pattern in _ISSUER_PATTERNS:
+        match = pattern.match(text)
+        if match:
+            break
+    else:
+        return None
+
+    reference_date = reference_date or date.today()
+    month, day = int(match.group("month")), int(match.group("day"))
+    year = reference_date.year - 1 if (month, day) > (reference_date.month, reference_date.day) else reference_date.year
+    try:
+        approved_at = datetime(year, month, day, int(match.group("hour")), int(match.group("minute")))
+    except ValueError:
+        return None
+
+    kind = match.group("kind")
+    if kind in _CANCEL_KINDS:
+        transaction_type = "cancelled"
+    elif kind in _INCOME_KINDS:
+        transaction_type = "income"
+    else:
+        transaction_type = "expense"
+
+    return ParsedMessage(
+        issuer=issuer,
+        type=transaction_type,
+        amount=Decimal(match.group("amount").replace(",", "")),
+        approved_at=approved_at,
+        merchant=match.group("merchant").strip(),
+    )
+
+
+def _existing_hashes(db: Session, user_id: int, hashes: Iterable[str]) -> set:
+    hashes = list(hashes)
+    existing = set()
+    for start in range(0, len(hashes), DEDUP_LOOKUP_CHUNK):
+        chunk = hashes[start:start + DEDUP_LOOKUP_CHUNK]
+        existing.update(
+            row[0] for row in db.query(IngestedMessage.dedup_hash).filter(
+                IngestedMessage.user_id == user_id,
+                IngestedMessage.dedup_hash.in_(chunk)
+            )
+        )
+    return existing
+
+
+def _fallback_category(
+    db: Session,
+    user_id: int,
+    transaction_type: str,
+    default_category: Optional[Category],
+    create: bool
+) -> Optional[Category]:
+    """분류되지 않은 거래에 쓸 카테고리 (없으면 '기타 지출'/'기타 수입' 생성)"""
+    if default_category is not None and default_category.type == transaction_type:
+        return default_category
+
+    name = FALLBACK_CATEGORY_NAMES[transaction_type]
+    category = db.query(Category).filter(
+        Category.user_id == user_id,
+        Category.type == transaction_type,
+        Category.name == name
+    ).first()
+    if category is None and create:
+        category = Category(name=name, type=transaction_type, user_id=user_id, color="#6b7280")
+        db.add(category)
+        db.flush()
+    return category
+
+
+def ingest_messages(
+    db: Session,
+    user_id: int,
+    messages: List[str],
+    reference_date: Optional[date] = None,
+    default_category: Optional[Category] = None,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    문자 묶음을 파싱해 거래 내역으로 저장
+
+    Args:
+        db: 데이터베이스 세션
+        user_id: 사용자 ID
+        messages: 문자 목록
+        reference_date: 연도 추정 기준일 (기본: 오늘)
+        default_category: 분류 실패 시 사용할 카테고리
+        dry_run: True이면 저장하지 않음
+
+    Returns:
+        처리 건수, 처리량(messages_per_sec), 문자별 결과
+
+    Raises:
+        ValueError: 같은 문자를 동시에 수집해 중복 키 충돌이 난 경우
+    """
+    started = time.perf_counter()
+    reference_date = reference_date or date.today()
+
+    parsed: List[tuple] = []  # (입력 순번, ParsedMessage)
+    unparsed_samples: List[str] = []
+    unparsed = 0
+    for index, message in enumerate(messages):
+        result = parse_message(message, reference_date)
+        if result is None:
+            unparsed += 1
+            if len(unparsed_samples) < UNPARSED_SAMPLE_LIMIT:
+                unparsed_samples.append(message[:200])
+            continue
+        parsed.append((index, result))
+
+    # 중복 제거: 이미 수집한 문자 + 같은 묶음 안의 중복
+    hashes = {item.dedup_hash for _, item in parsed if item.type != "cancelled"}
+    seen = _existing_hashes(db, user_id, hashes)
+
+    items: List[Dict[str, Any]] = []
+    new_items: List[Dict[str, Any]] = []
+    for index, item in parsed:
+        entry = {
+            "index": index,
+            "issuer": item.issuer,
+            "type": item.type,
+            "amount": float(item.amount),
+            "transaction_date": item.approved_at.date(),
+            "merchant": item.merchant,
+            "category_id": None,
+            "category_name": None,
+            "transaction_id": None,
+        }
+        if item.type == "cancelled":
+            entry["status"] = "cancelled"
+        elif item.dedup_hash in seen:
+            entry["status"] = "duplicate"
+        else:
+            seen.add(item.dedup_hash)
+            entry["status"] = "parsed" if dry_run else "inserted"
+            entry["_parsed"] = item
+            new_items.append(entry)
+        items.append(entry)
+
+    # 유형별로 가맹점명을 한 번에 분류
+    for transaction_type in ("expense", "income"):
+        targets = [entry for entry in new_items if entry["type"] == transaction_type]
+        if not targets:
+            continue
+        results = ai_service.classify_categories_batch(
+            db, [entry["merchant"] for entry in targets], user_id, transaction_type
+        )
+        fallback = None
+        for entry, result in zip(targets, results):
+            if result is None:
+                if fallback is None:
+                    fallback = _fallback_category(db, user_id, transaction_type, default_category, create=not dry_run)
+                if fallback is not None:
+                    entry["category_id"], entry["category_name"] = fallback.id, fallback.name
+                else:
+                    # 드라이런: 저장 시 새로 만들어질 카테고리 이름만 표시
+                    entry["category_name"] = FALLBACK_CATEGORY_NAMES[transaction_type]
+            else:
+                entry["category_id"], entry["category_name"] = result["category_id"], result["category_name"]
+
+    if not dry_run and new_items:
+        try:
+            transaction_ids = db.execute(
+                insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "user_id": user_id,
+                        "category_id": entry["category_id"],
+                        "type": entry["type"],
+                        "amount": entry["_parsed"].amount,
+                        "description": entry["merchant"],
+                        "transaction_date": entry["transaction_date"],
+                        "fingerprint": duplicate_service.fingerprint(
+                            entry["transaction_date"], entry["_parsed"].amount, entry["merchant"]
+                        ),
+                    }
+                    for entry in new_items
+                ],
+            ).scalars().all()
+            db.execute(insert(IngestedMessage), [
+                {
+                    "user_id": user_id,
+                    "dedup_hash": entry["_parsed"].dedup_hash,
+                    "issuer": entry["issuer"],
+                    "transaction_id": transaction_id,
+                }
+                for entry, transaction_id in zip(new_items, transaction_ids)
+            ])
+            # Core 일괄 삽입은 매퍼 이벤트를 거치지 않으므로 이상 거래 판정을 직접 적용
+            flagged = anomaly_service.observe_bulk(db, user_id, [
+                {
+                    "id": transaction_id,
+                    "category_id": entry["category_id"],
+                    "amount": entry["_parsed"].amount,
+                    "transaction_date": entry["transaction_date"],
+                }
+                for entry, transaction_id in zip(new_items, transaction_ids)
+            ])
+            budget_alert_service.evaluate(
+                db, user_id, {entry["transaction_date"].strftime('%Y-%m') for entry in new_items if entry["type"] == "expense"}
+            )
+            change_service.record_bulk(db, user_id, "transaction", transaction_ids, "create")
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise ValueError("같은 문자가 동시에 수집되고 있습니다. 잠시 후 다시 시도해주세요")
+        for entry, transaction_id in zip(new_items, transaction_ids):
+            entry["transaction_id"] = transaction_id
+            entry["anomaly"] = transaction_id in flagged
+
+    for entry in new_items:
+        entry.pop("_parsed")
+
+    elapsed = time.perf_counter() - started
+    return {
+        "received": len(messages),
+        "parsed": len(parsed),
+        "inserted": 0 if dry_run else len(new_items),
+        "duplicates": sum(1 for entry in items if entry["status"] == "duplicate"),
+        "anomalies": sum(1 for entry in new_items if entry.get("anomaly")),
+        "cancelled": sum(1 for entry in items if entry["status"] == "cancelled"),
+        "unparsed": unparsed,
+        "unparsed_samples": unparsed_samples,
+        "elapsed_ms": round(elapsed * 1000, 2),
+        "messages_per_sec": round(len(messages) / elapsed, 1) if elapsed > 0 else 0.0,
+        "items": items,
+    }
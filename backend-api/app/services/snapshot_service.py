@@ -0,0 +1,254 @@
+"""
+데이터베이스 스냅샷 서비스
+
+SQLite 온라인 백업 API로 운영 중인 데이터베이스의 일관된 사본을 만든다.
+페이지 단위로 나누어 복사하고 단계 사이에 잠시 쉬어서, 복사 중에도 다른
+요청의 쓰기가 오래 막히지 않도록 한다. 결과물은 gzip으로 압축하고
+SHA-256 체크섬 파일을 함께 남기며, 보관 개수/기간 정책에 따라 오래된
+스냅샷을 정리한다.
+"""
+import gzip
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from app.database import engine
+
+# 스냅샷 설정 (환경 변수로 조정 가능)
+SNAPSHOT_DIR = os.getenv(
+    "SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(engine.url.database or "."), "snapshots"),
+)
+SNAPSHOT_PAGES_PER_STEP = int(os.getenv("SNAPSHOT_PAGES_PER_STEP", "256"))  # 한 번에 복사할 페이지 수
+SNAPSHOT_STEP_SLEEP = float(os.getenv("SNAPSHOT_STEP_SLEEP", "0.005"))  # 단계 사이 대기 시간 (초)
+SNAPSHOT_RETENTION_COUNT = int(os.getenv("SNAPSHOT_RETENTION_COUNT", "7"))  # 보관할 최대 개수 (0이면 무제한)
+SNAPSHOT_RETENTION_DAYS = int(os.getenv("SNAPSHOT_RETENTION_DAYS", "30"))  # 보관 기간 (0이면 무제한)
+
+SNAPSHOT_PREFIX = "accountbook_"
+SNAPSHOT_SUFFIX = ".db.gz"
+CHECKSUM_SUFFIX = ".sha256"
+
+
+def _snapshot_path(name: str) -> str:
+    """스냅샷 파일 경로 (디렉토리 밖을 가리키는 이름은 거부)"""
+    if os.path.basename(name) != name or not name.endswith(SNAPSHOT_SUFFIX):
+        raise ValueError(f"잘못된 스냅샷 이름입니다: {name}")
+    return os.path.join(SNAPSHOT_DIR, name)
+
+
+def _backup_to_file(target_path: str, pages: int, sleep: float) -> int:
+    """온라인 백업 API로 데이터베이스를 target_path에 복사하고 페이지 수를 반환"""
+    raw_connection = engine.raw_connection()
+    try:
+        source = raw_connection.driver_connection
+        target = sqlite3.connect(target_path)
+        copied = {"pages": 0}
+
+        def progress(status, remaining, total):
+            copied["pages"] = total
+            # 각 단계 사이에 쓰기 잠금을 풀어 다른 요청이 진행될 수 있도록 함
+            if remaining and sleep > 0:
+                time.sleep(sleep)
+
+        try:
+            source.backup(target, pages=pages, progress=progress)
+        finally:
+            target.close()
+        return copied["pages"]
+    finally:
+        raw_connection.close()
+
+
+def _compress_with_checksum(source_path: str, target_path: str) -> str:
+    """파일을 gzip으로 압축하면서 압축본의 SHA-256을 계산"""
+    digest = hashlib.sha256()
+
+    class _HashingWriter:
+        def __init__(self, f):
+            self._f = f
+
+        def write(self, data):
+            digest.update(data)
+            return self._f.write(data)
+
+        def flush(self):
+            self._f.flush()
+
+    with open(source_path, "rb") as src, open(target_path, "wb") as raw_out:
+        with gzip.GzipFile(fileobj=_HashingWriter(raw_out), mode="wb", mtime=0) as gz:
+            shutil.copyfileobj(src, gz, length=1024 * 1024)
+    return digest.hexdigest()
+
+
+def create_snapshot(
+    pages_per_step: Optional[int] = None,
+    step_sleep: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    데이터베이스 스냅샷 생성
+
+    Args:
+        pages_per_step: 한 단계에 복사할 페이지 수
+        step_sleep: 단계 사이 대기 시간 (초)
+
+    Returns:
+        생성된 스냅샷 정보
+    """
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    started = time.perf_counter()
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    name = f"{SNAPSHOT_PREFIX}{timestamp}{SNAPSHOT_SUFFIX}"
+    final_path = _snapshot_path(name)
+
+    # 압축 전 사본은 같은 디렉토리의 임시 파일에 만든 뒤 삭제
+    fd, raw_path = tempfile.mkstemp(prefix=".snapshot_", suffix=".db", dir=SNAPSHOT_DIR)
+    os.close(fd)
+    partial_path = final_path + ".partial"
+    checksum_path = final_path + CHECKSUM_SUFFIX
+    partial_checksum_path = checksum_path + ".partial"
+    try:
+        pages = _backup_to_file(
+            raw_path,
+            pages=pages_per_step or SNAPSHOT_PAGES_PER_STEP,
+            sleep=SNAPSHOT_STEP_SLEEP if step_sleep is None else step_sleep,
+        )
+        raw_size = os.path.getsize(raw_path)
+        checksum = _compress_with_checksum(raw_path, partial_path)
+
+        # sha256sum 호환 형식으로 체크섬 기록 - 스냅샷이 보이는 시점에는 체크섬이
+        # 이미 있도록 체크섬 파일을 먼저 제자리로 옮긴 뒤 스냅샷을 옮김
+        with open(partial_checksum_path, "w", encoding="utf-8") as f:
+            f.write(f"{checksum}  {name}\n")
+        os.replace(partial_checksum_path, checksum_path)
+        try:
+            os.replace(partial_path, final_path)
+        except OSError:
+            os.remove(checksum_path)
+            raise
+    finally:
+        for path in (raw_path, partial_path, partial_checksum_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    removed = apply_retention()
+
+    return {
+        "name": name,
+        "size": os.path.getsize(final_path),
+        "raw_size": raw_size,
+        "pages": pages,
+        "sha256": checksum,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        "removed": removed,
+    }
+
+
+def list_snapshots() -> List[Dict[str, Any]]:
+    """스냅샷 목록 조회 (최신순)"""
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return []
+
+    snapshots = []
+    for name in os.listdir(SNAPSHOT_DIR):
+        if not (name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIX)):
+            continue
+        path = os.path.join(SNAPSHOT_DIR, name)
+        checksum = None
+        if os.path.exists(path + CHECKSUM_SUFFIX):
+            with open(path + CHECKSUM_SUFFIX, encoding="utf-8") as f:
+                parts = f.read().split()
+            checksum = parts[0] if parts else None
+        snapshots.append({
+            "name": name,
+            "size": os.path.getsize(path),
+            "created_at": datetime.fromtimestamp(os.path.getmtime(path)).isoformat(),
+            "sha256": checksum,
+        })
+
+    # 파일명에 타임스탬프가 들어 있으므로 이름 역순이 곧 최신순
+    snapshots.sort(key=lambda s: s["name"], reverse=True)
+    return snapshots
+
+
+def get_snapshot_path(name: str) -> Optional[str]:
+    """스냅샷 파일 경로 조회 (없으면 None)"""
+    path = _snapshot_path(name)
+    return path if os.path.exists(path) else None
+
+
+def verify_snapshot(name: str) -> Dict[str, Any]:
+    """
+    기록된 체크섬과 실제 파일의 SHA-256 비교
+
+    Returns:
+        {"ok": 일치 여부, "error": 실패 사유 (일치하면 None)}
+    """
+    path = _snapshot_path(name)
+    if not os.path.exists(path):
+        return {"ok": False, "error": "스냅샷 파일이 없습니다"}
+    if not os.path.exists(path + CHECKSUM_SUFFIX):
+        return {"ok": False, "error": "체크섬 파일이 없습니다"}
+
+    with open(path + CHECKSUM_SUFFIX, encoding="utf-8", errors="replace") as f:
+        fields = f.read().split()
+    # 비어 있거나 기록 도중 잘린 체크섬 파일
+    expected = fields[0].lower() if fields else ""
+    if len(expected) != 64 or any(c not in "0123456789abcdef" for c in expected):
+        return {"ok": False, "error": "체크섬 파일이 비어 있거나 손상되었습니다"}
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    if digest.hexdigest() != expected:
+        return {"ok": False, "error": "체크섬이 일치하지 않습니다"}
+    return {"ok": True, "error": None}
+
+
+def delete_snapshot(name: str) -> bool:
+    """스냅샷 및 체크섬 파일 삭제"""
+    path = _snapshot_path(name)
+    if not os.path.exists(path):
+        return False
+
+    os.remove(path)
+    if os.path.exists(path + CHECKSUM_SUFFIX):
+        os.remove(path + CHECKSUM_SUFFIX)
+    return True
+
+
+def apply_retention(
+    keep_count: Optional[int] = None,
+    keep_days: Optional[int] = None,
+) -> List[str]:
+    """보관 정책에 따라 오래된 스냅샷 삭제 후 삭제된 이름 목록 반환"""
+    keep_count = SNAPSHOT_RETENTION_COUNT if keep_count is None else keep_count
+    keep_days = SNAPSHOT_RETENTION_DAYS if keep_days is None else keep_days
+
+    snapshots = list_snapshots()
+    cutoff = datetime.now() - timedelta(days=keep_days) if keep_days > 0 else None
+
+    removed = []
+    for idx, snapshot in enumerate(snapshots):
+        # 가장 최신 스냅샷은 정책과 관계없이 항상 보관
+        if idx == 0:
+            continue
+        too_many = keep_count > 0 and idx >= keep_count
+        too_old = cutoff is not None and datetime.fromisoformat(snapshot["created_at"]) < cutoff
+        if too_many or too_old:
+            delete_snapshot(snapshot["name"])
+            removed.append(snapshot["name"])
+    return removed
+
+
+if __name__ == "__main__":
+    result = create_snapshot()
+    print(f"스냅샷 생성 완료: {result['name']} ({result['size']} bytes, sha256={result['sha256']})")
+    if result["removed"]:
+        print(f"보관 정책에 따라 삭제된 스냅샷: {', '.join(result['removed'])}")
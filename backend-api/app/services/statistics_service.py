@@ -1,14 +1,24 @@
 """
 통계 서비스
 """
-from typing import Dict, Any, List
+import calendar
+from typing import Dict, Any, List, Tuple
 from datetime import date, datetime
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract, and_
+from sqlalchemy import func, and_
 from app.models import Transaction, Category
 from app.schemas.statistics import MonthlyStatistics, CategoryStatistics
 
+# 거래 타입 - 타입 조건이 없는 집계에도 IN으로 넣어 (user_id, type, transaction_date, ...)
+# 커버링 인덱스를 타입별 거래일 범위로 읽게 함
+TRANSACTION_TYPES = ('income', 'expense')
+
+
+def month_range(year: int, month: int) -> Tuple[date, date]:
+    """연/월을 (첫날, 마지막 날)로 변환 - 거래일 범위 조건으로 인덱스를 사용하기 위함"""
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
 
 def get_monthly_statistics(
     db: Session,
@@ -29,14 +39,16 @@ def get_monthly_statistics(
         월별 통계 데이터
     """
     # 월별 수입/지출 합계
+    start, end = month_range(year, month)
     monthly_stats = db.query(
         Transaction.type,
         func.sum(Transaction.amount).label('total'),
-        func.count(Transaction.id).label('count')
+        func.count().label('count')
     ).filter(
         Transaction.user_id == user_id,
-        extract('year', Transaction.transaction_date) == year,
-        extract('month', Transaction.transaction_date) == month
+        Transaction.type.in_(TRANSACTION_TYPES),
+        Transaction.transaction_date >= start,
+        Transaction.transaction_date <= end
     ).group_by(Transaction.type).all()
     
     income = Decimal('0')
@@ -55,9 +67,9 @@ def get_monthly_statistics(
     balance = income - expense
     
     return MonthlyStatistics(
-        income=float(income),
-        expense=float(expense),
-        balance=float(balance),
+        income=income,
+        expense=expense,
+        balance=balance,
         income_count=income_count,
         expense_count=expense_count
     )
@@ -83,22 +95,27 @@ def get_category_statistics(
     Returns:
         카테고리별 통계 리스트
     """
-    # 카테고리별 통계
+    # 카테고리별 통계 - 거래를 먼저 카테고리별로 집계한 뒤 카테고리 정보를 붙임
+    start, end = month_range(year, month)
+    totals = db.query(
+        Transaction.category_id.label('category_id'),
+        func.sum(Transaction.amount).label('total'),
+        func.count().label('count')
+    ).filter(
+        Transaction.user_id == user_id,
+        Transaction.type == transaction_type,
+        Transaction.transaction_date >= start,
+        Transaction.transaction_date <= end
+    ).group_by(Transaction.category_id).subquery()
+
     category_stats = db.query(
         Category.id,
         Category.name,
         Category.color,
-        func.sum(Transaction.amount).label('total'),
-        func.count(Transaction.id).label('count')
+        totals.c.total,
+        totals.c.count
     ).join(
-        Transaction, Category.id == Transaction.category_id
-    ).filter(
-        Transaction.user_id == user_id,
-        Transaction.type == transaction_type,
-        extract('year', Transaction.transaction_date) == year,
-        extract('month', Transaction.transaction_date) == month
-    ).group_by(
-        Category.id, Category.name, Category.color
+        totals, Category.id == totals.c.category_id
     ).all()
     
     result = []
@@ -107,7 +124,7 @@ def get_category_statistics(
             category_id=stat.id,
             category_name=stat.name,
             category_color=stat.color,
-            total=float(stat.total) if stat.total else 0.0,
+            total=stat.total or Decimal('0'),
             count=stat.count
         ))
     
@@ -0,0 +1,346 @@
+"""
+오프라인 클라이언트용 델타 동기화
+
+- 내려받기: 변경 로그(change_log)에서 `since` 이후의 변경을 버전 순으로 나눠 조회한다.
+  생성/수정은 현재 데이터를, 삭제는 데이터 없이(툼스톤) 돌려준다. 변경 로그는
+  엔티티마다 마지막 변경만 남기므로 오래 오프라인이었던 클라이언트도 엔티티 수
+  이상은 받지 않는다.
+- 올리기: 오프라인에서 쌓인 변경을 한 번에 받아 한 트랜잭션으로 적용한다.
+  수정/삭제는 클라이언트가 마지막으로 본 버전(base_version) 또는 updated_at
+  (base_updated_at)과 서버 값을 비교해 그 사이 서버에서 바뀌었으면 적용하지 않고
+  충돌로 돌려준다. 거래/카테고리 삭제는 하위 거래를 메모리에 올리지 않도록 나머지
+  변경을 커밋한 뒤 deletion_service로 청크 단위로 지운다.
+
+SQLite는 쓰기 트랜잭션이 하나씩 커밋되므로 로그 ID는 커밋 순서와 같고,
+이미 받은 버전보다 작은 변경이 나중에 나타나지 않는다.
+"""
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import Transaction, Category, Tag, ChangeLog, transaction_tag_association
+from app.schemas.budget import BudgetCreate, BudgetUpdate
+from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.schemas.tag import TagCreate, TagUpdate
+from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.services import deletion_service, tag_service, transaction_service
+from app.services.statistics_service import TRANSACTION_TYPES
+from app.services.change_service import ENTITIES
+
+# 한 번에 내려보낼 변경 수 (기본값)
+SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "500"))
+
+_MODELS = {entity: model for model, entity in ENTITIES.items()}
+
+# 응답에서 뺄 컬럼 (서버 내부 정보)
+_HIDDEN_COLUMNS = {"user_id", "file_path"}
+
+# 올리기를 지원하는 엔티티 -> (생성 스키마, 수정 스키마)
+PUSH_SCHEMAS = {
+    "transaction": (TransactionCreate, TransactionUpdate),
+    "category": (CategoryCreate, CategoryUpdate),
+    "tag": (TagCreate, TagUpdate),
+    "budget": (BudgetCreate, BudgetUpdate),
+}
+
+_CHUNK_SIZE = 500
+
+# deletion_service로 지우는 엔티티 (하위 거래가 많을 수 있음)
+_DEFERRED_DELETES = ("transaction", "category")
+
+
+def current_version(db: Session) -> int:
+    """마지막으로 발급된 데이터 버전 (삭제된 로그 포함)"""
+    version = db.execute(
+        text("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'")
+    ).scalar()
+    return int(version or 0)
+
+
+def _chunks(values: List[int]) -> Iterable[List[int]]:
+    for start in range(0, len(values), _CHUNK_SIZE):
+        yield values[start:start + _CHUNK_SIZE]
+
+
+def _serialize(entity: str, obj: Any, tag_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+    data = {
+        attr.key: getattr(obj, attr.key)
+        for attr in obj.__mapper__.column_attrs
+        if attr.key not in _HIDDEN_COLUMNS
+    }
+    if entity == "transaction":
+        data["tag_ids"] = tag_ids or []
+    return data
+
+
+def _load(db: Session, user_id: int, entity: str, entity_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """엔티티 ID 목록의 현재 데이터를 한꺼번에 조회"""
+    model = _MODELS[entity]
+    loaded: Dict[int, Dict[str, Any]] = {}
+    for chunk in _chunks(entity_ids):
+        objects = db.query(model).filter(model.user_id == user_id, model.id.in_(chunk)).all()
+        tag_ids: Dict[int, List[int]] = {}
+        if entity == "transaction" and objects:
+            association = transaction_tag_association.c
+            for transaction_id, tag_id in db.execute(
+                select(association.transaction_id, association.tag_id).where(
+                    association.transaction_id.in_([obj.id for obj in objects])
+                )
+            ):
+                tag_ids.setdefault(transaction_id, []).append(tag_id)
+        for obj in objects:
+            loaded[obj.id] = _serialize(entity, obj, tag_ids.get(obj.id))
+    return loaded
+
+
+def get_changes(
+    db: Session,
+    user_id: int,
+    since: int = 0,
+    limit: int = SYNC_PAGE_SIZE,
+    entities: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    since 버전 이후의 변경 조회
+
+    Returns:
+        {"changes": [{"version", "entity", "id", "op", "data"}], "next_since", "has_more", "reset"}
+        - reset: since가 서버의 마지막 버전보다 크면(백업 복원 등) True - 로컬 데이터를
+          비우고 처음부터 다시 받아야 한다. 이때 changes는 since=0 기준이다.
+    """
+    latest = current_version(db)
+    reset = since > latest
+    if reset:
+        since = 0
+
+    query = db.query(ChangeLog).filter(ChangeLog.user_id == user_id, ChangeLog.id > since)
+    if entities:
+        query = query.filter(ChangeLog.entity.in_(entities))
+    rows = query.order_by(ChangeLog.id).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    live: Dict[str, List[int]] = {}
+    for row in rows:
+        if row.op != "delete":
+            live.setdefault(row.entity, []).append(row.entity_id)
+    current = {entity: _load(db, user_id, entity, entity_ids) for entity, entity_ids in live.items()}
+
+    changes = []
+    for row in rows:
+        data = current.get(row.entity, {}).get(row.entity_id) if row.op != "delete" else None
+        changes.append({
+            "version": row.id,
+            "entity": row.entity,
+            "id": row.entity_id,
+            # 로그와 데이터 사이에 삭제된 경우(삭제 로그는 더 큰 버전으로 뒤따름)도 툼스톤으로
+            "op": row.op if data is not None or row.op == "delete" else "delete",
+            "data": data,
+        })
+
+    return {
+        "changes": changes,
+        "next_since": rows[-1].id if has_more else max(latest, since),
+        "has_more": has_more,
+        "reset": reset,
+    }
+
+
+# ---------------------------------------------------------------------------
+# 올리기
+# ---------------------------------------------------------------------------
+
+class _Rejected(Exception):
+    def __init__(self, status: str, error: str, server: Optional[Dict[str, Any]] = None):
+        super().__init__(error)
+        self.status = status
+        self.error = error
+        self.server = server
+
+
+def _entity_versions(db: Session, user_id: int, keys: Iterable[Tuple[str, int]]) -> Dict[Tuple[str, int], int]:
+    keys = list(keys)
+    versions: Dict[Tuple[str, int], int] = {}
+    for start in range(0, len(keys), _CHUNK_SIZE):
+        for entity, entity_id, version in db.query(
+            ChangeLog.entity, ChangeLog.entity_id, ChangeLog.id
+        ).filter(
+            ChangeLog.user_id == user_id,
+            tuple_(ChangeLog.entity, ChangeLog.entity_id).in_(keys[start:start + _CHUNK_SIZE])
+        ):
+            versions[(entity, entity_id)] = version
+    return versions
+
+
+def _same_time(server: datetime, client: datetime) -> bool:
+    # DB의 updated_at은 타임존 없는 UTC(CURRENT_TIMESTAMP), 초 단위
+    if client.tzinfo is not None:
+        client = client.astimezone(timezone.utc).replace(tzinfo=None)
+    if server.tzinfo is not None:
+        server = server.astimezone(timezone.utc).replace(tzinfo=None)
+    return server.replace(microsecond=0) == client.replace(microsecond=0)
+
+
+def _check_references(db: Session, user_id: int, values: Dict[str, Any], deleted: Dict[str, set]) -> None:
+    category_id = values.get("category_id")
+    if category_id is not None and category_id in deleted["category"]:
+        raise _Rejected("invalid", "카테고리를 찾을 수 없습니다")
+    if category_id is not None and not db.query(Category.id).filter(
+        Category.id == category_id, Category.user_id == user_id
+    ).first():
+        raise _Rejected("invalid", "카테고리를 찾을 수 없습니다")
+
+
+def _check_values(db: Session, user_id: int, entity: str, values: Dict[str, Any], obj: Any = None) -> None:
+    """REST API와 같은 값 검증 (비울 수 없는 컬럼, 거래/카테고리 유형, 태그 이름 중복)"""
+    columns = _MODELS[entity].__table__.c
+    for field, value in values.items():
+        if value is None and field in columns and not columns[field].nullable:
+            raise _Rejected("invalid", f"{field} 값은 비울 수 없습니다")
+    if entity == "transaction":
+        error = transaction_service.update_error(values)
+        if error:
+            raise _Rejected("invalid", error)
+    elif entity == "category" and "type" in values and values["type"] not in TRANSACTION_TYPES:
+        raise _Rejected("invalid", "카테고리 유형은 income 또는 expense여야 합니다")
+    elif entity == "tag" and values.get("name") and (obj is None or values["name"] != obj.name):
+        try:
+            tag_service.check_name_available(db, user_id, values["name"], obj.id if obj is not None else None)
+        except ValueError as e:
+            raise _Rejected("invalid", str(e))
+
+
+def _apply_tags(db: Session, user_id: int, transaction: Transaction, tag_ids: Optional[List[int]]) -> None:
+    transaction.tags = db.query(Tag).filter(Tag.id.in_(tag_ids), Tag.user_id == user_id).all() if tag_ids else []
+
+
+def _apply(db: Session, user_id: int, item: Any, versions: Dict[Tuple[str, int], int],
+           deleted: Dict[str, set]) -> Any:
+    """
+    변경 하나 적용 (플러시 전), 대상 객체 반환
+
+    거래/카테고리 삭제는 deleted에 기록만 하고, 이후 변경은 이미 지워진 것처럼 다룬다.
+    """
+    if item.entity not in PUSH_SCHEMAS:
+        raise _Rejected("invalid", f"동기화로 변경할 수 없는 항목입니다: {item.entity}")
+    create_schema, update_schema = PUSH_SCHEMAS[item.entity]
+    model = _MODELS[item.entity]
+
+    if item.op == "create":
+        try:
+            payload = create_schema(**item.data)
+        except ValidationError as e:
+            raise _Rejected("invalid", str(e))
+        values = payload.model_dump(exclude={"tag_ids"})
+        _check_values(db, user_id, item.entity, values)
+        _check_references(db, user_id, values, deleted)
+        obj = model(**values, user_id=user_id)
+        if item.entity == "transaction":
+            _apply_tags(db, user_id, obj, payload.tag_ids)
+        db.add(obj)
+        return obj
+
+    obj = db.query(model).filter(model.id == item.id, model.user_id == user_id).first() if item.id else None
+    # 앞선 변경에서 삭제한 대상과 삭제한 카테고리에 딸린 거래/예산
+    if obj is None or obj.id in deleted[item.entity] or getattr(obj, "category_id", None) in deleted["category"]:
+        raise _Rejected("not_found", "대상을 찾을 수 없습니다")
+
+    if item.base_version is not None:
+        conflicted = versions.get((item.entity, obj.id), 0) > item.base_version
+    elif item.base_updated_at is not None:
+        conflicted = not _same_time(obj.updated_at, item.base_updated_at)
+    else:
+        conflicted = False  # 기준이 없으면 마지막 쓰기 우선
+    if conflicted:
+        server = _load(db, user_id, item.entity, [obj.id]).get(obj.id)
+        raise _Rejected("conflict", "서버에서 먼저 변경되었습니다", server)
+
+    if item.op == "delete":
+        if item.entity in _DEFERRED_DELETES:
+            deleted[item.entity].add(obj.id)
+        else:
+            db.delete(obj)
+        return obj
+
+    try:
+        payload = update_schema(**item.data)
+    except ValidationError as e:
+        raise _Rejected("invalid", str(e))
+    values = payload.model_dump(exclude_unset=True, exclude={"tag_ids"})
+    _check_values(db, user_id, item.entity, values, obj)
+    _check_references(db, user_id, values, deleted)
+    for field, value in values.items():
+        setattr(obj, field, value)
+    if item.entity == "transaction" and "tag_ids" in payload.model_fields_set:
+        _apply_tags(db, user_id, obj, payload.tag_ids)
+    return obj
+
+
+def _begin(db: Session) -> None:
+    """
+    쓰기 트랜잭션 시작
+
+    pysqlite는 SELECT만 실행한 연결에서 트랜잭션을 열지 않으므로, 그대로 SAVEPOINT를
+    만들면 그 세이브포인트가 바깥 트랜잭션이 되어 RELEASE 시점에 커밋된다.
+    항목별 세이브포인트가 하나의 올리기 트랜잭션 안에 있도록 BEGIN을 먼저 실행한다.
+    """
+    connection = db.connection()
+    if not connection.connection.driver_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN")
+
+
+def push_changes(db: Session, user_id: int, items: List[Any]) -> Dict[str, Any]:
+    """
+    클라이언트 변경 일괄 적용 (순서대로, 한 트랜잭션 - 거래/카테고리 삭제는 커밋 후 청크 단위로)
+
+    Args:
+        items: SyncPushItem 목록
+
+    Returns:
+        {"results": [{"index", "client_id", "status", "id", "version", "error", "server"}], "version"}
+        - status: applied / conflict(server에 서버 쪽 현재 데이터) / not_found / invalid
+    """
+    versions = _entity_versions(db, user_id, {
+        (item.entity, item.id) for item in items
+        if item.op != "create" and item.id and item.base_version is not None
+    })
+
+    results = []
+    applied = []
+    deleted: Dict[str, set] = {entity: set() for entity in PUSH_SCHEMAS}
+    _begin(db)
+    for index, item in enumerate(items):
+        result = {"index": index, "client_id": item.client_id, "status": "applied",
+                  "id": item.id, "version": None, "error": None, "server": None}
+        try:
+            # 항목마다 세이브포인트 안에서 플러시해 제약 조건 위반은 그 항목만 되돌림
+            with db.begin_nested():
+                obj = _apply(db, user_id, item, versions, deleted)
+                db.flush()
+            applied.append((result, item, obj))
+        except _Rejected as e:
+            result.update(status=e.status, error=e.error, server=e.server)
+        except IntegrityError as e:
+            result.update(status="invalid", error=f"저장할 수 없는 값입니다: {e.orig}")
+        results.append(result)
+
+    db.commit()
+
+    if deleted["transaction"]:
+        deletion_service.delete_transactions(db, user_id, Transaction.id.in_(deleted["transaction"]))
+    if deleted["category"]:
+        deletion_service.delete_categories(db, user_id, deleted["category"])
+
+    for result, item, obj in applied:
+        if item.op == "create":
+            result["id"] = obj.id
+    touched = _entity_versions(db, user_id, {(item.entity, result["id"]) for result, item, _ in applied})
+    for result, item, _ in applied:
+        result["version"] = touched.get((item.entity, result["id"]))
+
+    return {"results": results, "version": current_version(db)}
@@ -1,9 +1,17 @@
+import json
+
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from typing import List, Optional
+from sqlalchemy import and_, delete, func, select, true, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Iterable, List, Optional
 
 from app.models import Tag, Transaction, transaction_tag_association
 from app.schemas.tag import TagCreate, TagUpdate
+from app.services import change_service
+
+_links = transaction_tag_association
+_tags = Tag.__table__
+_transactions = Transaction.__table__
 
 
 def get_tag(db: Session, tag_id: int, user_id: int) -> Optional[Tag]:
@@ -55,18 +63,24 @@ def get_tags_with_count(db: Session, user_id: int) -> List[dict]:
     return result
 
 
+def check_name_available(db: Session, user_id: int, name: str, tag_id: Optional[int] = None) -> None:
+    """
+    같은 이름의 태그가 있으면 ValueError
+
+    Args:
+        tag_id: 수정 중인 태그 ID (자기 자신은 제외)
+    """
+    query = db.query(Tag.id).filter(and_(Tag.user_id == user_id, Tag.name == name))
+    if tag_id is not None:
+        query = query.filter(Tag.id != tag_id)
+    if query.first():
+        raise ValueError(f"태그 '{name}'가 이미 존재합니다.")
+
+
 def create_tag(db: Session, user_id: int, tag_data: TagCreate) -> Tag:
     """태그 생성"""
     # 같은 이름의 태그가 이미 있는지 확인
-    existing = db.query(Tag).filter(
-        and_(
-            Tag.user_id == user_id,
-            Tag.name == tag_data.name
-        )
-    ).first()
-    
-    if existing:
-        raise ValueError(f"태그 '{tag_data.name}'가 이미 존재합니다.")
+    check_name_available(db, user_id, tag_data.name)
     
     tag = Tag(
         user_id=user_id,
@@ -86,15 +100,7 @@ def update_tag(db: Session, tag_id: int, user_id: int, tag_data: TagUpdate) -> O
     
     # 이름 변경 시 중복 체크
     if tag_data.name and tag_data.name != tag.name:
-        existing = db.query(Tag).filter(
-            and_(
-                Tag.user_id == user_id,
-                Tag.name == tag_data.name,
-                Tag.id != tag_id
-            )
-        ).first()
-        if existing:
-            raise ValueError(f"태그 '{tag_data.name}'가 이미 존재합니다.")
+        check_name_available(db, user_id, tag_data.name, tag_id)
     
     update_data = tag_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
@@ -155,3 +161,93 @@ def get_transactions_by_tag(db: Session, tag_id: int, user_id: int, skip: int =
             transaction_tag_association.c.tag_id == tag_id
         )
     ).order_by(Transaction.transaction_date.desc()).offset(skip).limit(limit).all()
+
+
+def _id_values(ids: Iterable[int]):
+    """ID 목록을 JSON 배열 하나로 바인딩해 json_each로 펼친 서브쿼리 (바인드 변수 수 제한 없이 한 문장으로 처리)"""
+    return select(func.json_each(json.dumps(sorted(set(ids)))).table_valued("value").c.value)
+
+
+def _owned_tag_ids(db: Session, user_id: int, tag_ids: Iterable[int]) -> Optional[set]:
+    """모두 사용자 소유이면 태그 ID 집합, 아니면 None"""
+    tag_ids = set(tag_ids)
+    owned = {row[0] for row in db.query(Tag.id).filter(Tag.user_id == user_id, Tag.id.in_(tag_ids))}
+    return owned if owned == tag_ids else None
+
+
+def _owned_transactions(user_id: int, transaction_ids: Iterable[int]):
+    return select(_transactions.c.id).where(
+        _transactions.c.user_id == user_id, _transactions.c.id.in_(_id_values(transaction_ids))
+    )
+
+
+def attach_tags(db: Session, user_id: int, tag_ids: List[int], transaction_ids: List[int]) -> Optional[dict]:
+    """
+    여러 거래에 태그 일괄 연결 (INSERT ... SELECT 한 문장, 이미 있는 연결은 건너뜀)
+
+    사용자 소유가 아닌 거래는 건너뛰고, 태그가 하나라도 없으면 None
+    """
+    tag_ids = _owned_tag_ids(db, user_id, tag_ids)
+    if tag_ids is None:
+        return None
+    transactions = _owned_transactions(user_id, transaction_ids).subquery()
+    linked = db.execute(
+        sqlite_insert(_links).from_select(
+            ["transaction_id", "tag_id"],
+            select(transactions.c.id, _tags.c.id)
+            .select_from(transactions.join(_tags, true()))
+            .where(_tags.c.id.in_(tag_ids)),
+        ).on_conflict_do_nothing().returning(_links.c.transaction_id)
+    ).scalars().all()
+    return _finish_bulk(db, user_id, linked)
+
+
+def detach_tags(db: Session, user_id: int, tag_ids: List[int], transaction_ids: List[int]) -> Optional[dict]:
+    """여러 거래에서 태그 일괄 해제 (DELETE 한 문장), 태그가 하나라도 없으면 None"""
+    tag_ids = _owned_tag_ids(db, user_id, tag_ids)
+    if tag_ids is None:
+        return None
+    unlinked = db.execute(
+        delete(_links).where(
+            _links.c.tag_id.in_(tag_ids),
+            _links.c.transaction_id.in_(_owned_transactions(user_id, transaction_ids)),
+        ).returning(_links.c.transaction_id)
+    ).scalars().all()
+    return _finish_bulk(db, user_id, unlinked)
+
+
+def _finish_bulk(db: Session, user_id: int, transaction_ids: List[int]) -> dict:
+    # 연결 테이블만 바뀌어 매퍼 이벤트가 없으므로 동기화 클라이언트가 다시 받도록 거래 변경으로 기록
+    changed = set(transaction_ids)
+    change_service.record_bulk(db, user_id, "transaction", changed, "update")
+    db.commit()
+    return {"links": len(transaction_ids), "transactions": len(changed)}
+
+
+def merge_tags(db: Session, tag_id: int, user_id: int, source_tag_ids: List[int]) -> Optional[dict]:
+    """
+    태그 병합 - 원본 태그의 연결을 대상 태그로 옮기고 원본 태그 삭제 (한 트랜잭션)
+
+    연결은 UPDATE OR IGNORE 한 문장으로 옮기고, 이미 대상 태그가 붙어 있어
+    옮기지 못한 (거래, 원본 태그) 연결은 중복이므로 지운다.
+    대상/원본 태그 중 하나라도 사용자 소유가 아니면 None
+    """
+    source_ids = set(source_tag_ids) - {tag_id}
+    if _owned_tag_ids(db, user_id, source_ids | {tag_id}) is None:
+        return None
+
+    moved = db.execute(
+        update(_links).prefix_with("OR IGNORE")
+        .where(_links.c.tag_id.in_(source_ids))
+        .values(tag_id=tag_id)
+        .returning(_links.c.transaction_id)
+    ).scalars().all()
+    duplicates = db.execute(
+        delete(_links).where(_links.c.tag_id.in_(source_ids)).returning(_links.c.transaction_id)
+    ).scalars().all()
+    db.execute(delete(_tags).where(_tags.c.id.in_(source_ids)))
+
+    change_service.record_bulk(db, user_id, "tag", source_ids, "delete")
+    change_service.record_bulk(db, user_id, "transaction", set(moved) | set(duplicates), "update")
+    db.commit()
+    return {"tag_id": tag_id, "moved": len(moved), "deduplicated": len(duplicates), "deleted_tags": len(source_ids)}
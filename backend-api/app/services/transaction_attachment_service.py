@@ -1,7 +1,6 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 from typing import List, Optional
-import os
 import uuid
 from pathlib import Path
 
@@ -92,14 +91,7 @@ def delete_attachment(db: Session, attachment_id: int, user_id: int) -> bool:
     if not attachment:
         return False
     
-    # 파일 삭제
-    if os.path.exists(attachment.file_path):
-        try:
-            os.remove(attachment.file_path)
-        except Exception:
-            pass  # 파일 삭제 실패해도 DB 레코드는 삭제
-    
-    # 데이터베이스에서 삭제
+    # 데이터베이스에서 삭제 (파일은 커밋 후 백그라운드에서 삭제 - deletion_service)
     db.delete(attachment)
     db.commit()
     return True
@@ -1,9 +1,13 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, or_
-from typing import List, Optional
+from sqlalchemy import and_, bindparam, delete, exists, false, func, insert, or_, select, update
+from typing import Any, Dict, Iterable, List, Optional, Set
 from datetime import date
-from app.models import Transaction, Category, Tag
-from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.models import Transaction, Category, Tag, transaction_tag_association
+from app.schemas.transaction import TransactionCreate, TransactionUpdate, TransactionBulkUpdateItem
+from app.services import (
+    anomaly_service, budget_alert_service, change_service, deletion_service, duplicate_service, learned_classifier,
+)
+from app.services.statistics_service import TRANSACTION_TYPES
 
 
 def get_transaction(db: Session, transaction_id: int, user_id: int) -> Optional[Transaction]:
@@ -13,6 +17,47 @@ def get_transaction(db: Session, transaction_id: int, user_id: int) -> Optional[
     ).first()
 
 
+def _tag_filters(
+    db: Session,
+    tags_any: Optional[List[int]] = None,
+    tags_all: Optional[List[int]] = None,
+    tags_none: Optional[List[int]] = None
+) -> list:
+    """
+    태그 필터 조건 목록
+
+    - tags_any: 태그 중 하나라도 붙은 거래 - (tag_id, transaction_id) 인덱스 범위들의 합집합
+    - tags_all: 모든 태그가 붙은 거래 - 거래 수가 가장 적은 태그의 거래 ID만 읽고,
+      나머지 태그는 거래 수가 적은 순으로 기본 키(transaction_id, tag_id)로 확인
+    - tags_none: 태그가 하나도 붙지 않은 거래
+    """
+    link = transaction_tag_association.c
+    conditions = []
+    if tags_any:
+        conditions.append(Transaction.id.in_(
+            select(link.transaction_id).where(link.tag_id.in_(set(tags_any)))
+        ))
+    if tags_all:
+        tag_ids = set(tags_all)
+        counts = dict(db.query(link.tag_id, func.count()).filter(link.tag_id.in_(tag_ids)).group_by(link.tag_id))
+        if len(counts) < len(tag_ids):
+            # 거래가 하나도 없는 태그가 있으면 결과가 없음
+            return [false()]
+        first, *rest = sorted(tag_ids, key=lambda tag_id: counts[tag_id])
+        driver = transaction_tag_association.alias("driver")
+        subquery = select(driver.c.transaction_id).where(driver.c.tag_id == first)
+        for tag_id in rest:
+            subquery = subquery.where(exists().where(
+                link.transaction_id == driver.c.transaction_id, link.tag_id == tag_id
+            ))
+        conditions.append(Transaction.id.in_(subquery))
+    if tags_none:
+        conditions.append(~exists().where(
+            link.transaction_id == Transaction.id, link.tag_id.in_(set(tags_none))
+        ))
+    return conditions
+
+
 def get_transactions(
     db: Session,
     user_id: int,
@@ -24,7 +69,10 @@ def get_transactions(
     transaction_type: Optional[str] = None,
     search: Optional[str] = None,
     min_amount: Optional[float] = None,
-    max_amount: Optional[float] = None
+    max_amount: Optional[float] = None,
+    tags_any: Optional[List[int]] = None,
+    tags_all: Optional[List[int]] = None,
+    tags_none: Optional[List[int]] = None
 ) -> List[Transaction]:
     """거래 내역 목록 조회 (필터링, 페이지네이션, 검색)"""
     query = db.query(Transaction).filter(Transaction.user_id == user_id)
@@ -44,6 +92,11 @@ def get_transactions(
     if max_amount is not None:
         query = query.filter(Transaction.amount <= max_amount)
     
+    # 태그 필터 (any / all / none)
+    tag_conditions = _tag_filters(db, tags_any, tags_all, tags_none)
+    if tag_conditions:
+        query = query.filter(*tag_conditions)
+    
     # 검색어가 있는 경우 (설명 또는 카테고리명 검색)
     if search:
         search_term = f"%{search}%"
@@ -132,6 +185,264 @@ def delete_transaction(db: Session, transaction_id: int, user_id: int) -> bool:
     return True
 
 
+def _owned_category_ids(db: Session, user_id: int, category_ids: Iterable[int]) -> Set[int]:
+    category_ids = set(category_ids)
+    if not category_ids:
+        return set()
+    return {row[0] for row in db.query(Category.id).filter(
+        Category.user_id == user_id, Category.id.in_(category_ids)
+    )}
+
+
+def _owned_tags(db: Session, user_id: int, tag_ids: Iterable[int]) -> Dict[int, Tag]:
+    tag_ids = set(tag_ids)
+    if not tag_ids:
+        return {}
+    return {tag.id: tag for tag in db.query(Tag).filter(Tag.user_id == user_id, Tag.id.in_(tag_ids))}
+
+
+def _bulk_response(results: List[dict]) -> dict:
+    failed = sum(1 for result in results if result['error'])
+    return {'results': results, 'succeeded': len(results) - failed, 'failed': failed}
+
+
+def insert_transactions(db: Session, user_id: int, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    거래 여러 건을 INSERT ... RETURNING 한 번으로 추가 (커밋은 호출한 쪽에서)
+
+    매퍼 이벤트가 거래마다 하던 후속 처리(지문/변경 로그/분류 모델/금액 통계/예산
+    알림)는 전체에 한 번씩 반영한다. 태그 연결은 호출한 쪽에서 한다.
+
+    Args:
+        rows: {"category_id", "type", "amount", "description", "transaction_date"} 목록
+
+    Returns:
+        추가한 거래 ID 목록 (rows 순서대로)
+    """
+    if not rows:
+        return []
+    transaction_ids = db.execute(
+        insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+        [
+            {
+                **values,
+                'user_id': user_id,
+                'fingerprint': duplicate_service.fingerprint(
+                    values['transaction_date'], values['amount'], values['description']
+                ),
+            }
+            for values in rows
+        ],
+    ).scalars().all()
+    rows = [{**values, 'id': transaction_id} for values, transaction_id in zip(rows, transaction_ids)]
+
+    learned_classifier.apply_bulk(db, user_id, [(row['category_id'], row['description']) for row in rows], 1)
+    anomaly_service.observe_bulk(db, user_id, rows)
+    budget_alert_service.evaluate(
+        db, user_id, {row['transaction_date'].strftime('%Y-%m') for row in rows if row['type'] == 'expense'}
+    )
+    change_service.record_bulk(db, user_id, "transaction", transaction_ids, "create")
+    return transaction_ids
+
+
+def bulk_create_transactions(db: Session, items: List[TransactionCreate], user_id: int) -> dict:
+    """
+    거래 내역 일괄 생성 (한 트랜잭션으로 커밋)
+
+    카테고리/태그 소유 확인은 각각 IN 조회 한 번으로 하고, 카테고리가 없는 항목만
+    건너뛴다 (태그는 단건 생성과 같이 사용자 소유인 것만 연결). 거래는
+    insert_transactions()로 한 번에 넣는다.
+    """
+    categories = _owned_category_ids(db, user_id, (item.category_id for item in items))
+    tags = _owned_tags(db, user_id, (tag_id for item in items for tag_id in item.tag_ids or ()))
+
+    results = []
+    created = []
+    for index, item in enumerate(items):
+        values = item.model_dump(exclude={'tag_ids'})
+        error = update_error(values)
+        if error is None and item.category_id not in categories:
+            error = '카테고리를 찾을 수 없습니다'
+        if error:
+            results.append({'index': index, 'id': None, 'status': 'invalid', 'error': error})
+            continue
+        result = {'index': index, 'id': None, 'status': 'created', 'error': None}
+        results.append(result)
+        created.append((result, item, values))
+
+    if not created:
+        return _bulk_response(results)
+
+    transaction_ids = insert_transactions(db, user_id, [values for _, _, values in created])
+    tag_ids: Dict[int, List[int]] = {}
+    for (result, item, _), transaction_id in zip(created, transaction_ids):
+        result['id'] = transaction_id
+        tag_ids[transaction_id] = [tag_id for tag_id in dict.fromkeys(item.tag_ids or ()) if tag_id in tags]
+    _replace_tags(db, tag_ids)
+    db.commit()
+    return _bulk_response(results)
+
+
+# 값을 비울 수 없는 필드 (NOT NULL 컬럼)
+REQUIRED_FIELDS = ('category_id', 'type', 'amount', 'transaction_date')
+
+
+def update_error(values: Dict[str, Any]) -> Optional[str]:
+    """수정 값 검증 - 저장할 수 없는 값이면 오류 메시지, 아니면 None"""
+    for field in REQUIRED_FIELDS:
+        if field in values and values[field] is None:
+            return f"{field} 값은 비울 수 없습니다"
+    if 'type' in values and values['type'] not in TRANSACTION_TYPES:
+        return "거래 유형은 income 또는 expense여야 합니다"
+    return None
+
+
+# 일괄 수정 시 후속 처리가 필요한 필드
+_CLASSIFIER_FIELDS = ('category_id', 'description')
+_ANOMALY_FIELDS = ('amount', 'category_id', 'transaction_date')
+_BUDGET_ALERT_FIELDS = ('amount', 'category_id', 'transaction_date', 'type')
+_FINGERPRINT_FIELDS = ('amount', 'description', 'transaction_date')
+
+
+def _apply_bulk_update(db: Session, user_id: int, before: Dict[int, dict], changes: Dict[int, dict]) -> None:
+    """
+    거래별 변경 값을 Core UPDATE로 반영하고 매퍼 after_update 이벤트가 하던 후속 처리를 한 번씩 적용
+
+    같은 값을 설정하는 거래끼리 묶어 UPDATE ... WHERE id IN (...) 한 문장으로 처리한다.
+    """
+    table = Transaction.__table__
+    groups: Dict[tuple, List[int]] = {}
+    for transaction_id, values in changes.items():
+        if values:
+            groups.setdefault(tuple(sorted(values.items())), []).append(transaction_id)
+    for values, transaction_ids in groups.items():
+        db.execute(update(table).where(table.c.id.in_(transaction_ids)).values(dict(values)))
+
+    after = {transaction_id: {**before[transaction_id], **values} for transaction_id, values in changes.items()}
+
+    def changed(fields):
+        return [transaction_id for transaction_id, values in changes.items() if any(f in values for f in fields)]
+
+    fingerprint_ids = changed(_FINGERPRINT_FIELDS)
+    if fingerprint_ids:
+        db.execute(
+            update(table).where(table.c.id == bindparam('row_id')).values(fingerprint=bindparam('value')),
+            [
+                {'row_id': transaction_id, 'value': duplicate_service.fingerprint(
+                    after[transaction_id]['transaction_date'], after[transaction_id]['amount'],
+                    after[transaction_id]['description'],
+                )}
+                for transaction_id in fingerprint_ids
+            ],
+        )
+
+    classifier_ids = changed(_CLASSIFIER_FIELDS)
+    learned_classifier.apply_bulk(db, user_id, [
+        (before[transaction_id]['category_id'], before[transaction_id]['description']) for transaction_id in classifier_ids
+    ], -1)
+    learned_classifier.apply_bulk(db, user_id, [
+        (after[transaction_id]['category_id'], after[transaction_id]['description']) for transaction_id in classifier_ids
+    ], 1)
+
+    # 수정된 거래는 자기 자신을 뺀 통계로 다시 판정
+    anomaly_ids = changed(_ANOMALY_FIELDS)
+    anomaly_service.forget_bulk(db, user_id, [before[transaction_id] for transaction_id in anomaly_ids])
+    anomaly_service.observe_bulk(db, user_id, [after[transaction_id] for transaction_id in anomaly_ids])
+
+    months = set()
+    for transaction_id in changed(_BUDGET_ALERT_FIELDS):
+        for row in (before[transaction_id], after[transaction_id]):
+            if row['type'] == 'expense':
+                months.add(row['transaction_date'].strftime('%Y-%m'))
+    budget_alert_service.evaluate(db, user_id, months)
+
+
+def _replace_tags(db: Session, tag_ids: Dict[int, List[int]]) -> None:
+    """거래별 태그 연결을 주어진 태그로 교체"""
+    if not tag_ids:
+        return
+    association = transaction_tag_association
+    db.execute(delete(association).where(association.c.transaction_id.in_(list(tag_ids))))
+    links = [
+        {'transaction_id': transaction_id, 'tag_id': tag_id}
+        for transaction_id, ids in tag_ids.items() for tag_id in ids
+    ]
+    if links:
+        db.execute(insert(association), links)
+
+
+def bulk_update_transactions(db: Session, items: List[TransactionBulkUpdateItem], user_id: int) -> dict:
+    """
+    거래 내역 일괄 수정 (항목별로 보낸 필드만 변경, 한 트랜잭션으로 커밋)
+
+    거래를 ORM 객체로 읽지 않고 Core UPDATE로 처리하므로, 변경 로그/분류 모델/금액 통계/
+    예산 알림은 매퍼 이벤트 대신 일괄로 한 번씩 반영한다. 같은 거래가 여러 번 오면
+    뒤의 항목이 앞의 값을 덮어쓴다.
+    """
+    table = Transaction.__table__
+    before: Dict[int, Dict[str, Any]] = {
+        row.id: row._asdict()
+        for row in db.execute(
+            select(
+                table.c.id, table.c.category_id, table.c.type, table.c.amount,
+                table.c.description, table.c.transaction_date,
+            ).where(table.c.user_id == user_id, table.c.id.in_({item.id for item in items}))
+        )
+    }
+
+    categories = _owned_category_ids(db, user_id, (
+        item.category_id for item in items if item.category_id is not None
+    ))
+    tags = _owned_tags(db, user_id, (tag_id for item in items for tag_id in item.tag_ids or ()))
+
+    results = []
+    changes: Dict[int, Dict[str, Any]] = {}
+    tag_ids: Dict[int, List[int]] = {}
+    for index, item in enumerate(items):
+        if item.id not in before:
+            results.append({'index': index, 'id': item.id, 'status': 'not_found', 'error': '거래 내역을 찾을 수 없습니다'})
+            continue
+        update_data = item.model_dump(exclude_unset=True, exclude={'id', 'tag_ids'})
+        error = update_error(update_data)
+        if error:
+            results.append({'index': index, 'id': item.id, 'status': 'invalid', 'error': error})
+            continue
+        if update_data.get('category_id') is not None and update_data['category_id'] not in categories:
+            results.append({'index': index, 'id': item.id, 'status': 'invalid', 'error': '카테고리를 찾을 수 없습니다'})
+            continue
+        changes.setdefault(item.id, {}).update(update_data)
+        if 'tag_ids' in item.model_fields_set:
+            tag_ids[item.id] = [tag_id for tag_id in dict.fromkeys(item.tag_ids or ()) if tag_id in tags]
+        results.append({'index': index, 'id': item.id, 'status': 'updated', 'error': None})
+
+    if changes:
+        _apply_bulk_update(db, user_id, before, changes)
+        _replace_tags(db, tag_ids)
+        change_service.record_bulk(db, user_id, "transaction", list(changes), "update")
+        db.commit()
+    return _bulk_response(results)
+
+
+def bulk_delete_transactions(db: Session, transaction_ids: List[int], user_id: int) -> dict:
+    """거래 내역 일괄 삭제 (deletion_service로 청크 단위로 삭제)"""
+    table = Transaction.__table__
+    owned = set(db.execute(
+        select(table.c.id).where(table.c.user_id == user_id, table.c.id.in_(set(transaction_ids)))
+    ).scalars())
+    if owned:
+        deletion_service.delete_transactions(db, user_id, table.c.id.in_(owned))
+
+    results = []
+    for index, transaction_id in enumerate(transaction_ids):
+        if transaction_id not in owned:
+            results.append({'index': index, 'id': transaction_id, 'status': 'not_found', 'error': '거래 내역을 찾을 수 없습니다'})
+            continue
+        # 같은 ID가 다시 오면 이미 삭제된 것으로 처리
+        owned.discard(transaction_id)
+        results.append({'index': index, 'id': transaction_id, 'status': 'deleted', 'error': None})
+    return _bulk_response(results)
+
+
 def delete_all_transactions(
     db: Session,
     user_id: int,
@@ -140,19 +451,15 @@ def delete_all_transactions(
     category_id: Optional[int] = None,
     transaction_type: Optional[str] = None
 ) -> int:
-    """거래 내역 전체 삭제 (필터 조건 적용 가능)"""
-    query = db.query(Transaction).filter(Transaction.user_id == user_id)
-    
+    """거래 내역 전체 삭제 (필터 조건 적용 가능, 청크 단위로 삭제)"""
+    conditions = []
     if start_date:
-        query = query.filter(Transaction.transaction_date >= start_date)
+        conditions.append(Transaction.transaction_date >= start_date)
     if end_date:
-        query = query.filter(Transaction.transaction_date <= end_date)
+        conditions.append(Transaction.transaction_date <= end_date)
     if category_id:
-        query = query.filter(Transaction.category_id == category_id)
+        conditions.append(Transaction.category_id == category_id)
     if transaction_type:
-        query = query.filter(Transaction.type == transaction_type)
+        conditions.append(Transaction.type == transaction_type)
     
-    count = query.count()
-    query.delete(synchronize_session=False)
-    db.commit()
-    return count
+    return deletion_service.delete_transactions(db, user_id, *conditions)
@@ -0,0 +1,9 @@
+"""
+성능 측정 스크립트 모음
+
+각 스크립트는 임시 SQLite 데이터베이스를 만들어 실제 라우터를 ASGI로 직접
+호출하므로 운영 데이터베이스(`data/accountbook.db`)에는 영향을 주지 않는다.
+
+    cd backend-api
+    python -m benchmarks.login_storm
+"""
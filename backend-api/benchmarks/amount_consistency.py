@@ -0,0 +1,124 @@
+"""
+금액 집계 일치 확인
+
+합성 데이터를 만든 뒤 같은 기간에 대해 다음 API의 지출 합계가 같은지 비교한다.
+금액은 최소 단위 정수로 저장되므로, 타입 변환을 거치지 않고 원시 값을 읽는 경로가
+단위를 잘못 다루면 여기서 100배 차이로 드러난다.
+
+- GET /api/statistics/monthly (월별 지출)
+- GET /api/statistics/by-category (월별 카테고리 지출)
+- GET /api/ai/spending-patterns (월별/카테고리별 지출)
+
+불일치가 있으면 종료 코드 1.
+
+    python -m benchmarks.amount_consistency --months 12
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from collections import defaultdict
+from datetime import date
+
+from benchmarks.common import use_temporary_database
+
+# 부동소수점 합계 비교 허용 오차
+TOLERANCE = 0.005
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="금액 집계 일치 확인")
+    parser.add_argument("--months", type=int, default=12, help="비교할 개월 수 (이번 달 포함)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def month_list(today: date, months: int):
+    year, month = today.year, today.month
+    result = []
+    for _ in range(months):
+        result.append((year, month))
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return list(reversed(result))
+
+
+async def run(args):
+    import httpx
+    from app.main import app
+    from app.core import hashing
+    from app.database import SessionLocal, init_db
+    from benchmarks import datagen
+
+    init_db()
+    today = date.today()
+    db = SessionLocal()
+    try:
+        spec = datagen.DataSpec(users=1, years=2, transactions_per_month=60, seed=args.seed)
+        user = datagen.generate(db, spec, end_date=today)[0]
+    finally:
+        db.close()
+
+    months = month_list(today, args.months)
+    mismatches = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://check") as client:
+        response = await client.post("/api/auth/login", json={"username": user["username"], "password": user["password"]})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        statistics_monthly = {}
+        statistics_category = defaultdict(float)
+        for year, month in months:
+            params = {"year": year, "month": month}
+            body = (await client.get("/api/statistics/monthly", params=params, headers=headers)).json()
+            statistics_monthly[(year, month)] = body["expense"]
+            body = (await client.get(
+                "/api/statistics/by-category", params={**params, "type": "expense"}, headers=headers
+            )).json()
+            for row in body:
+                statistics_category[row["category_id"]] += row["total"]
+
+        start_year, start_month = months[0]
+        patterns = (await client.get("/api/ai/spending-patterns", params={
+            "start_date": date(start_year, start_month, 1).isoformat(),
+            "end_date": today.isoformat(),
+        }, headers=headers)).json()
+
+    pattern_monthly = {(row["year"], row["month"]): row["total"] for row in patterns["monthly_pattern"]}
+    for key, expected in statistics_monthly.items():
+        actual = pattern_monthly.get(key, 0.0)
+        if abs(actual - expected) > TOLERANCE:
+            mismatches.append({"check": "monthly", "month": "%04d-%02d" % key, "statistics": expected, "patterns": actual})
+
+    pattern_category = {row["category_id"]: row["total"] for row in patterns["category_pattern"]}
+    for category_id in set(statistics_category) | set(pattern_category):
+        expected = statistics_category.get(category_id, 0.0)
+        actual = pattern_category.get(category_id, 0.0)
+        if abs(actual - expected) > TOLERANCE:
+            mismatches.append({"check": "category", "category_id": category_id, "statistics": expected, "patterns": actual})
+
+    hashing.shutdown()
+    return {
+        "months": len(months),
+        "expense_total": round(sum(statistics_monthly.values()), 2),
+        "mismatches": mismatches,
+    }
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+    os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+    db_path = use_temporary_database()
+    try:
+        result = asyncio.run(run(args))
+    finally:
+        if os.path.exists(db_path):
+            os.remove(db_path)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if result["mismatches"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+카테고리 분류 처리량 측정
+
+기존 방식(호출마다 카테고리 조회 + 키워드 이중 루프)과 사용자별로 캐시된
+Aho-Corasick 분류기의 초당 분류 횟수를 비교하고, 두 방식의 결과가 같은지
+확인한다.
+
+    python -m benchmarks.classifier --descriptions 20000
+"""
+import argparse
+import json
+import os
+import random
+import time
+
+from benchmarks.common import use_temporary_database
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="카테고리 분류 처리량 측정")
+    parser.add_argument("--descriptions", type=int, default=20000, help="분류할 설명 수")
+    parser.add_argument("--extra-categories", type=int, default=30, help="기본 카테고리 외에 추가할 카테고리 수")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def legacy_classify(db, description, user_id, transaction_type="expense"):
+    """변경 전 분류 로직 (비교 기준)"""
+    from app.models import Category
+    from app.services.category_classifier import CATEGORY_KEYWORDS
+
+    description_lower = description.lower()
+    categories = db.query(Category).filter(
+        Category.user_id == user_id,
+        Category.type == transaction_type
+    ).order_by(Category.id).all()
+    best_match, best_score = None, 0
+    for category in categories:
+        score = sum(1 for keyword in CATEGORY_KEYWORDS.get(category.name, []) if keyword in description_lower)
+        if category.name.lower() in description_lower:
+            score += 2
+        if score > best_score:
+            best_score, best_match = score, category
+    if best_match and best_score > 0:
+        return {"category_id": best_match.id, "category_name": best_match.name, "confidence": min(best_score / 5.0, 1.0)}
+    return None
+
+
+def measure(fn, descriptions):
+    started = time.perf_counter()
+    results = [fn(text) for text in descriptions]
+    elapsed = time.perf_counter() - started
+    return results, {
+        "seconds": round(elapsed, 3),
+        "per_sec": round(len(descriptions) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def run(args):
+    from app.database import SessionLocal, init_db
+    from app.models import Category
+    from app.services import ai_service, category_classifier
+    from benchmarks import datagen
+
+    init_db()
+    db = SessionLocal()
+    try:
+        spec = datagen.DataSpec(users=1, years=1, transactions_per_month=1, tags_per_user=0, recurring_per_user=0, seed=args.seed)
+        user_id = datagen.generate(db, spec)[0]["id"]
+        for idx in range(args.extra_categories):
+            db.add(Category(user_id=user_id, name=f"사용자 카테고리 {idx}", type="expense", color="#6b7280"))
+        db.commit()
+
+        rng = random.Random(args.seed)
+        pool = [text for texts in datagen.DESCRIPTIONS.values() for text in texts]
+        pool += ["편의점 라면 구매", "인터넷 요금 납부", "사용자 카테고리 7 결제", "알 수 없는 거래"]
+        descriptions = [rng.choice(pool) for _ in range(args.descriptions)]
+
+        legacy_results, legacy = measure(lambda text: legacy_classify(db, text, user_id), descriptions)
+
+        category_classifier.invalidate(user_id)
+        cached_results, cached = measure(
+            lambda text: ai_service.classify_category_by_description(db, text, user_id), descriptions
+        )
+
+        classifier = category_classifier.get_classifier(db, user_id)
+        _, automaton = measure(lambda text: classifier.classify(text, "expense"), descriptions)
+    finally:
+        db.close()
+
+    return {
+        "descriptions": args.descriptions,
+        "categories": len(datagen.CATEGORIES) + args.extra_categories,
+        "legacy": legacy,
+        "cached_service": cached,
+        "automaton_only": automaton,
+        "speedup": round(cached["per_sec"] / legacy["per_sec"], 2) if legacy["per_sec"] else None,
+        "results_match": legacy_results == cached_results,
+    }
+
+
+def main():
+    args = parse_args()
+    db_path = use_temporary_database()
+    try:
+        result = run(args)
+    finally:
+        if os.path.exists(db_path):
+            os.remove(db_path)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
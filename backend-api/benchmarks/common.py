@@ -0,0 +1,42 @@
+"""
+벤치마크 공용 유틸리티
+"""
+import os
+import statistics
+import tempfile
+from typing import Dict, List, Optional
+
+
+def use_temporary_database(path: Optional[str] = None) -> str:
+    """
+    벤치마크용 데이터베이스 경로를 DATABASE_URL로 설정
+
+    app 패키지를 import하기 전에 호출해야 한다.
+    """
+    if path is None:
+        fd, path = tempfile.mkstemp(prefix="accountbook_bench_", suffix=".db")
+        os.close(fd)
+        os.remove(path)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    return path
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """지연 시간 표본(초)을 ms 단위 백분위 요약으로 변환"""
+    if not samples:
+        return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        idx = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+        return ordered[idx] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(pick(0.50), 3),
+        "p95_ms": round(pick(0.95), 3),
+        "p99_ms": round(pick(0.99), 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
@@ -0,0 +1,190 @@
+"""
+재현 가능한 합성 데이터 생성기
+
+같은 시드와 파라미터로 실행하면 항상 같은 데이터가 만들어지므로 커밋 간
+벤치마크 결과를 비교할 수 있다. 대량 삽입은 ORM 객체 대신 Core INSERT로
+수행한다.
+
+app 패키지는 함수 안에서 import한다. 벤치마크가 DATABASE_URL을 임시 경로로
+바꾼 뒤에 데이터베이스 엔진이 만들어져야 하기 때문이다.
+"""
+import random
+from dataclasses import dataclass, asdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+BENCH_PASSWORD = "bench-password"
+
+CATEGORIES = [
+    ("급여", "income"), ("용돈", "income"), ("기타 수입", "income"),
+    ("식비", "expense"), ("교통비", "expense"), ("쇼핑", "expense"),
+    ("의료비", "expense"), ("교육비", "expense"), ("통신비", "expense"),
+    ("공과금", "expense"), ("기타 지출", "expense"),
+]
+
+DESCRIPTIONS = {
+    "급여": ["월급", "급여 입금", "상여금"],
+    "용돈": ["용돈", "부모님 용돈"],
+    "기타 수입": ["중고거래", "환급", "이자"],
+    "식비": ["점심 김밥", "저녁 치킨", "카페 커피", "배달 피자", "편의점 라면", "식당 회식"],
+    "교통비": ["지하철", "버스", "택시", "주유", "주차장"],
+    "쇼핑": ["쿠팡 주문", "마트 장보기", "옷 구매", "신발", "온라인 쇼핑"],
+    "의료비": ["병원 진료", "약국", "치과 검진"],
+    "교육비": ["학원비", "책 구매", "온라인 강의"],
+    "통신비": ["핸드폰 요금", "인터넷 요금"],
+    "공과금": ["관리비", "전기 요금", "가스 요금", "수도 요금"],
+    "기타 지출": ["경조사", "기부", "기타"],
+}
+
+AMOUNT_RANGES = {
+    "급여": (2_500_000, 4_500_000), "용돈": (50_000, 300_000), "기타 수입": (10_000, 500_000),
+    "식비": (3_000, 60_000), "교통비": (1_250, 80_000), "쇼핑": (5_000, 300_000),
+    "의료비": (5_000, 150_000), "교육비": (10_000, 400_000), "통신비": (30_000, 90_000),
+    "공과금": (20_000, 250_000), "기타 지출": (5_000, 200_000),
+}
+
+
+@dataclass
+class DataSpec:
+    """생성할 데이터 규모"""
+    users: int = 3
+    years: int = 2
+    transactions_per_month: int = 120
+    tags_per_user: int = 20
+    max_tags_per_transaction: int = 2
+    recurring_per_user: int = 5
+    seed: int = 42
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def generate(db: Session, spec: DataSpec, end_date: date = None) -> List[Dict]:
+    """
+    사용자/카테고리/거래/태그/예산/반복 거래 생성
+
+    Returns:
+        생성된 사용자 목록 [{"id", "username", "password"}]
+    """
+    from app.core.security import get_password_hash
+    from app.models import (
+        User, Category, Transaction, Tag, Budget, RecurringTransaction,
+        transaction_tag_association,
+    )
+    from app.services import duplicate_service
+
+    rng = random.Random(spec.seed)
+    end_date = end_date or date(2025, 12, 31)
+    start_date = date(end_date.year - spec.years + 1, 1, 1)
+    total_days = (end_date - start_date).days + 1
+    months = spec.years * 12
+
+    # bcrypt는 느리므로 모든 사용자가 같은 해시를 공유
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+
+    created_users = []
+    for user_idx in range(spec.users):
+        user = User(
+            username=f"bench_{spec.seed}_{user_idx}",
+            email=f"bench_{spec.seed}_{user_idx}@example.com",
+            hashed_password=hashed_password,
+        )
+        db.add(user)
+        db.flush()
+
+        categories = []
+        for name, ctype in CATEGORIES:
+            category = Category(name=name, type=ctype, user_id=user.id, color="#6b7280")
+            db.add(category)
+            categories.append(category)
+        tags = [Tag(user_id=user.id, name=f"태그{i:03d}", color="#3b82f6") for i in range(spec.tags_per_user)]
+        db.add_all(tags)
+        db.flush()
+
+        expense_categories = [c for c in categories if c.type == "expense"]
+        income_categories = [c for c in categories if c.type == "income"]
+
+        # 거래 내역: 지출 위주 + 매월 급여
+        rows = []
+        for _ in range(spec.transactions_per_month * months):
+            category = rng.choice(expense_categories) if rng.random() < 0.92 else rng.choice(income_categories)
+            low, high = AMOUNT_RANGES[category.name]
+            rows.append({
+                "user_id": user.id,
+                "category_id": category.id,
+                "type": category.type,
+                "amount": Decimal(rng.randrange(low, high, 10)),
+                "description": rng.choice(DESCRIPTIONS[category.name]),
+                "transaction_date": start_date + timedelta(days=rng.randrange(total_days)),
+            })
+        for row in rows:
+            row["fingerprint"] = duplicate_service.fingerprint(row["transaction_date"], row["amount"], row["description"])
+        db.execute(insert(Transaction), rows)
+
+        # 태그 연결: 방금 삽입한 거래 ID 범위에 무작위로 부여
+        transaction_ids = [
+            row[0] for row in db.query(Transaction.id).filter(Transaction.user_id == user.id).order_by(Transaction.id)
+        ]
+        tag_rows = []
+        if tags and spec.max_tags_per_transaction > 0:
+            for transaction_id in transaction_ids:
+                count = rng.randint(0, spec.max_tags_per_transaction)
+                for tag in rng.sample(tags, min(count, len(tags))):
+                    tag_rows.append({"transaction_id": transaction_id, "tag_id": tag.id})
+        if tag_rows:
+            db.execute(insert(transaction_tag_association), tag_rows)
+
+        # 월별 예산: 전체 예산 + 지출 카테고리 일부
+        budget_rows = []
+        for month_offset in range(months):
+            year = start_date.year + month_offset // 12
+            month = month_offset % 12 + 1
+            month_str = f"{year:04d}-{month:02d}"
+            budget_rows.append({"user_id": user.id, "category_id": None, "amount": Decimal(3_000_000), "month": month_str})
+            for category in expense_categories[:4]:
+                budget_rows.append({
+                    "user_id": user.id,
+                    "category_id": category.id,
+                    "amount": Decimal(rng.randrange(200_000, 800_000, 10_000)),
+                    "month": month_str,
+                })
+        db.execute(insert(Budget), budget_rows)
+
+        # 반복 거래 규칙
+        for idx in range(spec.recurring_per_user):
+            category = rng.choice(expense_categories)
+            low, high = AMOUNT_RANGES[category.name]
+            db.add(RecurringTransaction(
+                user_id=user.id,
+                category_id=category.id,
+                type="expense",
+                amount=Decimal(rng.randrange(low, high, 10)),
+                description=f"정기 {category.name} {idx + 1}",
+                frequency=rng.choice(["daily", "weekly", "monthly", "yearly"]),
+                day_of_month=rng.randint(1, 28),
+                day_of_week=rng.randint(0, 6),
+                start_date=start_date,
+                is_active=True,
+            ))
+
+        db.commit()
+        created_users.append({"id": user.id, "username": user.username, "password": BENCH_PASSWORD})
+
+    return created_users
+
+
+def build_import_csv(rows: int, seed: int = 7, year: int = 2025) -> bytes:
+    """CSV 가져오기 벤치마크용 파일 생성 (내보내기와 같은 열 구성)"""
+    rng = random.Random(seed)
+    lines = ["날짜,유형,카테고리,금액,설명"]
+    expense_names = [name for name, ctype in CATEGORIES if ctype == "expense"]
+    for _ in range(rows):
+        name = rng.choice(expense_names)
+        low, high = AMOUNT_RANGES[name]
+        day = date(year, 1, 1) + timedelta(days=rng.randrange(365))
+        lines.append(f"{day.isoformat()},지출,{name},{rng.randrange(low, high, 10)},{rng.choice(DESCRIPTIONS[name])}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
@@ -0,0 +1,98 @@
+"""
+중복이 섞인 CSV 가져오기 처리량 측정
+
+빈 계정에 CSV를 가져온 뒤(깨끗한 가져오기), 앞 파일과 일부가 겹치는 두 번째
+파일을 중복 건너뛰기(duplicates=skip)로 가져와 두 경우의 초당 처리 행 수를 비교한다.
+겹치는 기간의 은행 명세서를 다시 가져오는 상황을 흉내 낸다.
+
+    python -m benchmarks.import_duplicates --rows 50000 --overlap 0.5
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.common import use_temporary_database
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="중복이 섞인 CSV 가져오기 처리량 측정")
+    parser.add_argument("--rows", type=int, default=50000, help="파일당 행 수")
+    parser.add_argument("--overlap", type=float, default=0.5, help="두 번째 파일 중 첫 파일과 겹치는 비율")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def build_files(rows: int, overlap: float, seed: int):
+    from benchmarks.datagen import build_import_csv
+
+    header, *first = build_import_csv(rows, seed=seed).decode("utf-8").splitlines()
+    overlapping = int(rows * overlap)
+    _, *fresh = build_import_csv(rows - overlapping, seed=seed + 1).decode("utf-8").splitlines()
+    second = first[len(first) - overlapping:] + fresh
+    encode = lambda lines: ("\n".join([header, *lines]) + "\n").encode("utf-8")
+    return encode(first), encode(second)
+
+
+async def run(args):
+    import httpx
+    from app.main import app
+    from app.core import hashing
+    from app.database import SessionLocal, init_db
+    from benchmarks import datagen
+
+    init_db()
+    db = SessionLocal()
+    try:
+        spec = datagen.DataSpec(users=1, years=1, transactions_per_month=1, tags_per_user=0, recurring_per_user=0, seed=args.seed)
+        user = datagen.generate(db, spec)[0]
+    finally:
+        db.close()
+
+    first, second = build_files(args.rows, args.overlap, args.seed)
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        response = await client.post("/api/auth/login", json={"username": user["username"], "password": user["password"]})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        for name, body in (("clean_import", first), ("overlap_import", second)):
+            started = time.perf_counter()
+            response = await client.post(
+                "/api/transactions/import/csv",
+                files={"file": (f"{name}.csv", body, "text/csv")},
+                params={"duplicates": "skip"},
+                headers=headers,
+            )
+            elapsed = time.perf_counter() - started
+            response.raise_for_status()
+            body = response.json()
+            results[name] = {
+                "inserted": body["success"],
+                "duplicates": body["duplicates"],
+                "failed": body["failed"],
+                "seconds": round(elapsed, 3),
+                "rows_per_sec": round(args.rows / elapsed, 1) if elapsed else 0.0,
+            }
+
+    hashing.shutdown()
+    return {"rows": args.rows, "overlap": args.overlap, "results": results}
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+    os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+    db_path = use_temporary_database()
+    try:
+        result = asyncio.run(run(args))
+    finally:
+        if os.path.exists(db_path):
+            os.remove(db_path)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
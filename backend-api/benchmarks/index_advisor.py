@@ -0,0 +1,158 @@
+"""
+인덱스 점검 (EXPLAIN QUERY PLAN)
+
+합성 데이터를 만든 뒤 통계/리포트/예산/예측/거래 목록 서비스 함수를 실제로 호출하면서
+실행된 SELECT 문을 모두 가로채고, 같은 파라미터로 EXPLAIN QUERY PLAN을 실행해 다음을
+보고한다.
+
+- full_scan: 인덱스 없이 테이블 전체를 읽는 단계 (SCAN <table>)
+- temp_btree: 정렬/그룹화를 위해 임시 B-트리를 만드는 단계 (USE TEMP B-TREE)
+- table_lookup: 인덱스로 찾은 뒤 테이블 행을 다시 읽는 단계 (커버링 인덱스가 아님)
+
+거래 행 전체를 돌려주는 목록 조회의 table_lookup과 월 키로 묶는 집계의 temp_btree는
+피할 수 없으므로 참고용이다. 작은 테이블(categories, budgets)의 SCAN은 보통 문제가
+되지 않으므로 `--tables`로 점검할 테이블을 고른다. `--strict`이면 점검 대상 테이블에
+full_scan이 있을 때 종료 코드 1.
+
+    python -m benchmarks.index_advisor --transactions 20000
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import date
+
+from benchmarks.common import use_temporary_database
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="서비스 쿼리 실행 계획 점검")
+    parser.add_argument("--transactions", type=int, default=20000, help="거래 수")
+    parser.add_argument("--tables", default="transactions", help="점검할 테이블 (쉼표 구분)")
+    parser.add_argument("--strict", action="store_true", help="전체 테이블 스캔이 있으면 종료 코드 1")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def scenarios(today: date):
+    """점검할 서비스 호출 (이름, 함수(db, user_id))"""
+    from app.services import (
+        budget_alert_service, budget_service, prediction_service, report_service,
+        statistics_service, transaction_service,
+    )
+
+    month = today.strftime("%Y-%m")
+    start_month = f"{today.year - 1:04d}-{today.month:02d}"
+    return {
+        "statistics.monthly": lambda db, uid: statistics_service.get_monthly_statistics(db, uid, today.year, today.month),
+        "statistics.by_category": lambda db, uid: statistics_service.get_category_statistics(
+            db, uid, today.year, today.month, "expense"),
+        "report.monthly": lambda db, uid: report_service.generate_monthly_report(db, uid, today.year, today.month),
+        "budget.status": lambda db, uid: budget_service.get_budget_status(db, uid, month),
+        "budget.status_range": lambda db, uid: budget_service.get_budget_status_range(db, uid, start_month, month),
+        "budget_alert.evaluate": lambda db, uid: budget_alert_service.evaluate(db, uid, [month]),
+        "prediction.next_month": lambda db, uid: prediction_service.predict_next_month_expense(db, uid),
+        "transactions.list": lambda db, uid: transaction_service.get_transactions(db, uid, limit=50),
+        "transactions.list_period": lambda db, uid: transaction_service.get_transactions(
+            db, uid, limit=50, start_date=date(today.year, today.month, 1), end_date=today),
+        "transactions.list_expense": lambda db, uid: transaction_service.get_transactions(
+            db, uid, limit=50, transaction_type="expense"),
+    }
+
+
+def classify(detail: str, tables):
+    """실행 계획 한 줄의 문제 유형 (없으면 None)"""
+    words = detail.split()
+    if "TEMP B-TREE" in detail:
+        return "temp_btree"
+    if len(words) < 2 or words[1] not in tables:
+        return None
+    if words[0] == "SCAN" and "USING" not in detail:
+        return "full_scan"
+    if words[0] in ("SEARCH", "SCAN") and "USING INDEX" in detail and "COVERING" not in detail:
+        return "table_lookup"
+    return None
+
+
+def explain(connection, statements, tables):
+    """캡처한 문장마다 실행 계획과 문제 단계 목록"""
+    reports = []
+    for statement, parameters in statements:
+        plan = [row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+        issues = [(kind, detail) for detail in plan if (kind := classify(detail, tables))]
+        reports.append({
+            "sql": " ".join(statement.split()),
+            "plan": plan,
+            "issues": [f"{kind}: {detail}" for kind, detail in issues],
+        })
+    return reports
+
+
+def run(args):
+    from sqlalchemy import event, text
+
+    from app.database import SessionLocal, engine, init_db
+    from benchmarks import datagen
+
+    init_db()
+    tables = {name.strip() for name in args.tables.split(",") if name.strip()}
+    today = date.today()
+    db = SessionLocal()
+    try:
+        spec = datagen.DataSpec(
+            users=3, years=2, transactions_per_month=max(1, args.transactions // 72), seed=args.seed,
+        )
+        user_id = datagen.generate(db, spec, end_date=today)[0]["id"]
+        db.execute(text("ANALYZE"))
+        db.commit()
+
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                captured.append((statement, parameters))
+
+        results = {}
+        for name, call in scenarios(today).items():
+            captured.clear()
+            event.listen(engine, "before_cursor_execute", capture)
+            try:
+                call(db, user_id)
+            finally:
+                event.remove(engine, "before_cursor_execute", capture)
+            # 예산 알림 평가처럼 기록하는 호출도 있으므로 되돌림
+            db.rollback()
+            results[name] = explain(db.connection(), list(captured), tables)
+            db.rollback()
+    finally:
+        db.close()
+
+    summary = {
+        name: sorted({issue for report in reports for issue in report["issues"]})
+        for name, reports in results.items()
+    }
+    full_scans = sorted({issue for issues in summary.values() for issue in issues if issue.startswith("full_scan")})
+    return {
+        "transactions": spec.transactions_per_month * 24 * spec.users,
+        "tables": sorted(tables),
+        "full_scans": full_scans,
+        "summary": summary,
+        "queries": results,
+    }
+
+
+def main():
+    args = parse_args()
+    db_path = use_temporary_database()
+    try:
+        result = run(args)
+    finally:
+        if os.path.exists(db_path):
+            os.remove(db_path)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.strict and result["full_scans"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+로그인 폭주 중 장부 조회 지연 측정
+
+로그인 요청을 동시에 대량으로 보내는 동안 `GET /api/transactions` 지연
+시간이 평상시와 비교해 얼마나 늘어나는지 측정한다. 비밀번호 해싱이 별도
+프로세스 풀에서 실행되면 조회 지연은 거의 변하지 않아야 한다.
+
+    python -m benchmarks.login_storm --logins 200 --concurrency 32 --workers 2
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.common import percentiles, use_temporary_database
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="로그인 폭주 중 조회 지연 측정")
+    parser.add_argument("--logins", type=int, default=200, help="보낼 로그인 요청 수")
+    parser.add_argument("--concurrency", type=int, default=32, help="동시 로그인 요청 수")
+    parser.add_argument("--reads", type=int, default=200, help="구간별 조회 요청 수")
+    parser.add_argument("--workers", type=int, default=None, help="해싱 프로세스 수 (PASSWORD_HASH_WORKERS)")
+    parser.add_argument("--rounds", type=int, default=None, help="bcrypt 비용 (BCRYPT_ROUNDS)")
+    return parser.parse_args()
+
+
+async def measure_reads(client, headers, count):
+    samples = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = await client.get("/api/transactions", headers=headers)
+        samples.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return samples
+
+
+async def login_storm(client, total, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses = {}
+
+    async def one():
+        async with semaphore:
+            response = await client.post("/api/auth/login", json={"username": "bench", "password": "bench-password"})
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return statuses, time.perf_counter() - started
+
+
+async def run(args):
+    import httpx
+    from datetime import date, timedelta
+    from decimal import Decimal
+    from app.main import app
+    from app.core import hashing
+    from app.core.security import get_password_hash
+    from app.database import SessionLocal, init_db
+    from app.models import User, Category, Transaction
+
+    init_db()
+    db = SessionLocal()
+    try:
+        user = User(username="bench", hashed_password=get_password_hash("bench-password"))
+        db.add(user)
+        db.flush()
+        category = Category(name="식비", type="expense", user_id=user.id)
+        db.add(category)
+        db.flush()
+        for i in range(500):
+            db.add(Transaction(
+                user_id=user.id,
+                category_id=category.id,
+                type="expense",
+                amount=Decimal(1000 + i),
+                description=f"점심 {i}",
+                transaction_date=date.today() - timedelta(days=i % 365),
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/api/auth/login", json={"username": "bench", "password": "bench-password"})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        baseline = await measure_reads(client, headers, args.reads)
+
+        storm_task = asyncio.create_task(login_storm(client, args.logins, args.concurrency))
+        during = await measure_reads(client, headers, args.reads)
+        statuses, storm_seconds = await storm_task
+
+    hashing.shutdown()
+    return {
+        "workers": hashing.PASSWORD_HASH_WORKERS,
+        "bcrypt_rounds": hashing.BCRYPT_ROUNDS,
+        "reads_baseline": percentiles(baseline),
+        "reads_during_storm": percentiles(during),
+        "logins": {
+            "total": args.logins,
+            "concurrency": args.concurrency,
+            "statuses": statuses,
+            "seconds": round(storm_seconds, 3),
+            "per_sec": round(args.logins / storm_seconds, 2) if storm_seconds else 0,
+        },
+        "hashing_pool": hashing.get_stats(),
+    }
+
+
+def main():
+    args = parse_args()
+    if args.workers is not None:
+        os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    if args.rounds is not None:
+        os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    db_path = use_temporary_database()
+    try:
+        result = asyncio.run(run(args))
+    finally:
+        if os.path.exists(db_path):
+            os.remove(db_path)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+카드 승인/입출금 문자 일괄 수집 처리량 측정
+
+카드사/은행별 형식의 합성 문자를 만들어 `POST /api/ingest/sms`로 묶음 단위
+전송하고 초당 처리 문자 수를 측정한다. 일부 문자는 일부러 중복시켜 중복
+제거 경로도 함께 측정한다.
+
+    python -m benchmarks.sms_ingest --messages 20000 --batch 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks.common import percentiles, use_temporary_database
+
+MERCHANTS = ["스타벅스", "GS25", "쿠팡", "이마트", "카카오T 택시", "배달의민족", "올리브영", "CU 편의점", "김밥천국", "SK텔레콤"]
+
+TEMPLATES = [
+    "[Web발신]\n신한카드({card})승인 홍*동 {amount}원(일시불){md} {hm} {merchant} 누적{total}원",
+    "[Web발신]\nKB국민카드{card}승인\n홍*동\n{amount}원 일시불\n{md} {hm}\n{merchant}\n누적{total}원",
+    "[Web발신]\n삼성{card}승인 홍*동\n{amount}원 일시불\n{md} {hm} {merchant}\n누적{total}원",
+    "[Web발신]\n현대카드 M 승인\n홍*동\n{amount}원 일시불\n{md} {hm}\n{merchant}\n누적{total}원",
+    "[Web발신]\n[KB]{md} {hm}\n123456**789\n{merchant}\n체크카드출금\n{amount}\n잔액{total}",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="문자 일괄 수집 처리량 측정")
+    parser.add_argument("--messages", type=int, default=20000, help="전송할 문자 수")
+    parser.add_argument("--batch", type=int, default=2000, help="요청당 문자 수")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.1, help="중복 문자 비율")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def build_messages(count: int, duplicate_ratio: float, seed: int, reference: date):
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        if messages and rng.random() < duplicate_ratio:
+            messages.append(rng.choice(messages))
+            continue
+        when = reference - timedelta(days=rng.randrange(300))
+        messages.append(rng.choice(TEMPLATES).format(
+            card=f"{rng.randrange(10000):04d}",
+            amount=f"{rng.randrange(1000, 300000, 10):,}",
+            total=f"{rng.randrange(100000, 5000000):,}",
+            md=f"{when.month:02d}/{when.day:02d}",
+            hm=f"{rng.randrange(24):02d}:{rng.randrange(60):02d}",
+            merchant=rng.choice(MERCHANTS),
+        ))
+    return messages
+
+
+async def run(args):
+    import httpx
+    from app.main import app
+    from app.core import hashing
+    from app.database import SessionLocal, init_db
+    from benchmarks import datagen
+
+    init_db()
+    db = SessionLocal()
+    try:
+        spec = datagen.DataSpec(users=1, years=1, transactions_per_month=1, tags_per_user=0, recurring_per_user=0, seed=args.seed)
+        user = datagen.generate(db, spec)[0]
+    finally:
+        db.close()
+
+    reference = date(2025, 12, 31)
+    messages = build_messages(args.messages, args.duplicate_ratio, args.seed, reference)
+
+    samples = []
+    totals = {"inserted": 0, "duplicates": 0, "unparsed": 0}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        response = await client.post("/api/auth/login", json={"username": user["username"], "password": user["password"]})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        started = time.perf_counter()
+        for offset in range(0, len(messages), args.batch):
+            batch_started = time.perf_counter()
+            response = await client.post("/api/ingest/sms", headers=headers, json={
+                "messages": messages[offset:offset + args.batch],
+                "received_date": reference.isoformat(),
+            })
+            samples.append(time.perf_counter() - batch_started)
+            response.raise_for_status()
+            body = response.json()
+            for key in totals:
+                totals[key] += body[key]
+        elapsed = time.perf_counter() - started
+
+    hashing.shutdown()
+    return {
+        "messages": args.messages,
+        "batch": args.batch,
+        **totals,
+        "seconds": round(elapsed, 3),
+        "messages_per_sec": round(args.messages / elapsed, 1) if elapsed else 0.0,
+        "batch_latency": percentiles(samples),
+    }
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+    os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+    db_path = use_temporary_database()
+    try:
+        result = asyncio.run(run(args))
+    finally:
+        if os.path.exists(db_path):
+            os.remove(db_path)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
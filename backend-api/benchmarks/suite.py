@@ -0,0 +1,241 @@
+"""
+엔드포인트 벤치마크 스위트
+
+합성 데이터(benchmarks.datagen)를 임시 데이터베이스에 생성한 뒤, 실제
+라우터를 httpx ASGI 전송으로 호출해 시나리오별 처리량과 지연 백분위를
+측정한다. 결과는 커밋 해시와 함께 JSON으로 저장되므로 두 결과 파일을
+비교해 성능 회귀를 확인할 수 있다.
+
+    python -m benchmarks.suite run --users 3 --years 2 --output before.json
+    python -m benchmarks.suite compare before.json after.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from benchmarks.common import percentiles, use_temporary_database
+from benchmarks.datagen import DataSpec, build_import_csv
+
+# 시나리오 요청 함수: (client, headers, iteration)을 받아 응답을 반환
+RequestFactory = Callable[..., Awaitable]
+
+
+def _scenarios(year: int, import_rows: int) -> Dict[str, RequestFactory]:
+    import_body = build_import_csv(import_rows, year=year)
+
+    def get(path, **params):
+        async def request(client, headers, iteration):
+            return await client.get(path, params=params, headers=headers)
+        return request
+
+    async def search(client, headers, iteration):
+        keyword = ("점심", "택시", "쿠팡", "관리비")[iteration % 4]
+        return await client.get("/api/transactions", params={"search": keyword, "limit": 100}, headers=headers)
+
+    async def stats(client, headers, iteration):
+        month = iteration % 12 + 1
+        await client.get("/api/statistics/monthly", params={"year": year, "month": month}, headers=headers)
+        return await client.get("/api/statistics/by-category", params={"year": year, "month": month}, headers=headers)
+
+    async def report(client, headers, iteration):
+        return await client.get("/api/reports/monthly", params={"year": year, "month": iteration % 12 + 1}, headers=headers)
+
+    async def import_csv(client, headers, iteration):
+        files = {"file": ("bench.csv", import_body, "text/csv")}
+        # 같은 파일을 반복해서 올리므로 파일 해시/중복 확인을 끄고 행 처리 경로를 측정
+        params = {"force": "true", "duplicates": "allow"}
+        return await client.post("/api/transactions/import/csv", files=files, params=params, headers=headers)
+
+    return {
+        "list": get("/api/transactions", limit=100),
+        "list_page_deep": get("/api/transactions", skip=2000, limit=100),
+        "search": search,
+        "stats": stats,
+        "report": report,
+        "export_csv": get("/api/transactions/export/csv", start_date=f"{year}-01-01", end_date=f"{year}-12-31"),
+        "export_excel": get("/api/transactions/export/excel", start_date=f"{year}-01-01", end_date=f"{year}-12-31"),
+        "backup_export": get("/api/backup/export"),
+        # 데이터를 늘리는 시나리오이므로 항상 마지막에 실행
+        "import_csv": import_csv,
+    }
+
+
+async def _run_scenario(client, users_headers: List[Dict], request: RequestFactory,
+                        iterations: int, concurrency: int) -> Dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: List[float] = []
+    errors: Dict[int, int] = {}
+
+    async def one(iteration: int):
+        headers = users_headers[iteration % len(users_headers)]
+        async with semaphore:
+            started = time.perf_counter()
+            response = await request(client, headers, iteration)
+            samples.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            errors[response.status_code] = errors.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(iterations)))
+    wall = time.perf_counter() - started
+
+    result = percentiles(samples)
+    result["wall_seconds"] = round(wall, 3)
+    result["throughput_rps"] = round(iterations / wall, 2) if wall else 0.0
+    if errors:
+        result["errors"] = errors
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(spec: DataSpec, iterations: int, concurrency: int, import_rows: int,
+              only: Optional[List[str]] = None) -> Dict:
+    import httpx
+    from app.main import app
+    from app.core import hashing
+    from app.database import SessionLocal, init_db
+    from benchmarks import datagen
+
+    init_db()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        users = datagen.generate(db, spec)
+        seed_seconds = time.perf_counter() - started
+    finally:
+        db.close()
+
+    year = 2025
+    scenarios = _scenarios(year, import_rows)
+    selected = [name for name in scenarios if not only or name in only]
+
+    results: Dict[str, Dict] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        users_headers = []
+        for user in users:
+            response = await client.post("/api/auth/login", json={"username": user["username"], "password": user["password"]})
+            response.raise_for_status()
+            users_headers.append({"Authorization": f"Bearer {response.json()['access_token']}"})
+
+        for name in selected:
+            request = scenarios[name]
+            # 워밍업 한 번 (캐시/커넥션 풀 준비)
+            await request(client, users_headers[0], 0)
+            results[name] = await _run_scenario(client, users_headers, request, iterations, concurrency)
+
+    hashing.shutdown()
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "concurrency": concurrency,
+            "import_rows": import_rows,
+            "data": spec.to_dict(),
+            "seed_seconds": round(seed_seconds, 3),
+        },
+        "scenarios": results,
+    }
+
+
+def compare(before: Dict, after: Dict, metric: str = "p95_ms") -> str:
+    """두 결과의 시나리오별 지표 비교표 생성"""
+    lines = [
+        f"before: {before['meta'].get('commit')}  after: {after['meta'].get('commit')}  ({metric})",
+        f"{'scenario':<16}{'before':>12}{'after':>12}{'change':>10}",
+    ]
+    for name in sorted(set(before["scenarios"]) | set(after["scenarios"])):
+        old = before["scenarios"].get(name, {}).get(metric)
+        new = after["scenarios"].get(name, {}).get(metric)
+        if old is None or new is None:
+            lines.append(f"{name:<16}{str(old):>12}{str(new):>12}{'-':>10}")
+            continue
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "-"
+        lines.append(f"{name:<16}{old:>12.2f}{new:>12.2f}{change:>10}")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="엔드포인트 벤치마크 스위트")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="합성 데이터를 만들고 벤치마크 실행")
+    run_parser.add_argument("--users", type=int, default=DataSpec.users)
+    run_parser.add_argument("--years", type=int, default=DataSpec.years)
+    run_parser.add_argument("--tx-per-month", type=int, default=DataSpec.transactions_per_month)
+    run_parser.add_argument("--tags", type=int, default=DataSpec.tags_per_user, help="사용자별 태그 수")
+    run_parser.add_argument("--recurring", type=int, default=DataSpec.recurring_per_user, help="사용자별 반복 거래 수")
+    run_parser.add_argument("--seed", type=int, default=DataSpec.seed)
+    run_parser.add_argument("--iterations", type=int, default=50, help="시나리오별 요청 수")
+    run_parser.add_argument("--concurrency", type=int, default=4, help="동시 요청 수")
+    run_parser.add_argument("--import-rows", type=int, default=500, help="CSV 가져오기 요청당 행 수")
+    run_parser.add_argument("--only", nargs="*", help="실행할 시나리오 이름")
+    run_parser.add_argument("--database", help="데이터베이스 파일 경로 (기본: 임시 파일)")
+    run_parser.add_argument("--output", help="결과 JSON 저장 경로")
+
+    compare_parser = sub.add_parser("compare", help="두 결과 파일 비교")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    compare_parser.add_argument("--metric", default="p95_ms",
+                                choices=["mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "throughput_rps"])
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.before, encoding="utf-8") as f:
+            before = json.load(f)
+        with open(args.after, encoding="utf-8") as f:
+            after = json.load(f)
+        print(compare(before, after, args.metric))
+        return
+
+    spec = DataSpec(
+        users=args.users,
+        years=args.years,
+        transactions_per_month=args.tx_per_month,
+        tags_per_user=args.tags,
+        recurring_per_user=args.recurring,
+        seed=args.seed,
+    )
+    # 벤치마크 중 로그인 비용이 측정을 방해하지 않도록 기본 비용을 낮춤
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+    os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+    db_path = use_temporary_database(args.database)
+    try:
+        result = asyncio.run(run(spec, args.iterations, args.concurrency, args.import_rows, args.only))
+    finally:
+        if args.database is None and os.path.exists(db_path):
+            os.remove(db_path)
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
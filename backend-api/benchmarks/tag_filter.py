@@ -0,0 +1,146 @@
+"""
+태그 필터 조회 지연 측정
+
+사용자 한 명에게 태그를 100개 이상 만들고 인기도가 치우치게(지프 분포) 거래에
+붙인 뒤, 거래 목록의 태그 필터(any / all / none)와 기간 조건을 섞은 조회의 지연
+백분위를 측정한다. (tag_id, transaction_id) 인덱스가 있을 때와 지웠을 때를 비교하고
+두 경우의 결과가 같은지 확인한다.
+
+    python -m benchmarks.tag_filter --tags 150 --transactions 50000
+"""
+import argparse
+import json
+import os
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks.common import percentiles, use_temporary_database
+
+INDEX_NAME = "idx_transaction_tags_tag_transaction"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="태그 필터 조회 지연 측정")
+    parser.add_argument("--tags", type=int, default=150, help="사용자 태그 수")
+    parser.add_argument("--transactions", type=int, default=50000, help="거래 수")
+    parser.add_argument("--max-tags-per-transaction", type=int, default=3)
+    parser.add_argument("--iterations", type=int, default=200, help="시나리오별 조회 횟수")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def seed_tags(db, user_id: int, args, rng: random.Random):
+    """태그 생성 후 순위에 반비례하는 확률로 거래에 연결, 인기순 태그 ID 반환"""
+    from sqlalchemy import insert
+
+    from app.models import Tag, Transaction, transaction_tag_association
+
+    tags = [Tag(user_id=user_id, name=f"태그{i:03d}", color="#3b82f6") for i in range(args.tags)]
+    db.add_all(tags)
+    db.flush()
+    tag_ids = [tag.id for tag in tags]
+    weights = [1.0 / (rank + 1) for rank in range(len(tag_ids))]
+
+    rows = []
+    for (transaction_id,) in db.query(Transaction.id).filter(Transaction.user_id == user_id):
+        count = rng.randint(0, args.max_tags_per_transaction)
+        for tag_id in set(rng.choices(tag_ids, weights=weights, k=count)):
+            rows.append({"transaction_id": transaction_id, "tag_id": tag_id})
+    db.execute(insert(transaction_tag_association), rows)
+    db.commit()
+    return tag_ids, len(rows)
+
+
+def build_queries(tag_ids, iterations: int, end: date, rng: random.Random):
+    """시나리오별 조회 조건 목록 (인기 태그와 드문 태그를 섞음)"""
+    popular, rare = tag_ids[:10], tag_ids[len(tag_ids) // 2:]
+
+    def period():
+        if rng.random() < 0.5:
+            return {}
+        start = end - timedelta(days=rng.randrange(30, 365))
+        return {"start_date": start, "end_date": end}
+
+    return {
+        "any": [{"tags_any": rng.sample(tag_ids, 3), **period()} for _ in range(iterations)],
+        # 인기 태그를 앞에 두어도 드문 태그부터 읽는지 확인
+        "all": [{"tags_all": [rng.choice(popular), rng.choice(rare)], **period()} for _ in range(iterations)],
+        "all_popular": [{"tags_all": rng.sample(popular, 2), **period()} for _ in range(iterations)],
+        "none": [{"tags_none": rng.sample(popular, 2), **period()} for _ in range(iterations)],
+        "any_none": [{"tags_any": [rng.choice(popular)], "tags_none": [rng.choice(popular)], **period()}
+                     for _ in range(iterations)],
+    }
+
+
+def measure(db, user_id: int, queries):
+    from app.services import transaction_service
+
+    results = {}
+    ids = {}
+    for name, params_list in queries.items():
+        samples = []
+        ids[name] = []
+        for params in params_list:
+            started = time.perf_counter()
+            rows = transaction_service.get_transactions(db, user_id, limit=100, **params)
+            samples.append(time.perf_counter() - started)
+            ids[name].append([row.id for row in rows])
+            db.expunge_all()
+        results[name] = percentiles(samples)
+    return results, ids
+
+
+def run(args):
+    from sqlalchemy import text
+
+    from app.database import SessionLocal, init_db
+    from benchmarks import datagen
+
+    init_db()
+    rng = random.Random(args.seed)
+    db = SessionLocal()
+    try:
+        spec = datagen.DataSpec(
+            users=1, years=2, transactions_per_month=max(1, args.transactions // 24),
+            tags_per_user=0, recurring_per_user=0, seed=args.seed,
+        )
+        end = date.today()
+        user_id = datagen.generate(db, spec, end_date=end)[0]["id"]
+        tag_ids, links = seed_tags(db, user_id, args, rng)
+        db.execute(text("ANALYZE"))
+        db.commit()
+
+        queries = build_queries(tag_ids, args.iterations, end, rng)
+        indexed, indexed_ids = measure(db, user_id, queries)
+
+        db.execute(text(f"DROP INDEX {INDEX_NAME}"))
+        db.execute(text("ANALYZE"))
+        db.commit()
+        without_index, plain_ids = measure(db, user_id, queries)
+    finally:
+        db.close()
+
+    return {
+        "tags": args.tags,
+        "transactions": spec.transactions_per_month * 24,
+        "tag_links": links,
+        "same_results": indexed_ids == plain_ids,
+        "indexed": indexed,
+        "without_index": without_index,
+    }
+
+
+def main():
+    args = parse_args()
+    db_path = use_temporary_database()
+    try:
+        result = run(args)
+    finally:
+        if os.path.exists(db_path):
+            os.remove(db_path)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
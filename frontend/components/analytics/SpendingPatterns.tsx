@@ -148,7 +148,7 @@ export const SpendingPatterns: React.FC = () => {
           {patterns.outliers.length > 0 && (
             <Card compact className="border-2 border-gray-200 shadow-sm">
               <h3 className="text-lg font-semibold text-gray-900 dark:text-gray-100 mb-4 p-4 border-b-2 border-gray-200 dark:border-gray-700">
-                이상치 감지 (평균 대비 2배 이상)
+                이상치 감지 (카테고리별 중앙값 대비)
               </h3>
               <div className="p-4">
                 <div className="space-y-2">
@@ -162,7 +162,7 @@ export const SpendingPatterns: React.FC = () => {
                             ₩{outlier.amount.toLocaleString()}
                           </p>
                           <p className="text-sm text-gray-600 dark:text-gray-400">
-                            {new Date(outlier.date).toLocaleDateString('ko-KR')}
+                            {new Date(outlier.date).toLocaleDateString('ko-KR')} | 카테고리 중앙값 ₩{outlier.category_median.toLocaleString()}
                           </p>
                           {outlier.description && (
                             <p className="text-sm text-gray-700 dark:text-gray-300 mt-1">{outlier.description}</p>
@@ -173,7 +173,7 @@ export const SpendingPatterns: React.FC = () => {
                 </div>
                 <p className="text-sm text-gray-600 dark:text-gray-400 mt-4">
                   평균 지출: ₩{patterns.average_amount.toLocaleString()} | 
-                  임계값: ₩{patterns.threshold.toLocaleString()}
+                  이상치 기준: 수정 Z 점수 {patterns.threshold} 이상
                 </p>
               </div>
             </Card>
@@ -39,6 +39,12 @@ export interface Transaction {
   description?: string;
   transaction_date: string;
   tags?: Tag[];
+  anomaly?: {
+    id: number;
+    z_score: number;
+    mean: number;
+    std: number;
+  } | null;
   created_at: string;
   updated_at: string;
 }
@@ -54,6 +60,16 @@ export interface Category {
   updated_at: string;
 }
 
+export interface CategoryMergeResult {
+  category_id: number;
+  transactions: number;
+  recurring_transactions: number;
+  transaction_templates: number;
+  budgets_merged: number;
+  budgets_moved: number;
+  deleted_categories: number;
+}
+
 export interface TransactionCreate {
   category_id: number;
   type: 'income' | 'expense';
@@ -72,6 +88,17 @@ export interface TransactionUpdate {
   tag_ids?: number[];
 }
 
+export interface TransactionBulkResponse {
+  results: {
+    index: number;
+    id: number | null;
+    status: 'created' | 'updated' | 'deleted' | 'not_found' | 'invalid';
+    error: string | null;
+  }[];
+  succeeded: number;
+  failed: number;
+}
+
 export interface CategoryCreate {
   name: string;
   type: 'income' | 'expense';
@@ -160,6 +187,24 @@ export interface BudgetStatus {
   month: string;
 }
 
+export interface BudgetAlert {
+  id: number;
+  budget_id: number;
+  category_id?: number;
+  month: string;
+  threshold: number;
+  budget_amount: number;
+  spent_amount: number;
+  percentage: number;
+  created_at: string;
+}
+
+export interface BudgetMonthStatus {
+  month: string;
+  spent_amount: number;
+  budgets: BudgetStatus[];
+}
+
 async function fetchAPI<T>(endpoint: string, options?: RequestInit): Promise<T> {
   const token = getToken();
   const fullUrl = `${API_BASE_URL}${endpoint}`;
@@ -269,11 +314,17 @@ export const transactionAPI = {
     search?: string;
     min_amount?: number;
     max_amount?: number;
+    tags_any?: number[];
+    tags_all?: number[];
+    tags_none?: number[];
   }) => {
     const queryParams = new URLSearchParams();
     if (params) {
       Object.entries(params).forEach(([key, value]) => {
-        if (value !== undefined && value !== null && value !== '') {
+        if (Array.isArray(value)) {
+          // 태그 필터는 같은 키를 반복 (tags_any=1&tags_any=2)
+          value.forEach((item) => queryParams.append(key, item.toString()));
+        } else if (value !== undefined && value !== null && value !== '') {
           queryParams.append(key, value.toString());
         }
       });
@@ -283,13 +334,15 @@ export const transactionAPI = {
 
   getById: (id: number) => fetchAPI<Transaction>(`/api/transactions/${id}`),
 
-  create: (data: TransactionCreate) => {
+  // idempotencyKey: 재시도해도 한 번만 생성되도록 같은 요청에는 같은 키 사용
+  create: (data: TransactionCreate, idempotencyKey?: string) => {
     // #region agent log
     fetch('http://127.0.0.1:7244/ingest/5dd89038-e302-4767-8ab6-a4bc08c49221',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({location:'api.ts:create',message:'거래 생성 요청',data:data,timestamp:Date.now(),sessionId:'debug-session'})}).catch(()=>{});
     // #endregion
     return fetchAPI<Transaction>('/api/transactions', {
       method: 'POST',
       body: JSON.stringify(data),
+      headers: idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : undefined,
     });
   },
 
@@ -304,6 +357,25 @@ export const transactionAPI = {
       method: 'DELETE',
     }),
 
+  // 일괄 처리 (최대 1000건, 한 번에 커밋)
+  bulkCreate: (items: TransactionCreate[]) =>
+    fetchAPI<TransactionBulkResponse>('/api/transactions/bulk', {
+      method: 'POST',
+      body: JSON.stringify({ items }),
+    }),
+
+  bulkUpdate: (items: (TransactionUpdate & { id: number })[]) =>
+    fetchAPI<TransactionBulkResponse>('/api/transactions/bulk', {
+      method: 'PATCH',
+      body: JSON.stringify({ items }),
+    }),
+
+  bulkDelete: (ids: number[]) =>
+    fetchAPI<TransactionBulkResponse>('/api/transactions/bulk/delete', {
+      method: 'POST',
+      body: JSON.stringify({ ids }),
+    }),
+
   deleteAll: async (params?: {
     start_date?: string;
     end_date?: string;
@@ -375,12 +447,15 @@ export const transactionAPI = {
     window.URL.revokeObjectURL(downloadUrl);
   },
 
-  importExcel: async (file: File) => {
+  // 같은 파일을 다시 올리면 already_imported: true (force로 다시 가져오기)
+  importExcel: async (file: File, force = false, duplicates: 'skip' | 'flag' | 'allow' = 'skip') => {
     const token = getToken();
     const formData = new FormData();
     formData.append('file', file);
+    const params = new URLSearchParams({ duplicates });
+    if (force) params.append('force', 'true');
     
-    const response = await fetch(`${API_BASE_URL}/api/transactions/import/excel`, {
+    const response = await fetch(`${API_BASE_URL}/api/transactions/import/excel?${params}`, {
       method: 'POST',
       headers: {
         'Authorization': token ? `Bearer ${token}` : '',
@@ -446,12 +521,15 @@ export const transactionAPI = {
     window.URL.revokeObjectURL(downloadUrl);
   },
 
-  importCsv: async (file: File) => {
+  // 같은 파일을 다시 올리면 already_imported: true (force로 다시 가져오기)
+  importCsv: async (file: File, force = false, duplicates: 'skip' | 'flag' | 'allow' = 'skip') => {
     const token = getToken();
     const formData = new FormData();
     formData.append('file', file);
+    const params = new URLSearchParams({ duplicates });
+    if (force) params.append('force', 'true');
     
-    const response = await fetch(`${API_BASE_URL}/api/transactions/import/csv`, {
+    const response = await fetch(`${API_BASE_URL}/api/transactions/import/csv?${params}`, {
       method: 'POST',
       headers: {
         'Authorization': token ? `Bearer ${token}` : '',
@@ -494,6 +572,13 @@ export const categoryAPI = {
       method: 'DELETE',
     }),
 
+  // sourceCategoryIds의 거래/예산/반복 거래/템플릿을 id 카테고리로 옮기고 원본 삭제
+  merge: (id: number, sourceCategoryIds: number[]) =>
+    fetchAPI<CategoryMergeResult>(`/api/categories/${id}/merge`, {
+      method: 'POST',
+      body: JSON.stringify({ source_category_ids: sourceCategoryIds }),
+    }),
+
   deleteAll: async (type?: 'income' | 'expense') => {
     const queryParams = new URLSearchParams();
     if (type) {
@@ -738,6 +823,83 @@ export const authAPI = {
   },
 };
 
+// 실시간 변경 이벤트 (Server-Sent Events)
+export interface ChangeEvent {
+  entity: string;
+  id: number | null; // 일괄 변경(op: 'bulk')이면 null
+  op: 'create' | 'update' | 'delete' | 'bulk';
+  data_version: number;
+}
+
+export const eventsAPI = {
+  // 다른 기기/화면에서 바뀐 데이터만 다시 조회할 수 있도록 변경 이벤트 구독
+  subscribe: (
+    onChange: (event: ChangeEvent) => void,
+    onResync?: () => void
+  ): (() => void) => {
+    const token = getToken();
+    const source = new EventSource(
+      `${API_BASE_URL}/api/events/stream?token=${encodeURIComponent(token || '')}`
+    );
+    source.addEventListener('change', (event) => {
+      onChange(JSON.parse((event as MessageEvent).data));
+    });
+    if (onResync) {
+      source.addEventListener('resync', () => onResync());
+    }
+    return () => source.close();
+  },
+};
+
+// 오프라인 동기화
+export interface SyncChange {
+  version: number;
+  entity: string;
+  id: number;
+  op: 'create' | 'update' | 'delete';
+  data: Record<string, unknown> | null; // 삭제(툼스톤)이면 null
+}
+
+export interface SyncChangesResponse {
+  changes: SyncChange[];
+  next_since: number;
+  has_more: boolean;
+  reset: boolean;
+}
+
+export interface SyncPushItem {
+  entity: 'transaction' | 'category' | 'tag' | 'budget';
+  op: 'create' | 'update' | 'delete';
+  id?: number;
+  client_id?: string;
+  base_version?: number;
+  base_updated_at?: string;
+  data?: Record<string, unknown>;
+}
+
+export interface SyncPushResult {
+  index: number;
+  client_id: string | null;
+  status: 'applied' | 'conflict' | 'not_found' | 'invalid';
+  id: number | null;
+  version: number | null;
+  error: string | null;
+  server: Record<string, unknown> | null; // 충돌 시 서버 쪽 현재 데이터
+}
+
+export const syncAPI = {
+  getChanges: (since: number, limit?: number) =>
+    fetchAPI<SyncChangesResponse>(
+      `/api/sync/changes?since=${since}${limit ? `&limit=${limit}` : ''}`
+    ),
+
+  push: (changes: SyncPushItem[]) =>
+    fetchAPI<{ results: SyncPushResult[]; version: number }>('/api/sync/push', {
+      method: 'POST',
+      body: JSON.stringify({ changes }),
+    }),
+};
+
 // Budget API
 export const budgetAPI = {
   getAll: (params?: {
@@ -777,6 +939,35 @@ export const budgetAPI = {
 
   getStatus: (month: string) =>
     fetchAPI<BudgetStatus[]>(`/api/budgets/status/${month}`),
+
+  getStatusRange: (params: {
+    start_month?: string;
+    end_month?: string;
+    year?: number;
+  }) => {
+    const queryParams = new URLSearchParams();
+    Object.entries(params).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== '') {
+        queryParams.append(key, value.toString());
+      }
+    });
+    return fetchAPI<BudgetMonthStatus[]>(`/api/budgets/status?${queryParams.toString()}`);
+  },
+
+  getAlerts: (month?: string) =>
+    fetchAPI<BudgetAlert[]>(`/api/budgets/alerts${month ? `?month=${month}` : ''}`),
+
+  // 예산 알림 실시간 수신 (EventSource는 헤더를 보낼 수 없어 토큰을 쿼리로 전달)
+  subscribeAlerts: (onAlert: (alert: BudgetAlert) => void): (() => void) => {
+    const token = getToken();
+    const source = new EventSource(
+      `${API_BASE_URL}/api/budgets/alerts/stream?token=${encodeURIComponent(token || '')}`
+    );
+    source.addEventListener('budget_alert', (event) => {
+      onAlert(JSON.parse((event as MessageEvent).data));
+    });
+    return () => source.close();
+  },
 };
 
 // AI API
@@ -816,12 +1007,22 @@ export interface SpendingPatternsResponse {
     avg_amount: number;
     count: number;
   }>;
+  category_pattern: Array<{
+    category_id: number;
+    total: number;
+    count: number;
+    average: number;
+    median: number;
+    mad: number;
+  }>;
   outliers: Array<{
     id: number;
     date: string;
     amount: number;
     description?: string;
     category_id: number;
+    category_median: number;
+    score: number;
   }>;
   average_amount: number;
   threshold: number;
@@ -843,6 +1044,7 @@ export const aiAPI = {
   getSpendingPatterns: (params?: {
     start_date?: string;
     end_date?: string;
+    months?: number;
   }) => {
     const queryParams = new URLSearchParams();
     if (params) {
@@ -1027,6 +1229,18 @@ export interface TagUpdate {
   color?: string;
 }
 
+export interface TagBulkResult {
+  links: number;
+  transactions: number;
+}
+
+export interface TagMergeResult {
+  tag_id: number;
+  moved: number;
+  deduplicated: number;
+  deleted_tags: number;
+}
+
 export interface TagStatistics {
   tag_id: number;
   tag_name: string;
@@ -1069,6 +1283,29 @@ export const tagAPI = {
       method: 'DELETE',
     });
   },
+
+  // 여러 거래에 태그 일괄 연결/해제 (최대 10000건)
+  bulkAttach: async (tagIds: number[], transactionIds: number[]): Promise<TagBulkResult> => {
+    return fetchAPI<TagBulkResult>('/api/tags/bulk/attach', {
+      method: 'POST',
+      body: JSON.stringify({ tag_ids: tagIds, transaction_ids: transactionIds }),
+    });
+  },
+
+  bulkDetach: async (tagIds: number[], transactionIds: number[]): Promise<TagBulkResult> => {
+    return fetchAPI<TagBulkResult>('/api/tags/bulk/detach', {
+      method: 'POST',
+      body: JSON.stringify({ tag_ids: tagIds, transaction_ids: transactionIds }),
+    });
+  },
+
+  // sourceTagIds의 거래 연결을 id 태그로 옮기고 원본 태그 삭제
+  merge: async (id: number, sourceTagIds: number[]): Promise<TagMergeResult> => {
+    return fetchAPI<TagMergeResult>(`/api/tags/${id}/merge`, {
+      method: 'POST',
+      body: JSON.stringify({ source_tag_ids: sourceTagIds }),
+    });
+  },
 };
 
 // Backup API